@@ -0,0 +1,146 @@
+"""결과 저장 벤치마크: 행마다 execute + 커밋 vs executemany + 한 트랜잭션.
+
+결과 100건 쓰기를 두 경로로 잰다.
+- check: reported_articles 100건 저장
+- report 시나리오 B: 추가 50건 + 기존 항목 수정 50건
+
+    python -m benchmarks.bench_db_writes
+"""
+
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+from src.storage import repository as repo
+from src.storage.models import init_db
+
+_RESULTS = 100
+_ROUNDS = 30
+
+
+def _article(n: int) -> dict:
+    return {
+        "topic_cluster": f"cluster-{n}", "title": f"기사 {n}", "key_facts": ["사실 1", "사실 2"],
+        "summary": "요약 " * 20, "url": f"https://news.example/{n}", "category": "report", "reason": "사유",
+    }
+
+
+def _item(n: int) -> dict:
+    return {
+        "title": f"항목 {n}", "url": f"https://news.example/r/{n}", "summary": "요약 " * 20,
+        "category": "new", "reason": "사유", "key_facts": ["사실"], "publisher": "언론사",
+    }
+
+
+async def _legacy_save_reported_articles(db, journalist_id: int, articles: list[dict]) -> None:
+    """기존 방식: 행마다 INSERT 후 커밋 한 번."""
+    now = datetime.now(UTC).isoformat()
+    for article in articles:
+        url = article.get("url", "")
+        await db.execute(
+            """
+            INSERT INTO reported_articles
+                (journalist_id, checked_at, topic_cluster, title, key_facts, summary, article_urls, category, reason)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                journalist_id, now, article["topic_cluster"], article["title"],
+                json.dumps(article["key_facts"], ensure_ascii=False), article["summary"],
+                json.dumps([url]), article["category"], article["reason"],
+            ),
+        )
+    await db.commit()
+
+
+async def _legacy_save_report_items(db, cache_id: int, items: list[dict]) -> None:
+    now = datetime.now(UTC).isoformat()
+    for item in items:
+        await db.execute(
+            """
+            INSERT INTO report_items
+                (report_cache_id, title, url, summary, tags, category, reason, publisher,
+                 key_facts, created_at, updated_at)
+            VALUES (?, ?, ?, ?, '[]', ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                cache_id, item["title"], item["url"], item["summary"], item["category"],
+                item["reason"], item["publisher"], json.dumps(item["key_facts"], ensure_ascii=False),
+                now, now,
+            ),
+        )
+    await db.commit()
+
+
+async def _legacy_scenario_b(db, cache_id: int, added: list[dict], modified: list[dict]) -> None:
+    """기존 방식: 추가분 저장 후 수정 항목마다 UPDATE + 커밋."""
+    await _legacy_save_report_items(db, cache_id, added)
+    for mod in modified:
+        now = datetime.now(UTC).isoformat()
+        await db.execute(
+            "UPDATE report_items SET summary = ?, updated_at = ?, reason = ? WHERE id = ?",
+            (mod["summary"], now, mod["reason"], mod["id"]),
+        )
+        await db.commit()
+
+
+async def _bulk_scenario_b(db, cache_id: int, added: list[dict], modified: list[dict]) -> None:
+    async with repo.unit_of_work(db):
+        await repo.save_report_items(db, cache_id, added)
+        await repo.update_report_items(db, modified)
+
+
+async def _time_ms(fn, rounds: int) -> list[float]:
+    out = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await fn()
+        out.append((time.perf_counter() - start) * 1000)
+    return out
+
+
+async def _run() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = await init_db(str(Path(tmp) / "bench.db"))
+        try:
+            jid = await repo.upsert_journalist(db, "1", "사회부", [], "k")
+            cache_id, _ = await repo.get_or_create_report_cache(db, jid, "2026-01-01")
+            await repo.save_report_items(db, cache_id, [_item(n) for n in range(_RESULTS // 2)])
+            existing = await repo.get_report_items_by_cache(db, cache_id)
+
+            articles = [_article(n) for n in range(_RESULTS)]
+            added = [_item(n) for n in range(_RESULTS // 2)]
+            modified = [{"id": e["id"], "summary": "수정 " * 20, "reason": "새 사유"} for e in existing]
+
+            cases = {
+                "check 결과 100건": (
+                    lambda: _legacy_save_reported_articles(db, jid, articles),
+                    lambda: repo.save_reported_articles(db, jid, articles),
+                ),
+                "report B 추가 50 + 수정 50": (
+                    lambda: _legacy_scenario_b(db, cache_id, added, modified),
+                    lambda: _bulk_scenario_b(db, cache_id, added, modified),
+                ),
+            }
+            print(f"결과 {_RESULTS}건 쓰기, {_ROUNDS}회 p50 / p95 (ms)")
+            for name, (legacy, bulk) in cases.items():
+                cells = []
+                for fn in (legacy, bulk):
+                    samples = await _time_ms(fn, _ROUNDS)
+                    cells.append(
+                        f"{statistics.median(samples):7.2f} / {statistics.quantiles(samples, n=20)[-1]:7.2f}"
+                    )
+                print(f"  {name:28s} 행 단위 {cells[0]}   일괄 {cells[1]}")
+        finally:
+            await db.close()
+
+
+def main() -> None:
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
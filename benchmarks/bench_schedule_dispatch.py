@@ -0,0 +1,98 @@
+"""예약 등록·해제·디스패치 벤치마크: 예약마다 run_daily job vs 분 단위 색인.
+
+예약 10,000건(사용자 500명 × check/report 각 10개)을 시작 시 복원하고, 사용자 100명의
+예약을 바꾼 뒤(해제 + 재등록), 하루 1,440분 틱 동안 실행할 항목을 찾는 시간을 비교한다.
+
+    python -m benchmarks.bench_schedule_dispatch
+"""
+
+import random
+import time
+from datetime import time as dtime, timedelta, timezone
+
+from telegram.ext import Application
+
+from src.bot import scheduler
+from src.bot.scheduler import _ScheduleIndex, register_job, unregister_jobs
+
+_KST = timezone(timedelta(hours=9))
+# 정각·30분에 몰리는 실제 분포를 흉내낸다
+_POPULAR = [f"{h:02d}:{m:02d}" for h in range(7, 20) for m in (0, 30)]
+
+
+async def _noop(context) -> None:
+    pass
+
+
+def _schedules(rng: random.Random, users: int, per_command: int) -> list[dict]:
+    rows = []
+    for jid in range(1, users + 1):
+        for command in ("check", "report"):
+            times = set()
+            while len(times) < per_command:
+                if rng.random() < 0.7:
+                    times.add(rng.choice(_POPULAR))
+                else:
+                    times.add(f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}")
+            rows += [
+                {"journalist_id": jid, "command": command, "time_kst": t, "telegram_id": str(1000 + jid)}
+                for t in sorted(times)
+            ]
+    return rows
+
+
+def _legacy_register(app: Application, s: dict) -> None:
+    """기존 방식: 예약마다 run_daily job (+ report 사전 계산 job)."""
+    h, m = map(int, s["time_kst"].split(":"))
+    name = f"{s['command']}_{s['journalist_id']}_{s['time_kst']}"
+    app.job_queue.run_daily(_noop, time=dtime(h, m, tzinfo=_KST), chat_id=int(s["telegram_id"]), name=name)
+    if s["command"] == "report":
+        app.job_queue.run_daily(_noop, time=dtime(h, m, tzinfo=_KST), name=f"{name}_prewarm")
+
+
+def _legacy_unregister(app: Application, journalist_id: int) -> None:
+    prefixes = (f"check_{journalist_id}_", f"report_{journalist_id}_")
+    for job in app.job_queue.jobs():
+        if job.name and job.name.startswith(prefixes):
+            job.schedule_removal()
+
+
+def main(users: int = 500, per_command: int = 10, changed_users: int = 100) -> None:
+    rng = random.Random(42)
+    rows = _schedules(rng, users, per_command)
+    changed = rng.sample(range(1, users + 1), changed_users)
+    app = Application.builder().token("0:bench").build()
+
+    started = time.perf_counter()
+    for s in rows:
+        _legacy_register(app, s)
+    legacy_start = time.perf_counter() - started
+    started = time.perf_counter()
+    for jid in changed:
+        _legacy_unregister(app, jid)
+    legacy_change = time.perf_counter() - started
+    legacy_jobs = len(app.job_queue.jobs())
+
+    scheduler._schedule_index = _ScheduleIndex()
+    started = time.perf_counter()
+    for s in rows:
+        register_job(app, s["command"], s["journalist_id"], s["telegram_id"], s["time_kst"])
+    index_start = time.perf_counter() - started
+    started = time.perf_counter()
+    for jid in changed:
+        unregister_jobs(app, jid)
+    index_change = time.perf_counter() - started
+    remaining = len(scheduler._schedule_index)
+
+    started = time.perf_counter()
+    due = [len(scheduler._schedule_index.due(minute)) for minute in range(24 * 60)]
+    dispatch = time.perf_counter() - started
+
+    print(f"예약 {len(rows)}건 (사용자 {users}명), 예약 변경 사용자 {changed_users}명")
+    print(f"  run_daily job: 등록 {legacy_start * 1000:.1f} ms, 해제 {legacy_change * 1000:.1f} ms, job {legacy_jobs}개")
+    print(f"  분 단위 색인:  등록 {index_start * 1000:.1f} ms, 해제 {index_change * 1000:.2f} ms, 항목 {remaining}개")
+    print(f"  하루 1440틱 조회 {dispatch * 1000:.2f} ms (틱당 최대 {max(due)}건, 디스패처 job 1개)")
+
+
+if __name__ == "__main__":
+    main()
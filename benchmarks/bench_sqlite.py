@@ -0,0 +1,167 @@
+"""SQLite 조회·쓰기 벤치마크: 기본 설정 vs WAL + pragma + 인덱스 (init_db).
+
+사용자 1,000명 × 5일치 데이터(사용자당 하루 check 4회 × 기사 10건, report 1회 × 항목 20건)를
+같은 시드로 두 DB에 넣고, 파이프라인이 매번 부르는 조회와 결과 저장, 일일 정리의 지연을 비교한다.
+
+    python -m benchmarks.bench_sqlite
+"""
+
+import asyncio
+import json
+import random
+import statistics
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import aiosqlite
+
+from src.storage import repository as repo
+from src.storage.models import DDL, init_db
+
+_DAYS = 5
+_CHECKS_PER_DAY = 4
+_ARTICLES_PER_CHECK = 10
+_ITEMS_PER_REPORT = 20
+
+
+async def _baseline_db(path: str) -> aiosqlite.Connection:
+    """기존 init_db와 같은 상태: 기본 pragma(rollback journal, synchronous=FULL), 추가 인덱스 없음."""
+    db = await aiosqlite.connect(path)
+    db.row_factory = aiosqlite.Row
+    await db.executescript(DDL)
+    await db.commit()
+    return db
+
+
+async def _populate(db: aiosqlite.Connection, users: int, seed: int = 7) -> dict[int, list[int]]:
+    """사용자 users명 × _DAYS일치 데이터를 넣고 사용자별 report_cache id를 반환한다."""
+    rng = random.Random(seed)
+    now = datetime.now(UTC)
+    await db.executemany(
+        "INSERT INTO journalists (id, telegram_id, department, keywords, api_key) VALUES (?, ?, ?, ?, ?)",
+        [(jid, str(1000 + jid), "사회부", "[]", "") for jid in range(1, users + 1)],
+    )
+    articles, caches = [], []
+    for jid in range(1, users + 1):
+        for day in range(_DAYS):
+            for check in range(_CHECKS_PER_DAY):
+                at = (now - timedelta(days=day, hours=check * 3, minutes=rng.randint(0, 59))).isoformat()
+                for n in range(_ARTICLES_PER_CHECK):
+                    articles.append((
+                        jid, at, f"cluster-{n}", f"기사 제목 {jid}-{day}-{check}-{n}",
+                        json.dumps(["사실 1", "사실 2"], ensure_ascii=False), "요약 " * 20,
+                        json.dumps([f"https://news.example/{jid}/{day}/{check}/{n}"]),
+                        rng.choice(["report", "skip"]), "사유",
+                    ))
+            caches.append((jid, (now - timedelta(days=day)).strftime("%Y-%m-%d"), now.isoformat()))
+    # 실제로는 시간순으로 섞여 쌓이므로 사용자 순서대로 넣지 않는다
+    rng.shuffle(articles)
+    await db.executemany(
+        """
+        INSERT INTO reported_articles
+            (journalist_id, checked_at, topic_cluster, title, key_facts, summary, article_urls, category, reason)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        articles,
+    )
+    rng.shuffle(caches)
+    await db.executemany(
+        "INSERT INTO report_cache (journalist_id, date, updated_at) VALUES (?, ?, ?)", caches,
+    )
+    cursor = await db.execute("SELECT id, journalist_id FROM report_cache")
+    cache_ids: dict[int, list[int]] = {}
+    items = []
+    for row in await cursor.fetchall():
+        cache_ids.setdefault(row["journalist_id"], []).append(row["id"])
+        for n in range(_ITEMS_PER_REPORT):
+            items.append((
+                row["id"], f"항목 {row['id']}-{n}", f"https://news.example/r/{row['id']}/{n}",
+                "요약 " * 20, "[]", rng.choice(["new", "follow_up"]), now.isoformat(), now.isoformat(),
+            ))
+    rng.shuffle(items)
+    await db.executemany(
+        """
+        INSERT INTO report_items
+            (report_cache_id, title, url, summary, tags, category, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        items,
+    )
+    await db.commit()
+    return cache_ids
+
+
+async def _time_ms(fn, samples) -> list[float]:
+    out = []
+    for arg in samples:
+        start = time.perf_counter()
+        await fn(arg)
+        out.append((time.perf_counter() - start) * 1000)
+    return out
+
+
+async def _measure(db: aiosqlite.Connection, cache_ids: dict[int, list[int]], users: int) -> dict:
+    rng = random.Random(11)
+    jids = [rng.randint(1, users) for _ in range(200)]
+    new_articles = [
+        {"topic_cluster": "c", "title": f"새 기사 {n}", "key_facts": [], "summary": "요약",
+         "url": f"https://news.example/new/{n}", "category": "report", "reason": ""}
+        for n in range(_ARTICLES_PER_CHECK)
+    ]
+    results = {
+        "get_recent_reported_articles": await _time_ms(
+            lambda j: repo.get_recent_reported_articles(db, j, hours=24), jids),
+        "get_recent_report_items": await _time_ms(
+            lambda j: repo.get_recent_report_items(db, j, days=2), jids),
+        "get_report_items_by_cache": await _time_ms(
+            lambda j: repo.get_report_items_by_cache(db, cache_ids[j][0]), jids),
+        "save_reported_articles": await _time_ms(
+            lambda j: repo.save_reported_articles(db, j, new_articles), jids[:50]),
+    }
+    # 보관 기간을 하루 줄여 가장 오래된 하루치를 지우게 한다
+    retention = repo.CACHE_RETENTION_DAYS
+    repo.CACHE_RETENTION_DAYS = _DAYS - 1
+    try:
+        results["cleanup_old_data"] = await _time_ms(lambda _: repo.cleanup_old_data(db), [None])
+    finally:
+        repo.CACHE_RETENTION_DAYS = retention
+    return results
+
+
+async def _run(users: int) -> None:
+    report: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, opener in (("기본", _baseline_db), ("WAL+인덱스", init_db)):
+            db = await opener(str(Path(tmp) / f"{label}.db"))
+            try:
+                cache_ids = await _populate(db, users)
+                report[label] = await _measure(db, cache_ids, users)
+            finally:
+                await db.close()
+
+    rows = _row_counts(users)
+    print(f"사용자 {users}명 × {_DAYS}일: {rows}")
+    print(f"{'쿼리':32s} {'기본 p50/p95(ms)':>20s} {'WAL+인덱스 p50/p95(ms)':>24s}")
+    for name in report["기본"]:
+        cells = []
+        for label in report:
+            samples = report[label][name]
+            p95 = statistics.quantiles(samples, n=20)[-1] if len(samples) > 1 else samples[0]
+            cells.append(f"{statistics.median(samples):8.2f} / {p95:8.2f}")
+        print(f"{name:32s} {cells[0]:>20s} {cells[1]:>24s}")
+
+
+def _row_counts(users: int) -> str:
+    articles = users * _DAYS * _CHECKS_PER_DAY * _ARTICLES_PER_CHECK
+    items = users * _DAYS * _ITEMS_PER_REPORT
+    return f"reported_articles {articles:,}행, report_cache {users * _DAYS:,}행, report_items {items:,}행"
+
+
+def main(users: int = 1000) -> None:
+    asyncio.run(_run(users))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""결과 매핑 제목 매칭 벤치마크: 선형 탐색 vs 제목 색인.
+
+기사 300건 × LLM 결과 60건에서 두 방식이 같은 기사를 고르는지 확인하고 소요 시간을 비교한다.
+
+    python -m benchmarks.bench_title_match
+"""
+
+import random
+import time
+
+from src.bot.handlers import _TitleIndex, _match_article
+
+_WORDS = [
+    "서부지검", "대표", "소환", "구속영장", "청구", "경찰", "압수수색", "회계장부",
+    "의혹", "수사", "확대", "법원", "영장", "기각", "피의자", "체포", "고발", "혐의",
+]
+_TAGS = ["", "", "", "[단독] ", "[속보] ", "[종합] "]
+
+
+def _title(rng: random.Random) -> str:
+    return rng.choice(_TAGS) + " ".join(rng.choice(_WORDS) for _ in range(rng.randint(3, 9)))
+
+
+def _llm_title(rng: random.Random, articles: list[dict]) -> str:
+    """LLM이 제목을 그대로/태그 없이/일부만/새로 쓴 경우를 섞는다."""
+    title = rng.choice(articles)["title"]
+    kind = rng.random()
+    if kind < 0.3:
+        return title
+    if kind < 0.6:
+        return title.split("] ")[-1]
+    if kind < 0.85:
+        return title.split("] ")[-1][:rng.randint(15, 30)]
+    return _title(rng)
+
+
+def main(n_articles: int = 300, n_results: int = 60, repeat: int = 20) -> None:
+    rng = random.Random(42)
+    articles = [
+        {"title": _title(rng), "link": f"https://n.news.naver.com/{i}"} for i in range(n_articles)
+    ]
+    queries = [_llm_title(rng, articles) for _ in range(n_results)]
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        linear = [_match_article(q, articles) for q in queries]
+    linear_ms = (time.perf_counter() - started) / repeat * 1000
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        index = _TitleIndex(articles)
+        indexed = [index.match(q) for q in queries]
+    indexed_ms = (time.perf_counter() - started) / repeat * 1000
+
+    assert all(a is b for a, b in zip(linear, indexed)), "매칭 결과 불일치"
+    matched = sum(1 for m in indexed if m is not None)
+    print(f"기사 {n_articles}건 × 결과 {n_results}건 (매칭 {matched}건, 결과 동일)")
+    print(f"  선형 탐색: {linear_ms:.2f} ms")
+    print(f"  제목 색인: {indexed_ms:.2f} ms (색인 생성 포함)")
+
+
+if __name__ == "__main__":
+    main()
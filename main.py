@@ -17,17 +17,25 @@ if os.environ.get("LANGFUSE_PUBLIC_KEY"):
     AnthropicInstrumentor().instrument()
     get_client()
 
-from src.config import TELEGRAM_BOT_TOKEN, DB_PATH
+from src import metrics
+from src.config import (
+    TELEGRAM_BOT_TOKEN, DB_PATH, METRICS_HOST, METRICS_PORT, PIPELINE_MEMORY_SAMPLE_SECONDS,
+    PIPELINE_WORKERS,
+)
 from src.storage.models import init_db
 from src.storage.repository import cleanup_old_data
+from src.agents.llm_client import close_clients
 from src.bot.conversation import build_conversation_handler
 from src.bot.handlers import (
-    check_handler, report_handler,
+    check_handler, cancel_check_handler, report_handler,
     set_division_handler, set_division_callback,
     status_handler, stats_handler,
 )
 from src.bot.settings import build_settings_handler
-from src.bot.scheduler import restore_schedules
+from src.bot.scheduler import restore_schedules, restore_pipeline_jobs
+from src.bot.jobs import start_workers, stop_workers
+from src.bot.admission import pipeline_slots, sample_memory
+from src.tools.scraper import scrape_semaphore
 
 logging.basicConfig(
     format="%(asctime)s [%(name)s] %(levelname)s: %(message)s",
@@ -50,15 +58,24 @@ async def post_init(application: Application) -> None:
     application.bot_data["db"] = db
     await cleanup_old_data(db)
     await restore_schedules(application, db)
+    # 파이프라인 워커 프로세스 (PIPELINE_WORKERS 설정 시) + 재시작 전 작업 결과 복원
+    if PIPELINE_WORKERS:
+        await start_workers(PIPELINE_WORKERS)
+        await restore_pipeline_jobs(application, db)
 
     # 매일 04:00 KST 자동 캐시 정리
     _KST = timezone(timedelta(hours=9))
     application.job_queue.run_daily(
         _daily_cleanup, time=time(hour=4, minute=0, tzinfo=_KST), name="daily_cleanup",
     )
+    # 메모리 여유에 따른 동시 파이프라인 한도 조정
+    application.job_queue.run_repeating(
+        sample_memory, interval=PIPELINE_MEMORY_SAMPLE_SECONDS, first=0, name="memory_sample",
+    )
     # 봇 명령어 목록 등록
     await application.bot.set_my_commands([
         BotCommand("check", "키워드 기반 타사 체크"),
+        BotCommand("cancel_check", "진행 중인 타사 체크 취소"),
         BotCommand("report", "부서 주요 뉴스 브리핑"),
         BotCommand("status", "현재 설정 조회"),
         BotCommand("set_schedule", "자동 실행 예약 설정"),
@@ -67,11 +84,26 @@ async def post_init(application: Application) -> None:
         BotCommand("set_apikey", "Claude API 키 변경"),
     ])
 
+    # /metrics 엔드포인트 (METRICS_PORT 설정 시)
+    metrics.register_gauge("tasa_pipeline_in_use", "실행 중인 파이프라인 수", lambda: pipeline_slots.in_use)
+    metrics.register_gauge("tasa_pipeline_waiting", "슬롯 대기 중인 파이프라인 수", lambda: pipeline_slots.waiting)
+    metrics.register_gauge("tasa_pipeline_capacity", "현재 동시 실행 한도", lambda: pipeline_slots.capacity)
+    metrics.register_gauge(
+        "tasa_pipeline_memory_estimate_bytes", "파이프라인당 메모리 추정치",
+        lambda: pipeline_slots.per_pipeline,
+    )
+    metrics.register_semaphore("scrape", scrape_semaphore)
+    if METRICS_PORT:
+        await metrics.start_server(METRICS_HOST, METRICS_PORT)
+
     logger.info("DB 초기화 완료: %s", DB_PATH)
 
 
 async def post_shutdown(application: Application) -> None:
-    """앱 종료 시 DB 연결 닫기."""
+    """앱 종료 시 워커 + 메트릭 엔드포인트 + LLM 연결 풀 + DB 연결 닫기."""
+    await stop_workers()
+    await metrics.stop_server()
+    await close_clients()
     db = application.bot_data.get("db")
     if db:
         await db.close()
@@ -93,6 +125,7 @@ def main() -> None:
 
     # /check 타사 체크
     app.add_handler(CommandHandler("check", check_handler))
+    app.add_handler(CommandHandler("cancel_check", cancel_check_handler))
 
     # /report 부서 뉴스 브리핑
     app.add_handler(CommandHandler("report", report_handler))
@@ -0,0 +1,105 @@
+"""Message Batches 실행 모드.
+
+지연에 민감하지 않은 예약 실행의 분석 요청을 Message Batches로 제출하고,
+JobQueue 폴링으로 완료 여부를 확인해 결과 메시지를 돌려준다.
+배치 처리는 동기 호출보다 비용이 낮고 대기 중 파이프라인 슬롯을 점유하지 않는다.
+
+BATCH_BACKEND=local이면 Anthropic 배치 API 대신 messages.create를
+백그라운드에서 실행하는 로컬 대체 구현을 사용한다 (테스트·개발용).
+"""
+
+import asyncio
+import logging
+import uuid
+
+from src.config import BATCH_BACKEND
+from src.agents.llm_client import get_client
+
+logger = logging.getLogger(__name__)
+
+# 로컬 대체 구현의 진행 중 배치 (batch_id → Task)
+_local_batches: dict[str, asyncio.Task] = {}
+
+
+async def _run_local_batch(api_key: str, requests: list[tuple[str, dict]]) -> dict:
+    """로컬 대체 구현: 요청을 순차 실행하고 custom_id별 결과 메시지를 모은다."""
+    client = get_client(api_key)
+    results = {}
+    for custom_id, params in requests:
+        try:
+            results[custom_id] = await client.messages.create(**params)
+        except Exception:
+            logger.warning("로컬 배치 요청 실패: %s", custom_id, exc_info=True)
+            results[custom_id] = None
+    return results
+
+
+async def submit_batch(api_key: str, requests: list[tuple[str, dict]]) -> str:
+    """분석 요청들을 배치로 제출하고 batch_id를 반환한다.
+
+    Args:
+        api_key: Anthropic API 키
+        requests: (custom_id, messages.create 파라미터) 리스트
+
+    Returns:
+        폴링에 사용할 batch_id
+    """
+    if BATCH_BACKEND == "local":
+        batch_id = f"local_{uuid.uuid4().hex[:12]}"
+        _local_batches[batch_id] = asyncio.create_task(_run_local_batch(api_key, requests))
+    else:
+        client = get_client(api_key)
+        batch = await client.messages.batches.create(
+            requests=[
+                {"custom_id": custom_id, "params": params}
+                for custom_id, params in requests
+            ],
+        )
+        batch_id = batch.id
+    logger.info("배치 제출: %s (%d건, backend=%s)", batch_id, len(requests), BATCH_BACKEND)
+    return batch_id
+
+
+async def get_batch_results(api_key: str, batch_id: str) -> dict | None:
+    """배치 결과를 조회한다.
+
+    Returns:
+        처리 중이면 None. 완료되면 {custom_id: Message 또는 None(실패/만료)}.
+    """
+    if batch_id.startswith("local_"):
+        task = _local_batches.get(batch_id)
+        if task is None:
+            return {}
+        if not task.done():
+            return None
+        _local_batches.pop(batch_id, None)
+        if task.exception() is not None:
+            return {}
+        return task.result()
+
+    client = get_client(api_key)
+    batch = await client.messages.batches.retrieve(batch_id)
+    if batch.processing_status != "ended":
+        return None
+
+    results = {}
+    async for entry in await client.messages.batches.results(batch_id):
+        if entry.result.type == "succeeded":
+            results[entry.custom_id] = entry.result.message
+        else:
+            logger.warning("배치 요청 실패: %s (%s)", entry.custom_id, entry.result.type)
+            results[entry.custom_id] = None
+    return results
+
+
+async def cancel_batch(api_key: str, batch_id: str) -> None:
+    """대기 시간을 초과한 배치를 취소한다. 실패해도 무시한다."""
+    if batch_id.startswith("local_"):
+        task = _local_batches.pop(batch_id, None)
+        if task is not None:
+            task.cancel()
+        return
+    try:
+        await get_client(api_key).messages.batches.cancel(batch_id)
+    except Exception:
+        logger.warning("배치 취소 실패: %s", batch_id, exc_info=True)
@@ -5,15 +5,20 @@
 Haiku 사전 필터로 부서 무관 기사를 제거한 뒤 Haiku로 분석한다.
 """
 
-import json
 import logging
 from datetime import datetime, timezone, timedelta
 
 import anthropic
 from langfuse import get_client as get_langfuse
 
+from src import deadline
 from src.config import DEPARTMENT_PROFILES
 from src.filters.publisher import get_publisher_name
+from src.agents.llm_client import create_message, get_client
+from src.agents.recovery import (
+    build_continuation_messages, complete_items, covered_indices,
+    log_recovery_stats, new_recovery_stats, plain_json_array, repair_json_array,
+)
 
 _KST = timezone(timedelta(hours=9))
 
@@ -64,6 +69,9 @@ async def filter_check_articles(
     """
     if not articles:
         return []
+    if deadline.expired():
+        logger.warning("마감 도달: LLM 필터 생략, 전체 기사 %d건 통과", len(articles))
+        return articles
 
     dept_label = _dept_label(department)
     profile = DEPARTMENT_PROFILES.get(dept_label, {})
@@ -97,16 +105,23 @@ async def filter_check_articles(
         as_type="span", name="check_filter",
         metadata={"department": department, "input_count": len(articles)},
     ):
-        client = anthropic.AsyncAnthropic(api_key=api_key, max_retries=3)
-        message = await client.messages.create(
-            model="claude-haiku-4-5-20251001",
-            max_tokens=2048,
-            temperature=0.0,
-            system=system_prompt,
-            messages=[{"role": "user", "content": article_list_text}],
-            tools=[_CHECK_FILTER_TOOL],
-            tool_choice={"type": "tool", "name": "filter_news"},
-        )
+        client = get_client(api_key)
+        try:
+            message = await create_message(
+                client,
+                model="claude-haiku-4-5-20251001",
+                max_tokens=2048,
+                temperature=0.0,
+                system=system_prompt,
+                messages=[{"role": "user", "content": article_list_text}],
+                tools=[_CHECK_FILTER_TOOL],
+                tool_choice={"type": "tool", "name": "filter_news"},
+            )
+        except anthropic.APITimeoutError:
+            if not deadline.expired():
+                raise
+            logger.warning("마감 도달: LLM 필터 시간 초과, 전체 기사 %d건 통과", len(articles))
+            return articles
 
     # tool_use 응답에서 인덱스 추출
     for block in message.content:
@@ -393,32 +408,52 @@ def _build_system_prompt(keywords: list[str], department: str) -> str:
     )
 
 
-def _try_parse_json_field(raw, field_name: str):
-    """tool_use 응답 필드가 문자열인 경우 JSON 파싱을 시도한다."""
+_RESULT_REQUIRED = _ANALYSIS_TOOL["input_schema"]["properties"]["results"]["items"]["required"]
+_SKIPPED_REQUIRED = _ANALYSIS_TOOL["input_schema"]["properties"]["skipped"]["items"]["required"]
+
+
+def _try_parse_json_field(raw, field_name: str, stats: dict | None = None):
+    """tool_use 응답 필드가 문자열인 경우 JSON 파싱을 시도한다.
+
+    파싱이 실패하면 완결된 배열 요소만 회수하는 로컬 복구를 시도한다.
+    """
     if isinstance(raw, str):
         logger.warning("%s가 문자열로 반환됨 (%d chars), JSON 파싱 시도", field_name, len(raw))
-        try:
-            return json.loads(raw)
-        except (json.JSONDecodeError, ValueError):
+        repaired, partial = repair_json_array(raw)
+        if repaired is None:
             logger.error("%s JSON 파싱 실패", field_name)
             return None
+        if partial:
+            logger.warning("%s 부분 복구: 완결 요소 %d건 회수", field_name, len(repaired))
+        # json.loads로 바로 읽히는 문자열은 재호출 없이도 성공했으므로 복구로 세지 않는다
+        if stats is not None and (partial or not plain_json_array(raw)):
+            stats["repaired"] += 1
+        return repaired
     return raw
 
 
-def _parse_analysis_response(message) -> list[dict] | None:
-    """tool_use 응답에서 분석 결과를 추출한다. 파싱 실패 시 None."""
+def _parse_analysis_response(message, stats: dict | None = None) -> list[dict] | None:
+    """tool_use 응답에서 분석 결과를 추출한다. 파싱 실패 시 None.
+
+    stop_reason이 max_tokens이면 필수 필드를 갖춘 완결 요소만 남긴다.
+    """
+    truncated = message.stop_reason == "max_tokens"
     for block in message.content:
         if block.type == "tool_use" and block.name == "submit_analysis":
             raw_input = block.input
             raw_results = raw_input.get("results", [])
             raw_skipped = raw_input.get("skipped", [])
             # LLM이 배열을 JSON 문자열로 반환하는 경우 파싱
-            parsed_results = _try_parse_json_field(raw_results, "results")
-            parsed_skipped = _try_parse_json_field(raw_skipped, "skipped")
+            parsed_results = _try_parse_json_field(raw_results, "results", stats)
+            parsed_skipped = _try_parse_json_field(raw_skipped, "skipped", stats)
             if parsed_results is None or parsed_skipped is None:
                 return None
-            results = [r for r in parsed_results if isinstance(r, dict)]
-            skipped = [s for s in parsed_skipped if isinstance(s, dict)]
+            if truncated:
+                results = complete_items(parsed_results, _RESULT_REQUIRED)
+                skipped = complete_items(parsed_skipped, _SKIPPED_REQUIRED)
+            else:
+                results = [r for r in parsed_results if isinstance(r, dict)]
+                skipped = [s for s in parsed_skipped if isinstance(s, dict)]
             if len(results) != len(parsed_results) or len(skipped) != len(parsed_skipped):
                 logger.warning(
                     "타입 필터링 발생: results %d→%d, skipped %d→%d, raw_keys=%s",
@@ -439,14 +474,55 @@ def _parse_analysis_response(message) -> list[dict] | None:
     return None
 
 
+def _salvaged_tool_input(message, parsed: list[dict]) -> dict:
+    """회수한 결과를 submit_analysis 입력 형태로 되돌린다 (이어쓰기 assistant 턴용)."""
+    thinking = ""
+    for block in message.content:
+        if block.type == "tool_use" and block.name == "submit_analysis":
+            raw = block.input.get("thinking", "")
+            thinking = raw if isinstance(raw, str) else ""
+            break
+    results = [r for r in parsed if r.get("category") != "skip"]
+    skipped = [
+        {k: v for k, v in s.items() if k != "category"}
+        for s in parsed if s.get("category") == "skip"
+    ]
+    return {"thinking": thinking, "results": results, "skipped": skipped}
+
+
+def build_analysis_request(
+    articles: list[dict],
+    history: list[dict],
+    department: str,
+    keywords: list[str] | None = None,
+) -> dict:
+    """분석 호출의 messages.create 파라미터를 조립한다 (동기 호출·배치 제출 공용)."""
+    system_prompt = _build_system_prompt(keywords or [], department)
+    user_prompt = _build_user_prompt(articles, history, department, keywords=keywords)
+    return {
+        "model": "claude-haiku-4-5-20251001",
+        "max_tokens": 16384,
+        "temperature": 0.0,
+        "system": system_prompt,
+        "messages": [{"role": "user", "content": user_prompt}],
+        "tools": [_ANALYSIS_TOOL],
+        "tool_choice": {"type": "tool", "name": "submit_analysis"},
+    }
+
+
 async def analyze_articles(
     api_key: str,
     articles: list[dict],
     history: list[dict],
     department: str,
     keywords: list[str] | None = None,
+    first_message=None,
 ) -> list[dict]:
-    """Claude API로 기사를 분석한다 (tool_use 방식, 파싱 실패 시 최대 4회 재시도).
+    """Claude API로 기사를 분석한다 (tool_use 방식, 최대 5회 호출).
+
+    파싱 실패 시 로컬 복구를 먼저 시도하고, max_tokens로 잘린 응답은
+    완결된 요소를 회수한 뒤 미분류 기사만 이어쓰기로 요청한다.
+    복구가 불가능할 때만 temperature를 올려 전체 재생성한다.
 
     Args:
         api_key: 기자의 Anthropic API 키
@@ -454,36 +530,51 @@ async def analyze_articles(
         history: 최근 72시간 보고 이력
         department: 기자 부서
         keywords: 기자의 취재 키워드 목록
+        first_message: 이미 받은 첫 응답 (배치 결과). 있으면 첫 호출 대신 이 응답부터 처리한다
 
     Returns:
         분석 결과 리스트 (주요 + 스킵 병합).
 
     Raises:
-        RuntimeError: 5회 시도 후에도 파싱 실패 시
+        RuntimeError: 5회 호출 후에도 결과를 얻지 못한 경우
     """
-    system_prompt = _build_system_prompt(keywords or [], department)
-    user_prompt = _build_user_prompt(articles, history, department, keywords=keywords)
+    params = build_analysis_request(articles, history, department, keywords)
+    messages = params["messages"]
+    user_prompt = messages[0]["content"]
 
     langfuse = get_langfuse()
+    stats = new_recovery_stats()
+    collected: list[dict] = []
+    failures = 0
+    empty_result = False
 
     for attempt in range(5):
-        # 재시도마다 temperature를 0.1씩 올려 동일 실패 패턴 회피
-        temperature = round(attempt * 0.1, 1)
-
-        with langfuse.start_as_current_observation(
-            as_type="span", name="check_agent",
-            metadata={"department": department, "attempt": attempt + 1},
-        ):
-            client = anthropic.AsyncAnthropic(api_key=api_key, max_retries=3)
-            message = await client.messages.create(
-                model="claude-haiku-4-5-20251001",
-                max_tokens=16384,
-                temperature=temperature,
-                system=system_prompt,
-                messages=[{"role": "user", "content": user_prompt}],
-                tools=[_ANALYSIS_TOOL],
-                tool_choice={"type": "tool", "name": "submit_analysis"},
-            )
+        if attempt > 0 and deadline.expired():
+            # 마감 도달: 재시도·이어쓰기 중단, 회수분이 있으면 부분 결과로 반환
+            log_recovery_stats("check", stats)
+            if collected:
+                logger.warning("마감 도달: 분석 부분 결과 %d건 반환", len(collected))
+                return collected
+            raise RuntimeError("분석 시간 한도 초과")
+
+        # 전체 재생성마다 temperature를 0.1씩 올려 동일 실패 패턴 회피
+        temperature = round(failures * 0.1, 1)
+
+        if attempt == 0 and first_message is not None:
+            message = first_message
+        else:
+            with langfuse.start_as_current_observation(
+                as_type="span", name="check_agent",
+                metadata={
+                    "department": department, "attempt": attempt + 1,
+                    "continuation": len(messages) > 1,
+                },
+            ):
+                message = await create_message(
+                    get_client(api_key),
+                    **{**params, "temperature": temperature, "messages": messages},
+                )
+            stats["calls"] += 1
 
         logger.info(
             "Claude 응답 (attempt %d): stop_reason=%s, input=%d tokens, output=%d tokens",
@@ -491,17 +582,52 @@ async def analyze_articles(
             message.usage.input_tokens, message.usage.output_tokens,
         )
 
-        parsed = _parse_analysis_response(message)
-        if parsed is not None:
-            # 기사가 제공됐는데 빈 결과 → 이상 응답 (모든 기사는 분류되어야 함)
-            if not parsed:
-                if attempt < 4:
-                    logger.warning("빈 결과 반환 (기사 %d건, attempt %d), 재시도", len(articles), attempt + 1)
+        repaired_before = stats["repaired"]
+        parsed = _parse_analysis_response(message, stats)
+        if parsed and stats["repaired"] > repaired_before:
+            # 로컬 복구 성공 → 전체 재호출 비용 절감
+            stats["tokens_saved"] += message.usage.input_tokens + message.usage.output_tokens
+
+        if parsed:
+            collected.extend(parsed)
+            if message.stop_reason == "max_tokens":
+                covered = covered_indices(collected)
+                remaining = [i for i in range(1, len(articles) + 1) if i not in covered]
+                if remaining and attempt < 4:
+                    # 잘린 응답: 완결 요소는 유지하고 미분류 기사만 이어쓰기 요청
+                    stats["continuations"] += 1
+                    stats["tokens_saved"] += message.usage.output_tokens
+                    logger.warning(
+                        "max_tokens 절단 (attempt %d): %d건 회수, 미분류 %d건 이어쓰기 요청",
+                        attempt + 1, len(parsed), len(remaining),
+                    )
+                    messages = build_continuation_messages(
+                        user_prompt, message, "submit_analysis",
+                        _salvaged_tool_input(message, collected),
+                        "출력 한도로 응답이 잘렸다. 위 제출분은 접수되었다. "
+                        "아직 분류되지 않은 아래 번호의 기사만 이어서 submit_analysis로 제출하라: "
+                        + ", ".join(str(i) for i in remaining),
+                    )
                     continue
-                raise RuntimeError("분석 결과 빈 배열 (5회 시도)")
-            return parsed
+            log_recovery_stats("check", stats)
+            return collected
 
-        if attempt < 4:
-            logger.warning("파싱 실패 (attempt %d), 재시도", attempt + 1)
+        if collected:
+            # 이어쓰기 응답이 비었거나 파싱 실패 → 회수분으로 종료
+            log_recovery_stats("check", stats)
+            return collected
 
+        # 기사가 제공됐는데 빈 결과 → 이상 응답 (모든 기사는 분류되어야 함)
+        empty_result = parsed is not None
+        failures += 1
+        if attempt < 4:
+            stats["retries"] += 1
+            if empty_result:
+                logger.warning("빈 결과 반환 (기사 %d건, attempt %d), 재시도", len(articles), attempt + 1)
+            else:
+                logger.warning("파싱 실패 (attempt %d), 재시도", attempt + 1)
+
+    log_recovery_stats("check", stats)
+    if empty_result:
+        raise RuntimeError("분석 결과 빈 배열 (5회 시도)")
     raise RuntimeError("분석 응답 파싱 실패 (5회 시도)")
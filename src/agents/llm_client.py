@@ -0,0 +1,115 @@
+"""Anthropic 클라이언트 풀.
+
+API 키별 AsyncAnthropic 인스턴스를 LRU로 재사용하고,
+모든 클라이언트가 애플리케이션 범위의 httpx.AsyncClient 하나를 공유하여
+호출마다 클라이언트 생성·TLS 연결 비용을 치르지 않도록 한다.
+"""
+
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+
+import anthropic
+import httpx
+
+from src import deadline, metrics
+from src.config import PIPELINE_MAX_CONCURRENCY
+
+logger = logging.getLogger(__name__)
+
+# 캐싱할 API 키(사용자) 수 상한
+_MAX_CLIENTS = 64
+# 파이프라인당 동시 LLM 호출 여유분 (필터 청크 병렬 호출 등)
+_CONNECTIONS_PER_PIPELINE = 4
+_KEEPALIVE_EXPIRY = 30.0
+# 클라이언트 기본 재시도 횟수 (마감이 있으면 create_message가 직접 재시도한다)
+_MAX_RETRIES = 3
+# 마감 안 재시도 전 대기 (초, 시도마다 2배)
+_RETRY_BACKOFF = 0.5
+
+_http_client: httpx.AsyncClient | None = None
+_clients: OrderedDict[str, anthropic.AsyncAnthropic] = OrderedDict()
+
+
+def _key_hash(api_key: str) -> str:
+    """풀 키로 쓸 API 키 해시. 평문 키를 메모리 dict 키로 두지 않는다."""
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """공유 HTTP 클라이언트를 반환한다. 없거나 닫혔으면 새로 만든다."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        max_connections = PIPELINE_MAX_CONCURRENCY * _CONNECTIONS_PER_PIPELINE
+        _http_client = anthropic.DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=_KEEPALIVE_EXPIRY,
+            ),
+            event_hooks={"response": [metrics.http_response_hook("anthropic")]},
+        )
+        # 닫힌 HTTP 클라이언트를 참조하는 기존 인스턴스는 폐기
+        _clients.clear()
+    return _http_client
+
+
+def get_client(api_key: str) -> anthropic.AsyncAnthropic:
+    """API 키에 해당하는 AsyncAnthropic 클라이언트를 반환한다 (LRU 캐시)."""
+    http_client = _get_http_client()
+    key = _key_hash(api_key)
+    client = _clients.get(key)
+    metrics.cache_lookup("llm_client", client is not None)
+    if client is not None:
+        _clients.move_to_end(key)
+        return client
+
+    client = anthropic.AsyncAnthropic(
+        api_key=api_key, max_retries=_MAX_RETRIES, http_client=http_client,
+    )
+    _clients[key] = client
+    if len(_clients) > _MAX_CLIENTS:
+        # 공유 HTTP 클라이언트를 쓰므로 축출 시 close하지 않는다
+        _clients.popitem(last=False)
+    return client
+
+
+def is_transient(e: Exception) -> bool:
+    """재시도하면 성공할 수 있는 API 오류인지 (SDK 재시도 기준과 같다)."""
+    if isinstance(e, anthropic.APIConnectionError):
+        return True
+    return isinstance(e, anthropic.APIStatusError) and (
+        e.status_code in (408, 409, 429) or e.status_code >= 500
+    )
+
+
+async def create_message(client: anthropic.AsyncAnthropic, **params):
+    """messages.create를 호출한다. 마감이 있으면 재시도까지 남은 시간 안에서 끝낸다.
+
+    마감이 없으면 SDK 재시도(_MAX_RETRIES)를 그대로 쓴다. 마감이 있으면 SDK 재시도는
+    호출마다 timeout이 새로 적용되어 최대 (_MAX_RETRIES + 1)배까지 늘어나므로 끄고,
+    일시적 오류는 남은 시간이 대기 시간보다 길 때만 직접 재시도한다.
+    """
+    if deadline.remaining() is None:
+        return await client.messages.create(**params)
+    client = client.with_options(max_retries=0)
+    for attempt in range(_MAX_RETRIES + 1):
+        try:
+            return await client.messages.create(**params, **deadline.request_options())
+        except Exception as e:
+            wait = _RETRY_BACKOFF * 2 ** attempt
+            if attempt == _MAX_RETRIES or not is_transient(e) or deadline.remaining() <= wait:
+                raise
+            logger.warning("Anthropic 호출 실패, %.1fs 후 재시도 (%d/%d): %s", wait, attempt + 1, _MAX_RETRIES, e)
+            await asyncio.sleep(wait)
+
+
+async def close_clients() -> None:
+    """풀을 비우고 공유 HTTP 클라이언트를 닫는다. 앱 종료 시 호출."""
+    global _http_client
+    _clients.clear()
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+    logger.info("Anthropic 클라이언트 풀 종료")
@@ -0,0 +1,196 @@
+"""LLM tool_use 응답 복구 유틸리티.
+
+파싱 실패 시 전체 재생성 대신 로컬 복구를 먼저 시도한다.
+- 문자열로 반환된 배열: JSON 파싱, 실패하면 완결된 요소만 회수
+- max_tokens 절단: 완결된 results[] 요소만 회수하고 나머지는 이어쓰기 요청
+"""
+
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _scan_complete_elements(raw: str) -> list:
+    """잘린 JSON 배열 문자열에서 완결된 최상위 요소만 파싱한다.
+
+    문자열 리터럴과 이스케이프를 인식하며 괄호 깊이를 추적하고,
+    깊이 1에서 닫힌 요소만 json.loads로 복원한다.
+    """
+    start = raw.find("[")
+    if start < 0:
+        return []
+
+    elements = []
+    depth = 0
+    in_string = False
+    escaped = False
+    elem_start = None
+
+    for pos in range(start, len(raw)):
+        ch = raw[pos]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+                if depth == 1 and elem_start is not None and raw[elem_start] == '"':
+                    # 최상위 문자열 요소 종료
+                    elements.append(raw[elem_start:pos + 1])
+                    elem_start = None
+            continue
+
+        if ch == '"':
+            in_string = True
+            if depth == 1 and elem_start is None:
+                elem_start = pos
+        elif ch in "[{":
+            depth += 1
+            if depth == 2 and elem_start is None:
+                elem_start = pos
+        elif ch in "]}":
+            if depth == 1 and elem_start is not None:
+                # 배열이 닫히기 직전의 마지막 리터럴 요소
+                elements.append(raw[elem_start:pos])
+                elem_start = None
+            depth -= 1
+            if depth == 1 and elem_start is not None:
+                elements.append(raw[elem_start:pos + 1])
+                elem_start = None
+            elif depth == 0:
+                break
+        elif depth == 1 and elem_start is None and not ch.isspace() and ch != ",":
+            # 숫자/리터럴 요소 시작
+            elem_start = pos
+        elif depth == 1 and elem_start is not None and ch == ",":
+            elements.append(raw[elem_start:pos])
+            elem_start = None
+
+    parsed = []
+    for text in elements:
+        try:
+            parsed.append(json.loads(text))
+        except (json.JSONDecodeError, ValueError):
+            continue
+    return parsed
+
+
+def repair_json_array(raw: str) -> tuple[list | None, bool]:
+    """문자열로 반환된 배열을 복구한다.
+
+    Returns:
+        (복구된 리스트, 부분 회수 여부). 배열 형태를 전혀 찾지 못하면 (None, False).
+    """
+    text = raw.strip()
+    # ```json ... ``` 코드 펜스 제거
+    if text.startswith("```"):
+        text = text.strip("`")
+        if text.startswith("json"):
+            text = text[4:]
+        text = text.strip()
+
+    try:
+        value = json.loads(text)
+    except (json.JSONDecodeError, ValueError):
+        value = None
+    else:
+        if isinstance(value, list):
+            return value, False
+        # 이중 인코딩된 문자열 ("[...]"가 한 번 더 문자열로 감싸진 경우)
+        if isinstance(value, str):
+            return repair_json_array(value)
+        return None, False
+
+    if "[" not in text:
+        return None, False
+    salvaged = _scan_complete_elements(text)
+    return salvaged, True
+
+
+def plain_json_array(raw: str) -> bool:
+    """복구 없이 json.loads만으로 배열이 읽히는지. 이런 응답은 로컬 복구 성과로 세지 않는다."""
+    try:
+        return isinstance(json.loads(raw), list)
+    except ValueError:
+        return False
+
+
+def complete_items(items: list, required: list[str]) -> list[dict]:
+    """필수 필드를 모두 갖춘 dict 요소만 남긴다 (절단된 마지막 요소 제거용)."""
+    return [
+        it for it in items
+        if isinstance(it, dict) and all(k in it for k in required)
+    ]
+
+
+def covered_indices(items: list[dict]) -> set[int]:
+    """항목들이 참조하는 기사 번호(source_indices + merged_indices) 집합."""
+    covered: set[int] = set()
+    for it in items:
+        for key in ("source_indices", "merged_indices"):
+            for idx in it.get(key) or []:
+                if isinstance(idx, int):
+                    covered.add(idx)
+    return covered
+
+
+def new_recovery_stats() -> dict:
+    """복구 통계 dict를 생성한다."""
+    return {
+        "calls": 0,
+        "retries": 0,
+        "repaired": 0,
+        "continuations": 0,
+        "tokens_saved": 0,
+    }
+
+
+def build_continuation_messages(
+    user_prompt: str,
+    message,
+    tool_name: str,
+    salvaged_input: dict,
+    instruction: str,
+) -> list[dict]:
+    """max_tokens로 잘린 응답에 대한 이어쓰기 요청 메시지를 구성한다.
+
+    회수한 tool_use 입력을 assistant 턴으로 되돌려주고,
+    tool_result로 남은 항목만 이어서 제출하도록 지시한다.
+    """
+    tool_use_id = ""
+    for block in message.content:
+        if block.type == "tool_use" and block.name == tool_name:
+            tool_use_id = block.id
+            break
+    return [
+        {"role": "user", "content": user_prompt},
+        {
+            "role": "assistant",
+            "content": [{
+                "type": "tool_use",
+                "id": tool_use_id,
+                "name": tool_name,
+                "input": salvaged_input,
+            }],
+        },
+        {
+            "role": "user",
+            "content": [{
+                "type": "tool_result",
+                "tool_use_id": tool_use_id,
+                "content": instruction,
+                "is_error": True,
+            }],
+        },
+    ]
+
+
+def log_recovery_stats(label: str, stats: dict) -> None:
+    """복구 통계를 로그로 남긴다."""
+    logger.info(
+        "%s 응답 복구 통계: 호출 %d회, 재시도 %d회, 로컬 복구 %d회, 이어쓰기 %d회, 절감 추정 %d tokens",
+        label, stats["calls"], stats["retries"], stats["repaired"],
+        stats["continuations"], stats["tokens_saved"],
+    )
@@ -4,15 +4,22 @@
 부서 관련 당일 뉴스를 선별, 분석, 구조화하여 반환한다.
 """
 
-import json
+import asyncio
 import logging
+import time
 from datetime import datetime, timezone, timedelta
 
 import anthropic
 from langfuse import get_client as get_langfuse
 
+from src import deadline, metrics
 from src.config import DEPARTMENT_PROFILES
 from src.filters.publisher import get_publisher_name
+from src.agents.llm_client import create_message, get_client, is_transient
+from src.agents.recovery import (
+    build_continuation_messages, complete_items,
+    log_recovery_stats, new_recovery_stats, plain_json_array, repair_json_array,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +33,13 @@ def _dept_label(department: str) -> str:
 
 # ── Haiku LLM 필터 ──────────────────────────────────────────
 
+# 필터 청크 크기 (청크당 Haiku 호출 1회, 동시 실행)
+_FILTER_CHUNK_SIZE = 50
+# 청크별 최대 시도 횟수 (실패한 청크만 재시도). SDK 자체 재시도는 끄고 이 횟수만 쓴다
+_FILTER_MAX_ATTEMPTS = 3
+# API 오류 재시도 전 대기 (초, 시도마다 2배)
+_FILTER_RETRY_BACKOFF = 0.5
+
 _FILTER_TOOL = {
     "name": "filter_news",
     "description": "부서 관련 기사 번호를 선별합니다",
@@ -52,6 +66,7 @@ async def filter_articles(
 
     본문 스크래핑 전에 제목+description만으로 판단하여
     부서 무관 기사, 사진 캡션, 명백한 홍보성 기사를 제거한다.
+    입력은 _FILTER_CHUNK_SIZE건 단위 청크로 나눠 동시에 처리하고 원래 순서로 병합한다.
 
     Args:
         api_key: Anthropic API 키
@@ -63,6 +78,9 @@ async def filter_articles(
     """
     if not articles:
         return []
+    if deadline.expired():
+        logger.warning("마감 도달: LLM 필터 생략, 전체 기사 %d건 통과", len(articles))
+        return articles
 
     dept_label = _dept_label(department)
     profile = DEPARTMENT_PROFILES.get(dept_label, {})
@@ -70,15 +88,6 @@ async def filter_articles(
     criteria = profile.get("criteria", [])
     criteria_text = "\n".join(f"  - {c}" for c in criteria)
 
-    # 기사 목록 텍스트 조립 (번호, 언론사, 제목, description)
-    lines = []
-    for i, a in enumerate(articles, 1):
-        pub = get_publisher_name(a.get("originallink", "")) or "?"
-        title = a.get("title", "")
-        desc = a.get("description", "")
-        lines.append(f"[{i}] {pub} | {title} | {desc}")
-    article_list_text = "\n".join(lines)
-
     system_prompt = (
         f"당신은 {dept_label} 뉴스 필터입니다.\n"
         f"취재 영역: {coverage}\n"
@@ -96,34 +105,128 @@ async def filter_articles(
         as_type="span", name="report_filter",
         metadata={"department": department, "input_count": len(articles)},
     ):
-        client = anthropic.AsyncAnthropic(api_key=api_key, max_retries=3)
-        message = await client.messages.create(
-            model="claude-haiku-4-5-20251001",
-            max_tokens=2048,
-            temperature=0.0,
-            system=system_prompt,
-            messages=[{"role": "user", "content": article_list_text}],
-            tools=[_FILTER_TOOL],
-            tool_choice={"type": "tool", "name": "filter_news"},
-        )
+        # 청크 재시도는 _filter_chunk가 맡으므로 SDK 재시도와 곱해지지 않게 끈다
+        client = get_client(api_key).with_options(max_retries=0)
+        chunks = [
+            articles[i:i + _FILTER_CHUNK_SIZE]
+            for i in range(0, len(articles), _FILTER_CHUNK_SIZE)
+        ]
+        tasks = [
+            asyncio.create_task(_filter_chunk(client, system_prompt, chunk, n, len(chunks)))
+            for n, chunk in enumerate(chunks, 1)
+        ]
+        try:
+            selections = await asyncio.gather(*tasks)
+        except BaseException:
+            # 한 청크가 실패하면 결과를 쓸 수 없으므로 나머지 청크 호출을 멈춘다
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    # 청크 순서대로 병합 → 원래 기사 순서 유지
+    filtered = [a for selected in selections for a in selected]
+    logger.info(
+        "LLM 필터 결과: %d건 → %d건 (부서: %s, %d개 청크)",
+        len(articles), len(filtered), department, len(chunks),
+    )
+    return filtered
 
-    # tool_use 응답에서 인덱스 추출
-    for block in message.content:
-        if block.type == "tool_use" and block.name == "filter_news":
-            indices = block.input.get("selected_indices", [])
-            # 1-based → 0-based 변환, 범위 검증
-            filtered = []
-            for idx in indices:
-                if isinstance(idx, int) and 1 <= idx <= len(articles):
-                    filtered.append(articles[idx - 1])
-            logger.info(
-                "LLM 필터 결과: %d건 → %d건 (부서: %s)",
-                len(articles), len(filtered), department,
+
+async def _filter_chunk(
+    client, system_prompt: str, chunk: list[dict], chunk_no: int, chunk_count: int,
+) -> list[dict]:
+    """기사 청크 하나를 필터링한다. 실패한 청크만 재시도한다.
+
+    재시도 후에도 tool_use 응답이 없으면 청크 전체를 통과시킨다 (애매하면 포함).
+    일시적 API 오류(연결·429·5xx)는 대기 후 재시도하고, 그 외 오류나 재시도 소진 시
+    마지막 예외를 그대로 올린다. 마감이 있으면 호출 timeout을 남은 시간으로 두고,
+    마감에 걸리면 재시도하지 않고 청크 전체를 통과시킨다.
+    """
+    # 기사 목록 텍스트 조립 (번호, 언론사, 제목, description) — 청크 내 번호
+    lines = []
+    for i, a in enumerate(chunk, 1):
+        pub = get_publisher_name(a.get("originallink", "")) or "?"
+        title = a.get("title", "")
+        desc = a.get("description", "")
+        lines.append(f"[{i}] {pub} | {title} | {desc}")
+    article_list_text = "\n".join(lines)
+
+    for attempt in range(1, _FILTER_MAX_ATTEMPTS + 1):
+        if attempt > 1 and deadline.expired():
+            logger.warning("마감 도달: LLM 필터 청크 %d/%d 재시도 중단, 청크 전체 통과", chunk_no, chunk_count)
+            return chunk
+        started = time.monotonic()
+        try:
+            message = await client.messages.create(
+                model="claude-haiku-4-5-20251001",
+                max_tokens=2048,
+                temperature=0.0,
+                system=system_prompt,
+                messages=[{"role": "user", "content": article_list_text}],
+                tools=[_FILTER_TOOL],
+                tool_choice={"type": "tool", "name": "filter_news"},
+                **deadline.request_options(),
+            )
+        except asyncio.CancelledError:
+            # 다른 청크 실패로 취소됨
+            metrics.record(
+                "report", "llm_filter_chunk", time.monotonic() - started, len(chunk), status="cancelled",
+            )
+            raise
+        except Exception as e:
+            metrics.record(
+                "report", "llm_filter_chunk", time.monotonic() - started, len(chunk),
+                status="timeout" if isinstance(e, anthropic.APITimeoutError) else "error",
+            )
+            logger.warning(
+                "LLM 필터 청크 %d/%d 실패 (%d/%d회, %.2fs): %s",
+                chunk_no, chunk_count, attempt, _FILTER_MAX_ATTEMPTS,
+                time.monotonic() - started, e,
             )
-            return filtered
+            if isinstance(e, anthropic.APITimeoutError) and deadline.expired():
+                logger.warning("마감 도달: LLM 필터 청크 %d/%d 시간 초과, 청크 전체 통과", chunk_no, chunk_count)
+                return chunk
+            wait = _FILTER_RETRY_BACKOFF * 2 ** (attempt - 1)
+            remaining = deadline.remaining()
+            if attempt == _FILTER_MAX_ATTEMPTS or not is_transient(e) or (
+                remaining is not None and remaining <= wait
+            ):
+                raise
+            await asyncio.sleep(wait)
+            continue
+        elapsed = time.monotonic() - started
+
+        # tool_use 응답에서 인덱스 추출 (max_tokens 절단 시 누락 가능하므로 재시도)
+        indices = None
+        if message.stop_reason != "max_tokens":
+            for block in message.content:
+                if block.type == "tool_use" and block.name == "filter_news":
+                    indices = block.input.get("selected_indices", [])
+                    break
+        metrics.record(
+            "report", "llm_filter_chunk", elapsed, len(chunk),
+            len(indices) if indices is not None else None,
+            tokens=message.usage.input_tokens + message.usage.output_tokens,
+            status="ok" if indices is not None else "error",
+        )
+        if indices is None:
+            logger.warning(
+                "LLM 필터 청크 %d/%d tool_use 응답 없음 (%d/%d회, %.2fs)",
+                chunk_no, chunk_count, attempt, _FILTER_MAX_ATTEMPTS, elapsed,
+            )
+            continue
 
-    logger.warning("LLM 필터 tool_use 응답 없음, 전체 기사 반환")
-    return articles
+        # 1-based → 0-based 변환, 범위 검증, 순서 유지
+        valid = sorted({idx for idx in indices if isinstance(idx, int) and 1 <= idx <= len(chunk)})
+        logger.info(
+            "LLM 필터 청크 %d/%d: %d건 → %d건, %.2fs (시도 %d회)",
+            chunk_no, chunk_count, len(chunk), len(valid), elapsed, attempt,
+        )
+        return [chunk[idx - 1] for idx in valid]
+
+    logger.warning("LLM 필터 청크 %d/%d 재시도 소진, 청크 전체 통과", chunk_no, chunk_count)
+    return chunk
 
 
 # ── 메인 분석 ────────────────────────────────────────────────
@@ -384,20 +487,34 @@ def _build_user_prompt(
     return "\n\n".join(sections)
 
 
-def _parse_report_response(message, scenario: str) -> list[dict] | None:
-    """tool_use 응답에서 브리핑 결과를 추출한다. 파싱 실패 시 None."""
+def _parse_report_response(message, scenario: str, stats: dict | None = None) -> list[dict] | None:
+    """tool_use 응답에서 브리핑 결과를 추출한다. 파싱 실패 시 None.
+
+    문자열 배열은 로컬 복구를 시도하고, stop_reason이 max_tokens이면
+    필수 필드를 갖춘 완결 요소만 남긴다.
+    """
+    truncated = message.stop_reason == "max_tokens"
     for block in message.content:
         if block.type == "tool_use" and block.name == "submit_report":
             raw_results = block.input.get("results", [])
             # LLM이 배열을 JSON 문자열로 반환하는 경우 파싱
             if isinstance(raw_results, str):
                 logger.warning("results가 문자열로 반환됨 (%d chars), JSON 파싱 시도", len(raw_results))
-                try:
-                    raw_results = json.loads(raw_results)
-                except (json.JSONDecodeError, ValueError):
+                repaired, partial = repair_json_array(raw_results)
+                if repaired is None:
                     logger.error("results JSON 파싱 실패")
                     return None
-            results = [r for r in raw_results if isinstance(r, dict)]
+                if partial:
+                    logger.warning("results 부분 복구: 완결 요소 %d건 회수", len(repaired))
+                # json.loads로 바로 읽히는 문자열은 재호출 없이도 성공했으므로 복구로 세지 않는다
+                if stats is not None and (partial or not plain_json_array(raw_results)):
+                    stats["repaired"] += 1
+                raw_results = repaired
+            if truncated:
+                required = _build_report_tool(scenario == "B")["input_schema"]["properties"]["results"]["items"]["required"]
+                results = complete_items(raw_results, required)
+            else:
+                results = [r for r in raw_results if isinstance(r, dict)]
             if len(results) != len(raw_results):
                 logger.warning(
                     "타입 필터링 발생: results %d→%d",
@@ -416,14 +533,55 @@ def _parse_report_response(message, scenario: str) -> list[dict] | None:
     return None
 
 
+def _salvaged_tool_input(message, parsed: list[dict]) -> dict:
+    """회수한 결과를 submit_report 입력 형태로 되돌린다 (이어쓰기 assistant 턴용)."""
+    thinking = ""
+    for block in message.content:
+        if block.type == "tool_use" and block.name == "submit_report":
+            raw = block.input.get("thinking", "")
+            thinking = raw if isinstance(raw, str) else ""
+            break
+    results = [
+        {k: v for k, v in r.items() if k not in ("category", "prev_reference")}
+        for r in parsed
+    ]
+    return {"thinking": thinking, "results": results}
+
+
+def build_report_request(
+    articles: list[dict],
+    report_history: list[dict],
+    existing_items: list[dict] | None,
+    department: str,
+) -> dict:
+    """분석 호출의 messages.create 파라미터를 조립한다 (동기 호출·배치 제출 공용)."""
+    is_scenario_b = existing_items is not None and len(existing_items) > 0
+    system_prompt = _build_system_prompt(department, existing_items)
+    user_prompt = _build_user_prompt(articles, report_history, existing_items)
+    return {
+        "model": "claude-haiku-4-5-20251001",
+        "max_tokens": 16384,
+        "temperature": 0.0,
+        "system": system_prompt,
+        "messages": [{"role": "user", "content": user_prompt}],
+        "tools": [_build_report_tool(is_scenario_b)],
+        "tool_choice": {"type": "tool", "name": "submit_report"},
+    }
+
+
 async def analyze_report_articles(
     api_key: str,
     articles: list[dict],
     report_history: list[dict],
     existing_items: list[dict] | None,
     department: str,
+    first_message=None,
 ) -> list[dict]:
-    """Claude API로 기사를 분석하여 브리핑을 생성한다 (tool_use 방식, 파싱 실패 시 최대 4회 재시도).
+    """Claude API로 기사를 분석하여 브리핑을 생성한다 (tool_use 방식, 최대 5회 호출).
+
+    파싱 실패 시 로컬 복구를 먼저 시도하고, max_tokens로 잘린 응답은
+    완결된 항목을 회수한 뒤 나머지만 이어쓰기로 요청한다.
+    복구가 불가능할 때만 temperature를 올려 전체 재생성한다.
 
     Args:
         api_key: Anthropic API 키
@@ -431,39 +589,53 @@ async def analyze_report_articles(
         report_history: 최근 2일치 report_items 이력
         existing_items: 시나리오 B일 때 당일 기존 캐시 항목 (None이면 시나리오 A)
         department: 부서명
+        first_message: 이미 받은 첫 응답 (배치 결과). 있으면 첫 호출 대신 이 응답부터 처리한다
 
     Returns:
         브리핑 항목 리스트. 빈 배열은 유효 (중요 기사 없음 또는 변경 없음).
 
     Raises:
-        RuntimeError: 5회 시도 후에도 파싱 실패 시
+        RuntimeError: 5회 호출 후에도 파싱 실패 시
     """
-    system_prompt = _build_system_prompt(department, existing_items)
-    user_prompt = _build_user_prompt(articles, report_history, existing_items)
+    params = build_report_request(articles, report_history, existing_items, department)
+    messages = params["messages"]
+    user_prompt = messages[0]["content"]
 
     is_scenario_b = existing_items is not None and len(existing_items) > 0
     scenario = "B" if is_scenario_b else "A"
 
     langfuse = get_langfuse()
+    stats = new_recovery_stats()
+    collected: list[dict] = []
+    failures = 0
 
     for attempt in range(5):
-        # 재시도마다 temperature를 0.1씩 올려 동일 실패 패턴 회피
-        temperature = round(attempt * 0.1, 1)
-
-        with langfuse.start_as_current_observation(
-            as_type="span", name="report_agent",
-            metadata={"department": department, "scenario": scenario, "attempt": attempt + 1},
-        ):
-            client = anthropic.AsyncAnthropic(api_key=api_key, max_retries=3)
-            message = await client.messages.create(
-                model="claude-haiku-4-5-20251001",
-                max_tokens=16384,
-                temperature=temperature,
-                system=system_prompt,
-                messages=[{"role": "user", "content": user_prompt}],
-                tools=[_build_report_tool(is_scenario_b)],
-                tool_choice={"type": "tool", "name": "submit_report"},
-            )
+        if attempt > 0 and deadline.expired():
+            # 마감 도달: 재시도·이어쓰기 중단, 회수분이 있으면 부분 결과로 반환
+            log_recovery_stats("report", stats)
+            if collected:
+                logger.warning("마감 도달: 브리핑 부분 결과 %d건 반환", len(collected))
+                return collected
+            raise RuntimeError("브리핑 시간 한도 초과")
+
+        # 전체 재생성마다 temperature를 0.1씩 올려 동일 실패 패턴 회피
+        temperature = round(failures * 0.1, 1)
+
+        if attempt == 0 and first_message is not None:
+            message = first_message
+        else:
+            with langfuse.start_as_current_observation(
+                as_type="span", name="report_agent",
+                metadata={
+                    "department": department, "scenario": scenario, "attempt": attempt + 1,
+                    "continuation": len(messages) > 1,
+                },
+            ):
+                message = await create_message(
+                    get_client(api_key),
+                    **{**params, "temperature": temperature, "messages": messages},
+                )
+            stats["calls"] += 1
 
         logger.info(
             "Claude 응답 (attempt %d): stop_reason=%s, input=%d tokens, output=%d tokens",
@@ -471,11 +643,44 @@ async def analyze_report_articles(
             message.usage.input_tokens, message.usage.output_tokens,
         )
 
-        parsed = _parse_report_response(message, scenario)
-        if parsed is not None:
-            return parsed
+        repaired_before = stats["repaired"]
+        parsed = _parse_report_response(message, scenario, stats)
+        if parsed and stats["repaired"] > repaired_before:
+            # 로컬 복구 성공 → 전체 재호출 비용 절감
+            stats["tokens_saved"] += message.usage.input_tokens + message.usage.output_tokens
+
+        # 잘린 응답에서 회수한 항목이 하나도 없으면 전체 재생성 대상
+        cut_before_results = message.stop_reason == "max_tokens" and not parsed and not collected
+        if parsed is not None and not cut_before_results:
+            collected.extend(parsed)
+            if message.stop_reason == "max_tokens" and parsed and attempt < 4:
+                # 잘린 응답: 완결 항목은 유지하고 나머지만 이어쓰기 요청
+                stats["continuations"] += 1
+                stats["tokens_saved"] += message.usage.output_tokens
+                logger.warning(
+                    "max_tokens 절단 (attempt %d): %d건 회수, 이어쓰기 요청",
+                    attempt + 1, len(parsed),
+                )
+                messages = build_continuation_messages(
+                    user_prompt, message, "submit_report",
+                    _salvaged_tool_input(message, collected),
+                    "출력 한도로 응답이 잘렸다. 위 results는 접수되었다. "
+                    "이미 제출한 항목은 반복하지 말고, 나머지 기사 중 기준을 충족하는 항목만 "
+                    "이어서 submit_report로 제출하라. 추가 항목이 없으면 빈 배열을 제출하라.",
+                )
+                continue
+            log_recovery_stats("report", stats)
+            return collected
+
+        if collected:
+            # 이어쓰기 응답 파싱 실패 → 회수분으로 종료
+            log_recovery_stats("report", stats)
+            return collected
 
+        failures += 1
         if attempt < 4:
+            stats["retries"] += 1
             logger.warning("파싱 실패 (attempt %d), 재시도", attempt + 1)
 
+    log_recovery_stats("report", stats)
     raise RuntimeError("브리핑 응답 파싱 실패 (5회 시도)")
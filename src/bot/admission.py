@@ -0,0 +1,238 @@
+"""파이프라인 실행 슬롯 스케줄러.
+
+전역 동시 파이프라인 수(MAX_CONCURRENT_PIPELINES)를 지키면서, 대기 중인 요청을
+선착순이 아니라 우선순위 클래스 순으로 입장시킨다.
+
+- 클래스: 대화형(/check, /report) > 예약 실행 > 백그라운드(사전 계산 등)
+- 에이징: PIPELINE_AGING_SECONDS만큼 기다릴 때마다 한 단계씩 승격해 기아를 막는다
+- 사용자 공정성: 같은 클래스 안에서는 현재 실행 중인 파이프라인이 적은 사용자를 먼저 입장
+
+대기 시간은 metrics에 queue.<클래스> 단계로 기록되고, 대기에 들어간 요청은
+on_queued 콜백으로 대기 순번을 받는다.
+
+동시 실행 한도는 고정값이 아니다. 주기적으로 프로세스 RSS를 샘플링해
+파이프라인당 메모리 사용량을 추정(EWMA)하고, RSS 상한까지 남은 여유에 맞춰
+한도를 늘리거나 줄인다. 추정치만큼의 여유가 없으면 슬롯이 비어 있어도 입장시키지 않는다.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+from src import metrics
+from src.config import (
+    MAX_CONCURRENT_PIPELINES, PIPELINE_AGING_SECONDS,
+    PIPELINE_MIN_CONCURRENCY, PIPELINE_MAX_CONCURRENCY,
+    PIPELINE_MEMORY_LIMIT_MB, PIPELINE_MEMORY_ESTIMATE_MB,
+)
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_SCHEDULED = 1
+PRIORITY_BACKGROUND = 2
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_SCHEDULED: "scheduled",
+    PRIORITY_BACKGROUND: "background",
+}
+
+_MB = 1024 * 1024
+# 파이프라인당 메모리 추정치 EWMA 가중치
+_ESTIMATE_ALPHA = 0.3
+
+
+@dataclass
+class _Waiter:
+    priority: int
+    user_id: str
+    enqueued_at: float
+    seq: int
+    future: asyncio.Future = field(repr=False)
+
+
+class PipelineScheduler:
+    """우선순위·에이징·사용자 공정성을 갖춘 비동기 슬롯 관리자."""
+
+    def __init__(
+        self,
+        capacity: int,
+        aging_seconds: float = PIPELINE_AGING_SECONDS,
+        memory_limit: int = PIPELINE_MEMORY_LIMIT_MB * _MB,
+        min_capacity: int = PIPELINE_MIN_CONCURRENCY,
+        max_capacity: int = PIPELINE_MAX_CONCURRENCY,
+    ):
+        self.capacity = capacity
+        self.aging_seconds = aging_seconds
+        self.memory_limit = memory_limit
+        self.min_capacity = min_capacity
+        self.max_capacity = max_capacity
+        # 파이프라인당 메모리 추정치(바이트)와 유휴 시 RSS 기준선
+        self.per_pipeline = PIPELINE_MEMORY_ESTIMATE_MB * _MB
+        self._baseline: int | None = None
+        self._rss: int | None = None
+        self._in_use = 0
+        self._running: dict[str, int] = {}
+        self._waiters: list[_Waiter] = []
+        self._seq = itertools.count()
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def waiting_by_priority(self) -> dict[str, int]:
+        """클래스별 대기 수."""
+        counts = {name: 0 for name in PRIORITY_NAMES.values()}
+        for w in self._waiters:
+            counts[PRIORITY_NAMES[w.priority]] += 1
+        return counts
+
+    def _rank(self, waiter: _Waiter, now: float) -> tuple:
+        aged = int((now - waiter.enqueued_at) // self.aging_seconds) if self.aging_seconds else 0
+        return (
+            max(waiter.priority - aged, 0),
+            self._running.get(waiter.user_id, 0),
+            waiter.seq,
+        )
+
+    def position(self, waiter: _Waiter) -> int:
+        """현재 기준 대기 순번 (1부터)."""
+        now = time.monotonic()
+        rank = self._rank(waiter, now)
+        return 1 + sum(1 for w in self._waiters if w is not waiter and self._rank(w, now) < rank)
+
+    def _grant(self, user_id: str) -> None:
+        self._in_use += 1
+        self._running[user_id] = self._running.get(user_id, 0) + 1
+
+    def _release(self, user_id: str) -> None:
+        self._in_use -= 1
+        remaining = self._running.get(user_id, 0) - 1
+        if remaining > 0:
+            self._running[user_id] = remaining
+        else:
+            self._running.pop(user_id, None)
+        self._dispatch()
+
+    def _has_headroom(self) -> bool:
+        """마지막 RSS 샘플 기준으로 파이프라인 하나를 더 받을 메모리 여유가 있는지.
+
+        실행 중인 파이프라인이 없으면 항상 허용해 대기열이 멈추지 않게 한다.
+        """
+        if self._rss is None or self._in_use == 0:
+            return True
+        return self._rss + self.per_pipeline <= self.memory_limit
+
+    def _can_admit(self) -> bool:
+        return self._in_use < self.capacity and self._has_headroom()
+
+    def _dispatch(self) -> None:
+        """빈 슬롯만큼 가장 순위가 높은 대기자를 입장시킨다."""
+        while self._waiters and self._can_admit():
+            now = time.monotonic()
+            waiter = min(self._waiters, key=lambda w: self._rank(w, now))
+            self._waiters.remove(waiter)
+            self._grant(waiter.user_id)
+            waiter.future.set_result(None)
+
+    def set_capacity(self, capacity: int) -> None:
+        """동시 실행 한도를 바꾼다. 늘어난 만큼 대기자를 바로 입장시킨다."""
+        self.capacity = capacity
+        self._dispatch()
+
+    def observe_memory(self, rss: int) -> None:
+        """RSS 샘플로 파이프라인당 추정치와 동시 실행 한도를 갱신한다.
+
+        유휴 상태의 RSS를 기준선으로 두고, 실행 중일 때 (RSS - 기준선) / 실행 수를
+        EWMA로 반영한다. 새 한도 = 실행 수 + 남은 여유 / 파이프라인당 추정치.
+        """
+        self._rss = rss
+        if self._in_use == 0:
+            self._baseline = rss
+        elif self._baseline is not None and rss > self._baseline:
+            observed = (rss - self._baseline) / self._in_use
+            self.per_pipeline = int(
+                (1 - _ESTIMATE_ALPHA) * self.per_pipeline + _ESTIMATE_ALPHA * observed
+            )
+
+        headroom = self.memory_limit - rss
+        capacity = self._in_use + max(int(headroom // max(self.per_pipeline, 1)), 0)
+        capacity = min(max(capacity, self.min_capacity), self.max_capacity)
+        if capacity != self.capacity:
+            logger.info(
+                "동시 실행 한도 조정 %d → %d (RSS %dMB, 여유 %dMB, 파이프라인당 ~%dMB, 실행 %d, 대기 %d)",
+                self.capacity, capacity, rss // _MB, headroom // _MB,
+                self.per_pipeline // _MB, self._in_use, len(self._waiters),
+            )
+        self.set_capacity(capacity)
+
+    async def _acquire(self, priority: int, user_id: str, on_queued) -> None:
+        started = time.monotonic()
+        if not self._waiters and self._can_admit():
+            self._grant(user_id)
+            metrics.record("queue", PRIORITY_NAMES[priority], 0.0)
+            return
+
+        logger.info(
+            "파이프라인 대기: user=%s class=%s (실행 %d/%d, %s, 대기 %d)",
+            user_id, PRIORITY_NAMES[priority], self._in_use, self.capacity,
+            "메모리 여유 부족" if not self._has_headroom() else "슬롯 부족",
+            len(self._waiters),
+        )
+
+        waiter = _Waiter(
+            priority, user_id, started, next(self._seq),
+            asyncio.get_running_loop().create_future(),
+        )
+        self._waiters.append(waiter)
+        try:
+            if on_queued is not None:
+                position = self.position(waiter)
+                try:
+                    await on_queued(position)
+                except Exception:
+                    logger.warning("대기 순번 안내 실패 (user=%s)", user_id, exc_info=True)
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # 입장 직후 취소: 받은 슬롯을 돌려준다
+                self._release(user_id)
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+        waited = time.monotonic() - started
+        metrics.record("queue", PRIORITY_NAMES[priority], waited)
+        logger.info(
+            "파이프라인 입장: user=%s class=%s 대기 %.1fs",
+            user_id, PRIORITY_NAMES[priority], waited,
+        )
+
+    @asynccontextmanager
+    async def slot(self, priority: int, user_id: str, on_queued=None):
+        """슬롯을 얻어 with 블록을 실행한다.
+
+        슬롯이 없어 대기하게 되면 on_queued(순번)를 한 번 호출한다.
+        """
+        await self._acquire(priority, user_id, on_queued)
+        try:
+            yield
+        finally:
+            self._release(user_id)
+
+
+# handlers와 scheduler가 공유하는 전역 슬롯 (1GB RAM 서버 OOM 방지)
+pipeline_slots = PipelineScheduler(MAX_CONCURRENT_PIPELINES)
+
+
+async def sample_memory(context=None) -> None:
+    """JobQueue 반복 job: RSS를 샘플링해 동시 실행 한도를 조정한다."""
+    pipeline_slots.observe_memory(metrics.rss_bytes())
@@ -0,0 +1,183 @@
+"""Telegram 메시지 전송 계층.
+
+결과 전송이 메시지마다 순차 await하던 방식은 예약 실행 피크에 Telegram 제한
+(전체 약 30건/초, 채팅별 약 1건/초)에 걸리기 쉽고 RetryAfter(429)를 처리하지 않았다.
+
+- 전역 토큰 버킷(TELEGRAM_GLOBAL_RATE)과 채팅별 토큰 버킷(TELEGRAM_CHAT_RATE, 순간 허용량
+  TELEGRAM_CHAT_BURST)으로 속도를 맞춘다.
+- 같은 채팅의 메시지 묶음은 채팅별 잠금으로 순서를 지킨다.
+- RetryAfter를 받으면 지시된 시간만큼 전역 전송을 멈췄다가 재시도한다.
+- DELIVERY_PACK_MESSAGES가 켜져 있으면 본문 메시지를 4096자 이내로 묶어 보낸다.
+
+지연과 제한 대기는 metrics에 delivery.* 단계와 tasa_telegram_throttled_total로 기록한다.
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+from datetime import timedelta
+
+from telegram.error import RetryAfter
+
+from src import metrics
+from src.config import (
+    TELEGRAM_GLOBAL_RATE, TELEGRAM_CHAT_RATE, TELEGRAM_CHAT_BURST,
+    DELIVERY_PACK_MESSAGES,
+)
+
+logger = logging.getLogger(__name__)
+
+# Telegram 메시지 최대 길이
+MAX_MESSAGE_LENGTH = 4096
+# RetryAfter 재시도 횟수
+_MAX_RETRY_AFTER = 3
+_PACK_SEPARATOR = "\n\n"
+
+
+class _TokenBucket:
+    """초당 rate개, 최대 capacity개까지 쌓이는 토큰 버킷."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+
+    def block(self, seconds: float) -> None:
+        """seconds 동안 토큰을 내주지 않는다 (RetryAfter)."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> float:
+        """토큰 1개를 얻는다. 기다린 시간(초)을 반환한다."""
+        started = time.monotonic()
+        while True:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                await asyncio.sleep(self._blocked_until - now)
+                continue
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return now - started
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class _ChatState:
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.bucket = _TokenBucket(TELEGRAM_CHAT_RATE, TELEGRAM_CHAT_BURST)
+
+
+_global_bucket = _TokenBucket(TELEGRAM_GLOBAL_RATE, TELEGRAM_GLOBAL_RATE)
+# 전송 함수가 살아 있는 동안만 유지되는 채팅별 상태
+_chats: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+
+def _retry_seconds(e: RetryAfter) -> float:
+    delay = e.retry_after
+    return delay.total_seconds() if isinstance(delay, timedelta) else float(delay)
+
+
+def chat_sender(send_fn, chat_id: int | str):
+    """send_fn(reply_text 또는 bot.send_message 래퍼)을 속도 제한·재시도가 적용된 전송 함수로 감싼다.
+
+    반환 함수는 send_fn과 같은 시그니처이며, send_batch에서 채팅 순서 보장에 쓰는
+    chat 속성을 가진다.
+    """
+    key = str(chat_id)
+    state = _chats.get(key)
+    if state is None:
+        state = _ChatState()
+        _chats[key] = state
+
+    async def send(text, **kwargs):
+        for attempt in range(_MAX_RETRY_AFTER + 1):
+            waited = await _global_bucket.acquire() + await state.bucket.acquire()
+            if waited > 0:
+                metrics.inc("tasa_telegram_throttled_total", reason="rate_limit")
+                metrics.record("delivery", "throttle_wait", waited)
+            started = time.monotonic()
+            try:
+                result = await send_fn(text, **kwargs)
+            except RetryAfter as e:
+                delay = _retry_seconds(e)
+                metrics.inc("tasa_telegram_throttled_total", reason="retry_after")
+                if attempt == _MAX_RETRY_AFTER:
+                    raise
+                logger.warning("Telegram RetryAfter %.1fs (chat=%s, 재시도 %d)", delay, key, attempt + 1)
+                _global_bucket.block(delay)
+                continue
+            metrics.record("delivery", "message", time.monotonic() - started, nbytes=len(text.encode()))
+            return result
+
+    send.chat = state
+    return send
+
+
+def pack_messages(messages: list[str], limit: int = MAX_MESSAGE_LENGTH) -> list[str]:
+    """연속된 메시지를 limit자 이내로 이어 붙인다. 순서는 유지한다."""
+    packed: list[str] = []
+    for msg in messages:
+        if packed and len(packed[-1]) + len(_PACK_SEPARATOR) + len(msg) <= limit:
+            packed[-1] += _PACK_SEPARATOR + msg
+        else:
+            packed.append(msg)
+    return packed
+
+
+def split_message(text: str, limit: int = MAX_MESSAGE_LENGTH) -> list[str]:
+    """긴 텍스트를 limit자 이내 메시지들로 나눈다.
+
+    문단(빈 줄) 경계를 우선하고, limit보다 긴 문단은 줄 단위로, 그보다 긴 줄은 limit자씩 자른다.
+    """
+    pieces: list[str] = []
+    for paragraph in text.split(_PACK_SEPARATOR):
+        if len(paragraph) <= limit:
+            pieces.append(paragraph)
+            continue
+        chunk = ""
+        for line in paragraph.split("\n"):
+            while len(line) > limit:
+                if chunk:
+                    pieces.append(chunk)
+                    chunk = ""
+                pieces.append(line[:limit])
+                line = line[limit:]
+            if chunk and len(chunk) + 1 + len(line) > limit:
+                pieces.append(chunk)
+                chunk = line
+            else:
+                chunk = f"{chunk}\n{line}" if chunk else line
+        if chunk:
+            pieces.append(chunk)
+    return pack_messages(pieces, limit)
+
+
+async def send_batch(send_fn, header: str, messages: list[str]) -> None:
+    """헤더(링크 미리보기 허용) + 본문 메시지를 한 묶음으로 순서대로 전송한다.
+
+    chat_sender로 감싼 send_fn이면 같은 채팅의 다른 묶음과 섞이지 않는다.
+    """
+    if DELIVERY_PACK_MESSAGES:
+        messages = pack_messages(messages)
+
+    state = getattr(send_fn, "chat", None)
+    started = time.monotonic()
+    if state is not None:
+        async with state.lock:
+            await _send_all(send_fn, header, messages)
+    else:
+        await _send_all(send_fn, header, messages)
+    metrics.record(
+        "delivery", "batch", time.monotonic() - started,
+        items_in=len(messages) + 1, nbytes=sum(len(m.encode()) for m in [header, *messages]),
+    )
+
+
+async def _send_all(send_fn, header: str, messages: list[str]) -> None:
+    await send_fn(header, parse_mode="HTML")
+    for msg in messages:
+        await send_fn(msg, parse_mode="HTML", disable_web_page_preview=True)
@@ -1,8 +1,10 @@
 """/check, /report, /set_apikey, /set_division, /set_keyword 명령 핸들러."""
 
 import asyncio
+import bisect
 import logging
 import re
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime, timedelta, timezone
 
 import anthropic
@@ -19,11 +21,14 @@ def _normalize_title(title: str) -> str:
 
 
 def _match_article(llm_title: str, articles: list[dict]) -> dict | None:
-    """LLM이 반환한 제목으로 원본 기사를 매칭한다.
+    """LLM이 반환한 제목으로 원본 기사를 매칭한다 (선형 탐색).
 
     1순위: 정확 일치
     2순위: 정규화 후 일치 (대괄호 태그 제거 등)
     3순위: 한쪽이 다른 쪽에 포함 (substring)
+
+    결과 매핑은 같은 규칙을 색인으로 수행하는 _TitleIndex를 쓴다.
+    이 함수는 매칭 동작의 기준 구현이다.
     """
     if not llm_title:
         return None
@@ -50,6 +55,93 @@ def _match_article(llm_title: str, articles: list[dict]) -> dict | None:
     return None
 
 
+# substring 폴백 색인 n-gram 길이
+_GRAM = 3
+
+
+class _TitleIndex:
+    """기사 제목 색인. _match_article과 같은 결과를 결과 수와 무관하게 빠르게 낸다.
+
+    - 정확 일치 / 정규화 일치: 제목 → 첫 기사 위치 dict
+    - substring 폴백: 후보를 좁힌 뒤 원래 조건으로 검증
+      (LLM 제목 ⊂ 기사 제목: 정규화 제목을 이어 붙인 문자열에서 str.find로 위치 탐색,
+       기사 제목 ⊂ LLM 제목: 첫 3-gram이 LLM 제목에 나오는 기사 + 3자 미만 제목)
+      대부분의 결과는 정확·정규화 일치로 끝나므로 폴백 색인은 처음 필요할 때 만든다.
+    여러 기사가 맞으면 선형 탐색과 같이 목록상 가장 앞선 기사를 반환한다.
+    """
+
+    def __init__(self, articles: list[dict]):
+        self._articles = articles
+        self._exact: dict[str, int] = {}
+        self._norm: dict[str, int] = {}
+        self._norms: list[str] = []
+        for i, a in enumerate(articles):
+            title = a["title"]
+            norm = _normalize_title(title)
+            self._norms.append(norm)
+            self._exact.setdefault(title, i)
+            if norm:
+                self._norm.setdefault(norm, i)
+        self._joined: str | None = None
+        self._starts: list[int] = []
+        self._first_gram: dict[str, list[int]] = {}
+        self._short: list[int] = []
+
+    def _build_fallback(self) -> str:
+        pos = 0
+        for i, norm in enumerate(self._norms):
+            self._starts.append(pos)
+            pos += len(norm) + 1
+            if not norm:
+                continue
+            if len(norm) < _GRAM:
+                self._short.append(i)
+            else:
+                self._first_gram.setdefault(norm[:_GRAM], []).append(i)
+        self._joined = "\0".join(self._norms)
+        return self._joined
+
+    def _containing(self, joined: str, needle: str) -> set[int]:
+        """정규화 제목에 needle이 들어 있는 기사 위치 후보 (경계를 넘는 일치는 검증에서 걸러진다)."""
+        found = set()
+        pos = joined.find(needle)
+        while pos != -1:
+            found.add(bisect.bisect_right(self._starts, pos) - 1)
+            pos = joined.find(needle, pos + 1)
+        return found
+
+    def match(self, llm_title: str) -> dict | None:
+        if not llm_title:
+            return None
+
+        i = self._exact.get(llm_title)
+        if i is not None:
+            return self._articles[i]
+
+        norm_llm = _normalize_title(llm_title)
+        if norm_llm:
+            i = self._norm.get(norm_llm)
+            if i is not None:
+                return self._articles[i]
+
+        if len(norm_llm) < 15:
+            return None
+
+        joined = self._joined if self._joined is not None else self._build_fallback()
+        # norm_llm ⊂ norm_a 후보
+        candidates = self._containing(joined, norm_llm)
+        # norm_a ⊂ norm_llm 후보
+        for k in range(len(norm_llm) - _GRAM + 1):
+            candidates.update(self._first_gram.get(norm_llm[k:k + _GRAM], ()))
+        candidates.update(self._short)
+
+        for i in sorted(candidates):
+            norm_a = self._norms[i]
+            if norm_a and (norm_llm in norm_a or norm_a in norm_llm):
+                return self._articles[i]
+        return None
+
+
 def _map_results_to_articles(
     results: list[dict],
     articles: list[dict],
@@ -61,6 +153,7 @@ def _map_results_to_articles(
     폴백에서는 title을 덮어쓰지 않아 summary와의 일관성을 유지한다.
     """
     n = len(articles)
+    index = _TitleIndex(articles)
     for r in results:
         sources = r.pop("source_indices", [])
         merged = r.pop("merged_indices", [])
@@ -70,7 +163,7 @@ def _map_results_to_articles(
         r["source_count"] = len(valid_sources) + len(valid_merged)
 
         llm_title = r.get("title", "")
-        matched = _match_article(llm_title, articles)
+        matched = index.match(llm_title)
 
         if matched:
             r["url"] = matched[url_key]
@@ -92,19 +185,55 @@ def _map_results_to_articles(
             r.setdefault("publisher", "")
             r.setdefault("pub_time", "")
 
+
+def _local_skip_entry(
+    article: dict, reason: str, topic_cluster: str = "", history_duplicate: bool = False,
+) -> dict:
+    """LLM을 거치지 않고 로컬에서 스킵한 기사를 분석 결과(skip) 형태로 만든다.
+
+    history_duplicate는 이력 중복으로 뺀 기사 표시. 이미 reported_articles에 있는 기사이므로
+    전송 목록에만 보이고 다시 저장하지 않는다 (매 실행마다 skip 행이 쌓이지 않게).
+    """
+    pub_date = article.get("pubDate")
+    return {
+        "category": "skip",
+        "topic_cluster": topic_cluster or _normalize_title(article.get("title", "")),
+        "title": article.get("title", ""),
+        "summary": "",
+        "reason": reason,
+        "url": article.get("link", ""),
+        "publisher": get_publisher_name(article.get("originallink", "")) or "",
+        "pub_time": pub_date.strftime("%H:%M") if hasattr(pub_date, "strftime") else "",
+        "source_count": 1,
+        "history_duplicate": history_duplicate,
+    }
+
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes
 
 from src.config import (
     CHECK_MAX_WINDOW_SECONDS, REPORT_MAX_WINDOW_SECONDS,
-    DEPARTMENTS, DEPARTMENT_PROFILES, ADMIN_TELEGRAM_ID,
+    CHECK_DEADLINE_SECONDS, CHECK_ANALYSIS_RESERVE_SECONDS, CHECK_MIN_COLLECT_SECONDS,
+    SCHEDULE_MIN_RUN_SECONDS,
+    DEPARTMENTS, ADMIN_TELEGRAM_ID, PIPELINE_WORKERS,
 )
 from src.tools.search import search_news
 from src.tools.scraper import fetch_articles_batch
 from src.filters.publisher import filter_by_publisher, get_publisher_name
+from src.filters.history import dedup_against_history, select_relevant_history, estimate_tokens
+from src.filters.rules import split_by_title_rules, split_by_body_rules, is_exclusive
 from src.agents.check_agent import analyze_articles, filter_check_articles
-from src.agents.report_agent import filter_articles, analyze_report_articles
+from src.agents.report_agent import analyze_report_articles
 from src.storage import repository as repo
+from src import deadline, metrics
+from src.bot import jobs
+from src.bot.admission import pipeline_slots, PRIORITY_INTERACTIVE
+from src.bot.delivery import chat_sender, send_batch, split_message
+from src.bot.load_plan import capacity_forecast
+from src.bot.report_engine import (
+    get_department_articles, articles_since,
+    shared_analysis_enabled, get_department_candidates, diff_candidates,
+)
 from src.bot.formatters import (
     format_check_header, format_article_message, format_no_results,
     format_skipped_articles,
@@ -135,18 +264,118 @@ def format_error_message(e: Exception) -> str:
     return f"예상치 못한 오류: {type(e).__name__}"
 
 
-# 사용자별 동시 실행 방지 잠금
-_user_locks: dict[str, asyncio.Lock] = {}
+class _LockTable:
+    """사용자별 asyncio.Lock 테이블.
+
+    키마다 잠금을 쥐었거나 기다리는 코루틴 수를 세어(잡기 전에 늘리고 finally에서 줄임)
+    0이 되면 항목을 지운다. 쓰는 쪽이 없는 잠금만 지우므로 같은 키에 잠금이 둘 생기지 않는다.
+    """
 
-# 전역 동시 파이프라인 제한 (1GB RAM 서버 OOM 방지)
-_pipeline_semaphore = asyncio.Semaphore(5)
+    def __init__(self):
+        # key -> [Lock, 참조 수]
+        self._entries: dict[str, list] = {}
 
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def locked(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[0].locked()
+
+    @asynccontextmanager
+    async def hold(self, key: str):
+        """key의 잠금을 잡고 블록을 실행한다."""
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._entries[key]
 
-async def _run_check_pipeline(db, journalist: dict) -> tuple[list[dict] | None, datetime, datetime, int]:
-    """네이버 검색 → 필터 → 본문 수집 → Claude 분석 파이프라인.
+
+# 사용자별 동시 실행 방지 잠금 (쓰는 쪽이 없어지면 항목을 지운다)
+_user_locks = _LockTable()
+
+# (telegram_id, command) → 실행 중인 파이프라인 작업. 같은 요청은 여기에 합류한다
+_inflight: dict[tuple[str, str], asyncio.Task] = {}
+
+
+def _is_running(telegram_id: str, command: str) -> bool:
+    """같은 사용자·명령의 파이프라인이 실행 중인지."""
+    return (telegram_id, command) in _inflight
+
+
+async def _run_coalesced(telegram_id: str, command: str, factory) -> bool:
+    """같은 사용자·명령의 실행을 하나로 합친다.
+
+    실행 중인 작업이 있으면 새로 실행하지 않고 그 작업이 끝나기를 기다린다
+    (결과는 같은 채팅으로 전송되므로 합류한 요청도 같은 출력을 받는다).
+    없으면 factory()를 공유 작업으로 실행한다. 새로 실행했으면 True, 합류했으면 False.
+    요청자 취소가 공유 작업을 취소하지 않도록 shield한다.
+    """
+    key = (telegram_id, command)
+    task = _inflight.get(key)
+    if task is not None:
+        try:
+            await _await_shared(task)
+        except Exception:
+            # 오류 안내는 작업을 시작한 쪽이 한다
+            pass
+        return False
+
+    task = asyncio.create_task(factory())
+    _inflight[key] = task
+
+    def _clear(done: asyncio.Task) -> None:
+        if _inflight.get(key) is done:
+            del _inflight[key]
+
+    task.add_done_callback(_clear)
+    await _await_shared(task)
+    return True
+
+
+async def _await_shared(task: asyncio.Task) -> None:
+    """공유 작업을 기다린다. 작업 자체가 취소(/cancel_check)된 경우는 정상 종료로 본다."""
+    try:
+        await asyncio.shield(task)
+    except asyncio.CancelledError:
+        if not task.cancelled():
+            # 기다리던 쪽이 취소됨
+            raise
+
+
+def _cancel_running(telegram_id: str, command: str) -> bool:
+    """실행 중인 파이프라인 작업을 취소한다. 취소할 작업이 있었으면 True.
+
+    작업이 잡고 있던 사용자 잠금, 파이프라인 슬롯, 스크래핑 세마포어, HTTP 연결은
+    각 async with 블록이 취소 전파 과정에서 반납한다.
+    """
+    task = _inflight.get((telegram_id, command))
+    if task is None or task.done():
+        return False
+    task.cancel()
+    return True
+
+
+def _queue_notice(send_fn):
+    """파이프라인 슬롯 대기 시 순번을 알리는 on_queued 콜백을 만든다."""
+    async def on_queued(position: int) -> None:
+        await send_fn(f"요청이 많아 대기 중입니다 (대기 {position}번째). 순서가 되면 바로 시작합니다.")
+    return on_queued
+
+
+async def _collect_check_articles(db, journalist: dict) -> dict:
+    """네이버 검색 → 필터 → 이력 중복 제거 → 본문 수집. 분석 직전 상태를 반환한다.
 
     Returns:
-        (분석 결과 리스트, since, now, haiku_filtered). 기사가 없으면 결과는 None.
+        {since, now, haiku_filtered, local_skipped, articles, history}.
+        articles가 비어 있으면 분석할 기사가 없다.
     """
     now = datetime.now(UTC)
     last_check = journalist["last_check_at"]
@@ -156,39 +385,79 @@ async def _run_check_pipeline(db, journalist: dict) -> tuple[list[dict] | None,
     else:
         window_seconds = CHECK_MAX_WINDOW_SECONDS
     since = now - timedelta(seconds=window_seconds)
+    collected = {
+        "since": since, "now": now, "haiku_filtered": 0,
+        "local_skipped": [], "articles": [], "history": [],
+    }
 
     # 네이버 뉴스 수집 (Haiku 필터가 노이즈를 걸러주므로 400건까지 확대)
-    raw_articles = await search_news(journalist["keywords"], since, max_results=300)
+    with metrics.stage("check", "search") as st:
+        raw_articles = await search_news(journalist["keywords"], since, max_results=300)
+        st["out"] = len(raw_articles)
     if not raw_articles:
-        return None, since, now, 0
+        return collected
 
     # 언론사 필터링
-    filtered = filter_by_publisher(raw_articles)
+    with metrics.stage("check", "publisher_filter", len(raw_articles)) as st:
+        filtered = filter_by_publisher(raw_articles)
+        st["out"] = len(filtered)
     if not filtered:
-        return None, since, now, 0
+        return collected
 
-    # 제목 기반 필터링 (분석 가치 없는 기사 제거)
-    _SKIP_TITLE_TAGS = {"[포토]", "[사진]", "[영상]", "[동영상]", "[화보]", "[카드뉴스]", "[인포그래픽]"}
-    filtered = [
-        a for a in filtered
-        if not any(tag in a.get("title", "") for tag in _SKIP_TITLE_TAGS)
+    # 제목 규칙 사전 분류 (분석 가치 없는 기사 유형 skip)
+    with metrics.stage("check", "title_filter", len(filtered)) as st:
+        filtered, title_skipped = split_by_title_rules(filtered)
+        st["out"] = len(filtered)
+    collected["local_skipped"] = [_local_skip_entry(a, reason) for a, reason in title_skipped]
+    if not filtered:
+        return collected
+
+    # 이전 check 보고 이력 로드 + 로컬 이력 중복 제거 (이미 체크한 기사는 LLM·스크래핑 대상에서 제외)
+    with metrics.stage("check", "history_load", len(filtered)) as st:
+        history = await repo.get_recent_reported_articles(db, journalist["id"], hours=72)
+        filtered, duplicates = dedup_against_history(filtered, history)
+        st["out"] = len(filtered)
+    collected["local_skipped"] += [
+        _local_skip_entry(a, f"이전 체크와 중복 ({reason})", h["topic_cluster"], history_duplicate=True)
+        for a, h, reason in duplicates
     ]
     if not filtered:
-        return None, since, now, 0
+        return collected
 
     # Haiku 사전 필터 (부서 관련성)
     pre_filter_count = len(filtered)
-    filtered = await filter_check_articles(
-        journalist["api_key"], filtered,
-        journalist["department"],
-    )
-    haiku_filtered = pre_filter_count - len(filtered)
+    with metrics.stage("check", "llm_filter", pre_filter_count) as st:
+        st["tokens"] = estimate_tokens(
+            "".join(a.get("title", "") + a.get("description", "") for a in filtered)
+        )
+        filtered = await filter_check_articles(
+            journalist["api_key"], filtered,
+            journalist["department"],
+        )
+        st["out"] = len(filtered)
+    collected["haiku_filtered"] = pre_filter_count - len(filtered)
     if not filtered:
-        return None, since, now, haiku_filtered
+        return collected
 
     # 본문 수집 (Haiku 통과 기사만 스크래핑)
     urls = [a["link"] for a in filtered]
-    bodies = await fetch_articles_batch(urls)
+    with metrics.stage("check", "scrape", len(urls)) as st:
+        bodies = await fetch_articles_batch(urls)
+        st["out"] = sum(1 for b in bodies.values() if b)
+        st["bytes"] = sum(len(b.encode()) for b in bodies.values() if b)
+
+    # 본문 규칙 사전 분류 (키워드 미포함, 오늘자 날짜 표기 없음)
+    with metrics.stage("check", "body_filter", len(filtered)) as st:
+        filtered, body_skipped = split_by_body_rules(filtered, bodies, journalist["keywords"])
+        st["out"] = len(filtered)
+    collected["local_skipped"] += [_local_skip_entry(a, reason) for a, reason in body_skipped]
+    if title_skipped or body_skipped:
+        logger.info(
+            "규칙 사전 분류: 제목 %d건, 본문 %d건 skip, LLM 분석 %d건",
+            len(title_skipped), len(body_skipped), len(filtered),
+        )
+    if not filtered:
+        return collected
 
     # Claude 분석용 데이터 조립
     articles_for_analysis = []
@@ -204,32 +473,97 @@ async def _run_check_pipeline(db, journalist: dict) -> tuple[list[dict] | None,
             "pubDate": pub_date_str,
         })
 
-    # 이전 check 보고 이력 로드
-    history = await repo.get_recent_reported_articles(db, journalist["id"], hours=72)
+    # 남은 기사와 관련 있는 이력만 프롬프트에 포함
+    relevant_history = select_relevant_history(articles_for_analysis, history)
+    if duplicates or len(relevant_history) < len(history):
+        # 절감 추정은 빠진 이력 항목과 제외한 기사 텍스트만으로 잰다 (프롬프트를 두 번 조립하지 않음)
+        kept = {id(h) for h in relevant_history}
+        dropped_text = "".join(
+            h["topic_cluster"] + (h.get("reason", "") if h["category"] == "skip" else h.get("summary", ""))
+            for h in history if id(h) not in kept
+        ) + "".join(a["title"] + a.get("description", "") for a, _, _ in duplicates)
+        logger.info(
+            "이력 사전 중복 제거: 기사 %d건 제외, 이력 %d→%d건, 프롬프트 절감 추정 %d tokens",
+            len(duplicates), len(history), len(relevant_history), estimate_tokens(dropped_text),
+        )
+
+    collected["articles"] = articles_for_analysis
+    collected["history"] = relevant_history
+    return collected
 
-    # Claude API 분석
-    results = await analyze_articles(
-        api_key=journalist["api_key"],
-        articles=articles_for_analysis,
-        history=history,
-        department=journalist["department"],
-        keywords=journalist["keywords"],
-    )
 
+def _finish_check_results(results: list[dict], collected: dict) -> list[dict]:
+    """분석 결과에 원본 기사 정보를 매핑하고 로컬 스킵 항목을 합친다."""
     # Claude는 기사 번호(index)만 반환 → 원본 데이터에서 URL, 언론사를 주입
     if results:
-        _map_results_to_articles(results, articles_for_analysis, url_key="url")
+        _map_results_to_articles(results, collected["articles"], url_key="url")
+        # [단독] 태그 기사는 규칙상 단독으로 분류
+        for r in results:
+            if r["category"] != "skip" and is_exclusive(r.get("title", "")):
+                r["category"] = "exclusive"
+    return results + collected["local_skipped"]
+
+
+def _collection_budget(total: float) -> float:
+    """check 수집 단계 몫(초). 분석 몫을 먼저 남기되, 남는 수집 시간이
+    CHECK_MIN_COLLECT_SECONDS보다 짧을 만큼 전체가 짧으면 기본 비율로 나눈다.
+    """
+    if total - CHECK_ANALYSIS_RESERVE_SECONDS >= CHECK_MIN_COLLECT_SECONDS:
+        return total - CHECK_ANALYSIS_RESERVE_SECONDS
+    return total * (CHECK_DEADLINE_SECONDS - CHECK_ANALYSIS_RESERVE_SECONDS) / CHECK_DEADLINE_SECONDS
+
 
+async def _run_check_pipeline(db, journalist: dict) -> tuple[list[dict] | None, datetime, datetime, int]:
+    """네이버 검색 → 필터 → 본문 수집 → Claude 분석 파이프라인.
+
+    전체 실행은 CHECK_DEADLINE_SECONDS(바깥 마감이 더 이르면 그 마감) 안에 끝나도록 하고,
+    수집 단계는 분석 몫(_collection_budget)을 남긴 시점까지 모은 부분 결과로 진행한다.
+
+    Returns:
+        (분석 결과 리스트, since, now, haiku_filtered). 기사가 없으면 결과는 None.
+    """
+    with deadline.scope(CHECK_DEADLINE_SECONDS):
+        with deadline.scope(_collection_budget(deadline.remaining())):
+            collected = await _collect_check_articles(db, journalist)
+        since, now = collected["since"], collected["now"]
+        haiku_filtered = collected["haiku_filtered"]
+        if not collected["articles"]:
+            return collected["local_skipped"] or None, since, now, haiku_filtered
+
+        # Claude API 분석
+        with metrics.stage("check", "analysis", len(collected["articles"])) as st:
+            # 프롬프트를 다시 조립하지 않고 입력 길이로 추정한다 (프롬프트는 analyze_articles가 만든다)
+            st["tokens"] = estimate_tokens(
+                "".join(a.get("title", "") + a.get("body", "") for a in collected["articles"])
+                + "".join(h.get("topic_cluster", "") + h.get("summary", "") for h in collected["history"])
+            )
+            results = await analyze_articles(
+                api_key=journalist["api_key"],
+                articles=collected["articles"],
+                history=collected["history"],
+                department=journalist["department"],
+                keywords=journalist["keywords"],
+            )
+            st["out"] = len(results)
+
+    with metrics.stage("check", "mapping", len(results)) as st:
+        results = _finish_check_results(results, collected)
+        st["out"] = len(results)
     return results, since, now, haiku_filtered
 
 
-async def _run_report_pipeline(
-    db, journalist: dict, existing_items: list[dict] | None = None,
-) -> list[dict] | None:
-    """네이버 검색 → 언론사 필터 → LLM 필터 → 본문 수집 → Claude 분석 파이프라인.
+async def _collect_report_articles(
+    db, journalist: dict,
+    cache_id: int | None = None, existing_items: list[dict] | None = None,
+) -> dict | None:
+    """부서 공유 수집 결과에서 사용자 윈도우 기사를 골라 분석 직전 상태를 반환한다.
+
+    시나리오 B(existing_items 있음)면 당일 report_cache에서 이미 분석한
+    link를 제외하고 새 기사만 남긴다.
 
     Returns:
-        브리핑 항목 리스트. 수집 기사가 없으면 None.
+        {articles, report_history, since, snapshot}. 수집 기사가 없으면 None.
+        시나리오 B에서 새 기사가 없으면 articles가 빈 리스트.
     """
     now = datetime.now(UTC)
     last_report = journalist.get("last_report_at")
@@ -239,67 +573,45 @@ async def _run_report_pipeline(
     else:
         window_seconds = REPORT_MAX_WINDOW_SECONDS
     since = now - timedelta(seconds=window_seconds)
-    department = journalist["department"]
-    dept_label = department if department.endswith("부") else f"{department}부"
-
-    profile = DEPARTMENT_PROFILES.get(dept_label, {})
-    report_keywords = profile.get("report_keywords", [])
-    if not report_keywords:
-        return None
 
-    # 네이버 API 수집 (report는 400건 상한)
-    raw_articles = await search_news(report_keywords, since, max_results=300)
-    if not raw_articles:
+    # 검색 → 필터 → 본문 수집은 부서·시간 구간 단위로 한 번만 계산
+    snapshot = await get_department_articles(journalist["department"], journalist["api_key"])
+    articles_for_analysis = articles_since(snapshot, since)
+    if not articles_for_analysis:
         return None
 
-    # 언론사 필터
-    filtered = filter_by_publisher(raw_articles)
-    if not filtered:
-        return None
-
-    # LLM 필터 (Haiku) — 제목+description 기반
-    filtered = await filter_articles(journalist["api_key"], filtered, department)
-    if not filtered:
-        return None
-
-    # 본문 수집 (첫 3문단)
-    urls = [a["link"] for a in filtered]
-    bodies = await fetch_articles_batch(urls)
-
-    # 분석용 데이터 조립
-    articles_for_analysis = []
-    for a in filtered:
-        publisher = get_publisher_name(a["originallink"]) or ""
-        body = bodies.get(a["link"], "") or ""
-        pub_date_str = (
-            a["pubDate"].strftime("%Y-%m-%d %H:%M")
-            if hasattr(a["pubDate"], "strftime")
-            else str(a["pubDate"])
+    # 시나리오 B: 이전 실행에서 이미 분석한 기사는 다시 보내지 않음
+    if cache_id is not None and existing_items:
+        processed = await repo.get_processed_links(db, cache_id)
+        new_articles = [a for a in articles_for_analysis if a["link"] not in processed]
+        logger.info(
+            "시나리오 B 델타 입력: 수집 %d건 중 신규 %d건",
+            len(articles_for_analysis), len(new_articles),
         )
-        articles_for_analysis.append({
-            "title": a["title"],
-            "publisher": publisher,
-            "body": body,
-            "originallink": a["originallink"],
-            "link": a["link"],
-            "pubDate": pub_date_str,
-        })
+        articles_for_analysis = new_articles
 
     # 이전 report 이력 (2일치)
-    report_history = await repo.get_recent_report_items(db, journalist["id"])
-
-    # Claude 분석
-    results = await analyze_report_articles(
-        api_key=journalist["api_key"],
-        articles=articles_for_analysis,
-        report_history=report_history,
-        existing_items=existing_items,
-        department=department,
-    )
-
-    # source_indices → URL, 언론사, 배포시각 역매핑
+    with metrics.stage("report", "history_load") as st:
+        report_history = await repo.get_recent_report_items(db, journalist["id"])
+        st["out"] = len(report_history)
+
+    return {
+        "articles": articles_for_analysis,
+        "report_history": report_history,
+        "since": since,
+        "snapshot": snapshot,
+    }
+
+
+def _finish_report_results(
+    results: list[dict], articles: list[dict], existing_items: list[dict] | None,
+) -> list[dict]:
+    """source_indices → URL, 언론사, 배포시각 역매핑 + 시나리오 B 순번→DB ID 변환."""
     if results:
-        _map_results_to_articles(results, articles_for_analysis, url_key="link")
+        _map_results_to_articles(results, articles, url_key="link")
+        for r in results:
+            if is_exclusive(r.get("title", "")):
+                r["exclusive"] = True
 
         # 순번→DB ID 변환 (시나리오 B modified)
         if existing_items:
@@ -314,132 +626,261 @@ async def _run_report_pipeline(
     return results
 
 
+async def _run_report_pipeline(
+    db, journalist: dict, existing_items: list[dict] | None = None,
+    cache_id: int | None = None,
+) -> list[dict] | None:
+    """네이버 검색 → 언론사 필터 → LLM 필터 → 본문 수집 → Claude 분석 파이프라인.
+
+    Returns:
+        브리핑 항목 리스트. 수집 기사가 없으면 None.
+        시나리오 B에서 새 기사가 없으면 LLM 호출 없이 빈 리스트.
+    """
+    collected = await _collect_report_articles(db, journalist, cache_id, existing_items)
+    if collected is None:
+        return None
+    if not collected["articles"]:
+        return []
+
+    # 부서 후보 분석 공유: 사용자별로는 이력 diff만 수행 (지정 키 오류 시 자기 키로 분석)
+    candidates = None
+    if shared_analysis_enabled():
+        snapshot = collected["snapshot"]
+        candidates = await get_department_candidates(journalist["department"], snapshot)
+    if candidates is not None:
+        _finish_report_results(candidates, snapshot["articles"], None)
+        results = diff_candidates(
+            candidates, snapshot["articles"], collected["since"],
+            collected["report_history"], existing_items,
+        )
+    else:
+        # Claude 분석
+        with metrics.stage("report", "analysis", len(collected["articles"])) as st:
+            st["tokens"] = estimate_tokens(
+                "".join(a["title"] + a["body"] for a in collected["articles"])
+            )
+            results = await analyze_report_articles(
+                api_key=journalist["api_key"],
+                articles=collected["articles"],
+                report_history=collected["report_history"],
+                existing_items=existing_items,
+                department=journalist["department"],
+            )
+            st["out"] = len(results)
+        with metrics.stage("report", "mapping", len(results)) as st:
+            results = _finish_report_results(results, collected["articles"], existing_items)
+            st["out"] = len(results)
+
+    if cache_id is not None:
+        await repo.add_processed_links(db, cache_id, [a["link"] for a in collected["articles"]])
+    return results
+
+
+async def _execute_check(
+    db, journalist: dict, priority: int, on_queued=None, sla_due: float | None = None,
+):
+    """check 파이프라인을 실행한다. 워커가 켜져 있으면 작업 큐로 넘기고 결과를 기다린다.
+
+    sla_due(epoch 초)가 있으면 슬롯을 얻은 뒤부터 그 시각까지를 실행 마감으로 둔다
+    (대기 시간은 실행 몫에서 빼지 않고, 최소 SCHEDULE_MIN_RUN_SECONDS는 보장).
+    """
+    if PIPELINE_WORKERS:
+        payload = {"sla_due": sla_due}
+        return jobs.decode_check_result(await jobs.run_job(db, journalist, "check", priority, payload))
+    async with pipeline_slots.slot(priority, journalist["telegram_id"], on_queued):
+        with deadline.scope_until(sla_due, SCHEDULE_MIN_RUN_SECONDS):
+            return await _run_check_pipeline(db, journalist)
+
+
+async def _execute_report(
+    db, journalist: dict, priority: int, cache_id: int, today: str,
+    existing_items: list[dict] | None, on_queued=None, sla_due: float | None = None,
+) -> list[dict] | None:
+    """report 파이프라인을 실행한다. 워커가 켜져 있으면 작업 큐로 넘기고 결과를 기다린다.
+
+    워커는 existing_items를 cache_id로 다시 읽으므로 큐에는 시나리오 여부만 넣는다.
+    sla_due는 _execute_check와 같다.
+    """
+    if PIPELINE_WORKERS:
+        payload = {
+            "cache_id": cache_id, "today": today, "scenario_a": existing_items is None,
+            "sla_due": sla_due,
+        }
+        return await jobs.run_job(db, journalist, "report", priority, payload)
+    async with pipeline_slots.slot(priority, journalist["telegram_id"], on_queued):
+        with deadline.scope_until(sla_due, SCHEDULE_MIN_RUN_SECONDS):
+            return await _run_report_pipeline(
+                db, journalist, existing_items=existing_items, cache_id=cache_id,
+            )
+
+
+async def _deliver_check_results(
+    send_fn, db, journalist_id: int,
+    results: list[dict], since: datetime, now: datetime, haiku_filtered: int,
+) -> None:
+    """check 결과를 저장하고 헤더 + 기사별 메시지 + 스킵 목록을 전송한다.
+
+    last_check_at(수집 시각 now)과 결과 저장은 한 트랜잭션으로 기록한다.
+    이력 중복으로 뺀 기사는 이미 저장된 이력이므로 다시 저장하지 않는다.
+    """
+    reported = [r for r in results if r["category"] != "skip"]
+    skipped = [r for r in results if r["category"] == "skip"]
+    to_save = [r for r in results if not r.get("history_duplicate")]
+
+    with metrics.stage("check", "db_write", len(to_save)):
+        async with repo.unit_of_work(db):
+            await repo.update_last_check_at(db, journalist_id, at=now)
+            await repo.save_reported_articles(db, journalist_id, to_save)
+
+    total = len(results) + haiku_filtered
+    messages = [format_check_header(total, len(reported), since, now)]
+    # 최신 기사 먼저 (pub_time desc)
+    sorted_reported = sorted(reported, key=lambda r: r.get("pub_time", ""), reverse=True)
+    messages += [format_article_message(article) for article in sorted_reported]
+    if skipped:
+        messages += format_skipped_articles(skipped, haiku_filtered)
+
+    with metrics.stage("check", "telegram_send", len(messages)) as st:
+        st["bytes"] = sum(len(m.encode()) for m in messages)
+        await send_batch(send_fn, messages[0], messages[1:])
+
+
 async def check_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """/check 명령 처리. 설계 문서 8단계 흐름."""
     db = context.bot_data["db"]
     telegram_id = str(update.effective_user.id)
-
-    # 동시 실행 방지
-    lock = _user_locks.setdefault(telegram_id, asyncio.Lock())
-    if lock.locked():
-        await update.message.reply_text("이전 요청이 처리 중입니다. 완료 후 다시 시도해주세요.")
-        return
+    send_fn = chat_sender(update.message.reply_text, update.effective_chat.id)
 
     # [1] 프로필 로드
     journalist = await repo.get_journalist(db, telegram_id)
     if not journalist:
-        await update.message.reply_text("프로필이 없습니다. /start로 등록해주세요.")
+        await send_fn("프로필이 없습니다. /start로 등록해주세요.")
         return
 
-    async with lock:
-        await update.message.reply_text("타사 체크 진행 중...")
+    # 같은 명령이 진행 중이면(예약 실행 포함) 새로 실행하지 않고 합류해 그 결과를 받는다
+    if _is_running(telegram_id, "check"):
+        await send_fn("진행 중인 타사 체크가 있어 그 결과를 함께 받습니다.")
+    elif _user_locks.locked(telegram_id):
+        # 다른 명령이 진행 중
+        await send_fn("이전 요청이 처리 중입니다. 완료 후 다시 시도해주세요.")
+        return
+
+    async def _run() -> None:
+        async with _user_locks.hold(telegram_id), jobs.delivery_scope(db):
+            await send_fn("타사 체크 진행 중...")
 
-        async with _pipeline_semaphore:
             try:
-                results, since, now, haiku_filtered = await _run_check_pipeline(db, journalist)
+                results, since, now, haiku_filtered = await _execute_check(
+                    db, journalist, PRIORITY_INTERACTIVE, _queue_notice(send_fn),
+                )
             except Exception as e:
                 logger.error("타사 체크 실패: %s", e, exc_info=True)
-                await update.message.reply_text(f"타사 체크 실패: {format_error_message(e)}")
+                await send_fn(f"타사 체크 실패: {format_error_message(e)}")
                 return
 
-        # check 실행 완료 시점에 항상 last_check_at 갱신
-        await repo.update_last_check_at(db, journalist["id"])
-
-        if results is None:
-            await update.message.reply_text(format_no_results())
-            return
-
-        # 결과 저장 + 기사별 전송 (세마포어 해제 후)
-        reported = [r for r in results if r["category"] != "skip"]
-        skipped = [r for r in results if r["category"] == "skip"]
+            if results is None:
+                # 결과가 없어도 수집한 구간은 처리한 것으로 기록
+                await repo.update_last_check_at(db, journalist["id"], at=now)
+                await send_fn(format_no_results())
+                return
 
-        await repo.save_reported_articles(db, journalist["id"], results)
+            # last_check_at·결과 저장 + 기사별 전송 (세마포어 해제 후)
+            await _deliver_check_results(
+                send_fn, db, journalist["id"],
+                results, since, now, haiku_filtered,
+            )
 
-        total = len(results) + haiku_filtered
-        important = len(reported)
-        await update.message.reply_text(
-            format_check_header(total, important, since, now), parse_mode="HTML",
-        )
+    await _run_coalesced(telegram_id, "check", _run)
 
-        # 최신 기사 먼저 (pub_time desc)
-        sorted_reported = sorted(reported, key=lambda r: r.get("pub_time", ""), reverse=True)
-        for article in sorted_reported:
-            msg = format_article_message(article)
-            await update.message.reply_text(msg, parse_mode="HTML", disable_web_page_preview=True)
 
-        if skipped:
-            for msg in format_skipped_articles(skipped, haiku_filtered):
-                await update.message.reply_text(msg, parse_mode="HTML", disable_web_page_preview=True)
+async def cancel_check_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """/cancel_check 명령 처리. 진행 중인 타사 체크를 중단한다."""
+    telegram_id = str(update.effective_user.id)
+    if _cancel_running(telegram_id, "check"):
+        logger.info("타사 체크 취소 요청: %s", telegram_id)
+        await update.message.reply_text("진행 중인 타사 체크를 취소했습니다.")
+    else:
+        await update.message.reply_text("진행 중인 타사 체크가 없습니다.")
 
 
 async def report_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """/report 명령 처리. 부서 뉴스 브리핑."""
     db = context.bot_data["db"]
     telegram_id = str(update.effective_user.id)
-
-    # 동시 실행 방지
-    lock = _user_locks.setdefault(telegram_id, asyncio.Lock())
-    if lock.locked():
-        await update.message.reply_text("이전 요청이 처리 중입니다. 완료 후 다시 시도해주세요.")
-        return
+    send_fn = chat_sender(update.message.reply_text, update.effective_chat.id)
 
     journalist = await repo.get_journalist(db, telegram_id)
     if not journalist:
-        await update.message.reply_text("프로필이 없습니다. /start로 등록해주세요.")
+        await send_fn("프로필이 없습니다. /start로 등록해주세요.")
         return
 
-    async with lock:
-        dept = journalist["department"]
-        dept_label = dept if dept.endswith("부") else f"{dept}부"
-        await update.message.reply_text(f"오늘 {dept_label} 브리핑 생성 중...")
+    # 같은 명령이 진행 중이면(예약 실행 포함) 새로 실행하지 않고 합류해 그 결과를 받는다
+    if _is_running(telegram_id, "report"):
+        await send_fn("진행 중인 브리핑이 있어 그 결과를 함께 받습니다.")
+    elif _user_locks.locked(telegram_id):
+        # 다른 명령이 진행 중
+        await send_fn("이전 요청이 처리 중입니다. 완료 후 다시 시도해주세요.")
+        return
 
-        today = datetime.now(_KST).strftime("%Y-%m-%d")
-        department = journalist["department"]
+    async def _run() -> None:
+        async with _user_locks.hold(telegram_id), jobs.delivery_scope(db):
+            dept = journalist["department"]
+            dept_label = dept if dept.endswith("부") else f"{dept}부"
+            await send_fn(f"오늘 {dept_label} 브리핑 생성 중...")
 
-        cache_id, is_new = await repo.get_or_create_report_cache(db, journalist["id"], today)
+            today = datetime.now(_KST).strftime("%Y-%m-%d")
+            department = journalist["department"]
 
-        existing_items = []
-        if not is_new:
-            existing_items = await repo.get_report_items_by_cache(db, cache_id)
+            cache_id, is_new = await repo.get_or_create_report_cache(db, journalist["id"], today)
 
-        is_scenario_a = is_new or len(existing_items) == 0
+            existing_items = []
+            if not is_new:
+                existing_items = await repo.get_report_items_by_cache(db, cache_id)
+
+            is_scenario_a = is_new or len(existing_items) == 0
 
-        async with _pipeline_semaphore:
             try:
-                results = await _run_report_pipeline(
-                    db, journalist,
-                    existing_items=existing_items if not is_scenario_a else None,
+                results = await _execute_report(
+                    db, journalist, PRIORITY_INTERACTIVE, cache_id, today,
+                    existing_items if not is_scenario_a else None,
+                    _queue_notice(send_fn),
                 )
             except Exception as e:
                 logger.error("report 파이프라인 실패: %s", e, exc_info=True)
-                await update.message.reply_text(f"브리핑 생성 실패: {format_error_message(e)}")
+                await send_fn(f"브리핑 생성 실패: {format_error_message(e)}")
                 return
 
-        # report 실행 완료 시점에 항상 last_report_at 갱신
-        await repo.update_last_report_at(db, journalist["id"])
+            if results is None:
+                await repo.update_last_report_at(db, journalist["id"])
+                await send_fn("관련 뉴스를 찾지 못했습니다.")
+                return
 
-        if results is None:
-            await update.message.reply_text("관련 뉴스를 찾지 못했습니다.")
-            return
+            # last_report_at·결과 저장 + 전송 (세마포어 해제 후)
+            if is_scenario_a:
+                await _handle_report_scenario_a(
+                    send_fn, db, journalist["id"], cache_id, department, today, results,
+                )
+            else:
+                await _handle_report_scenario_b(
+                    send_fn, db, journalist["id"], cache_id, department, today,
+                    existing_items, results,
+                )
 
-        # 결과 전송 (세마포어 해제 후)
-        if is_scenario_a:
-            await _handle_report_scenario_a(
-                update.message.reply_text, db, cache_id, department, today, results,
-            )
-        else:
-            await _handle_report_scenario_b(
-                update.message.reply_text, db, cache_id, department, today,
-                existing_items, results,
-            )
+    await _run_coalesced(telegram_id, "report", _run)
 
 
 async def _handle_report_scenario_a(
-    send_fn, db, cache_id, department, today, results,
+    send_fn, db, journalist_id, cache_id, department, today, results, reported_at=None,
 ) -> None:
-    """시나리오 A: 당일 첫 요청. 전체 브리핑 생성."""
-    if results:
-        await repo.save_report_items(db, cache_id, results)
+    """시나리오 A: 당일 첫 요청. 전체 브리핑 생성.
+
+    last_report_at(reported_at, 없으면 현재)과 항목 저장은 한 트랜잭션으로 기록한다.
+    """
+    with metrics.stage("report", "db_write", len(results)):
+        async with repo.unit_of_work(db):
+            await repo.update_last_report_at(db, journalist_id, at=reported_at)
+            if results:
+                await repo.save_report_items(db, cache_id, results)
 
     if not results:
         await send_fn("관련 뉴스를 찾지 못했습니다.")
@@ -447,21 +888,22 @@ async def _handle_report_scenario_a(
 
     # 최신 기사 먼저 (pub_time desc)
     sorted_results = sorted(results, key=lambda r: r.get("pub_time", ""), reverse=True)
+    messages = [format_report_item(item) for item in sorted_results]
 
-    await send_fn(
-        format_report_header_a(department, today, len(sorted_results)),
-        parse_mode="HTML",
-    )
-    for item in sorted_results:
-        msg = format_report_item(item)
-        await send_fn(msg, parse_mode="HTML", disable_web_page_preview=True)
+    with metrics.stage("report", "telegram_send", len(messages) + 1) as st:
+        header = format_report_header_a(department, today, len(sorted_results))
+        st["bytes"] = sum(len(m.encode()) for m in [header, *messages])
+        await send_batch(send_fn, header, messages)
 
 
 async def _handle_report_scenario_b(
-    send_fn, db, cache_id, department, today,
-    existing_items, delta_results,
+    send_fn, db, journalist_id, cache_id, department, today,
+    existing_items, delta_results, reported_at=None,
 ) -> None:
-    """시나리오 B: 당일 재요청. 기존 항목 + 변경분을 합쳐 전체 브리핑 출력."""
+    """시나리오 B: 당일 재요청. 기존 항목 + 변경분을 합쳐 전체 브리핑 출력.
+
+    last_report_at(reported_at, 없으면 현재)과 추가·수정 반영은 한 트랜잭션으로 기록한다.
+    """
     # action 필드 보정
     for r in delta_results:
         if "action" not in r:
@@ -494,40 +936,38 @@ async def _handle_report_scenario_b(
     added = [r for r in delta_results if r.get("action") == "added"]
     merged_items.extend(added)
 
-    # DB 반영
-    if added:
-        await repo.save_report_items(db, cache_id, added)
-    for item_id, mod in delta_by_item_id.items():
-        await repo.update_report_item(
-            db, item_id, mod["summary"],
-            reason=mod.get("reason"),
-            exclusive=mod.get("exclusive"),
-        )
+    # DB 반영 (last_report_at·추가·수정을 한 트랜잭션으로)
+    with metrics.stage("report", "db_write", len(added) + len(delta_by_item_id)):
+        async with repo.unit_of_work(db):
+            await repo.update_last_report_at(db, journalist_id, at=reported_at)
+            if added:
+                await repo.save_report_items(db, cache_id, added)
+            if delta_by_item_id:
+                await repo.update_report_items(db, [
+                    {"id": item_id, "summary": mod["summary"],
+                     "reason": mod.get("reason"), "exclusive": mod.get("exclusive")}
+                    for item_id, mod in delta_by_item_id.items()
+                ])
 
     # 변경 건수 계산
     modified_count = len(modified_ids)
     added_count = len(added)
 
-    # 헤더 전송
-    await send_fn(
-        format_report_header_b(department, today, len(merged_items), modified_count, added_count),
-        parse_mode="HTML",
-    )
+    header = format_report_header_b(department, today, len(merged_items), modified_count, added_count)
 
     # 변경 항목(modified/added)과 기보고 항목(unchanged) 분리
     changed = [r for r in merged_items if r.get("action") in ("modified", "added")]
     unchanged = [r for r in merged_items if r.get("action") == "unchanged"]
 
-    # 변경 항목: 최신 기사 먼저 개별 전송
+    # 변경 항목: 최신 기사 먼저 개별 전송, 기보고 항목: 토글 메시지로 모아 전송
     changed.sort(key=lambda r: r.get("pub_time", ""), reverse=True)
-    for item in changed:
-        msg = format_report_item(item, scenario_b=True)
-        await send_fn(msg, parse_mode="HTML", disable_web_page_preview=True)
-
-    # 기보고 항목: 토글 메시지로 모아 전송
+    messages = [format_report_item(item, scenario_b=True) for item in changed]
     if unchanged:
-        for msg in format_unchanged_report_items(unchanged):
-            await send_fn(msg, parse_mode="HTML", disable_web_page_preview=True)
+        messages += format_unchanged_report_items(unchanged)
+
+    with metrics.stage("report", "telegram_send", len(messages) + 1) as st:
+        st["bytes"] = sum(len(m.encode()) for m in [header, *messages])
+        await send_batch(send_fn, header, messages)
 
 
 async def set_division_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -645,6 +1085,50 @@ async def stats_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     if check_cnt or report_cnt:
         lines.append(f"  check {check_cnt}건 / report {report_cnt}건")
 
+    # 파이프라인 슬롯 현황
+    waiting = pipeline_slots.waiting_by_priority()
+    lines.append("")
+    lines.append(
+        f"[파이프라인] 실행 {pipeline_slots.in_use}/{pipeline_slots.capacity}"
+        f" | 대기 대화형 {waiting['interactive']} / 예약 {waiting['scheduled']}"
+        f" / 백그라운드 {waiting['background']}"
+    )
+
+    # 예약 부하 예측 (분산 적용, 현재 동시 실행 한도 기준)
+    schedules = await repo.get_all_schedules(db)
+    if schedules:
+        fc = capacity_forecast(schedules, pipeline_slots.capacity)
+        lines.append("")
+        lines.append(
+            f"[용량 계획] 한도 {pipeline_slots.capacity} | 예상 소요 check "
+            f"{fc['run_seconds']['check']:.0f}s / report {fc['run_seconds']['report']:.0f}s"
+        )
+        lines.append(
+            f"  대기 최대 {fc['peak_waiting']}건 | 대기 평균 {fc['avg_wait']:.0f}s / 최대 {fc['max_wait']:.0f}s"
+            f" | SLA 초과 {fc['sla_misses']}/{fc['runs']}건"
+        )
+        peaks = ", ".join(f"{m // 60:02d}:{m % 60:02d} {n}건" for m, n in fc["peak_minutes"])
+        lines.append(f"  최다 시작 분: {peaks}")
+        lines.append(f"  하루 호출 추정: 네이버 {fc['calls']['naver']}회 / Anthropic {fc['calls']['anthropic']}회")
+
+    # 파이프라인 단계별 소요 (롤링 히스토그램)
+    stage_stats = metrics.summary()
+    if stage_stats:
+        lines.append("")
+        lines.append("[단계별 소요] (최근 기록 기준 p50/p90/max)")
+        for (pipeline, stage_name), st in sorted(stage_stats.items()):
+            detail = f" | 실패 {st['errors']}" if st["errors"] else ""
+            if st["avg_in"] is not None and st["avg_out"] is not None:
+                detail += f" | 평균 {st['avg_in']:.0f}→{st['avg_out']:.0f}건"
+            if st["avg_tokens"] is not None:
+                detail += f" | ~{st['avg_tokens']:.0f} tok"
+            if st["avg_bytes"] is not None:
+                detail += f" | {st['avg_bytes'] / 1024:.0f}KB"
+            lines.append(
+                f"  {pipeline}.{stage_name} ×{st['count']}: "
+                f"{st['p50']:.2f}/{st['p90']:.2f}/{st['max']:.2f}s{detail}"
+            )
+
     # 사용자 목록
     lines.append("")
     lines.append("[사용자]")
@@ -658,4 +1142,6 @@ async def stats_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
             last = f" | 최근 check: {kst_dt.strftime('%Y-%m-%d %H:%M')}"
         lines.append(f"  {u['department']} | {kw}{sched}{last}")
 
-    await update.message.reply_text("\n".join(lines))
+    # 사용자·단계가 많으면 Telegram 한도(4096자)를 넘으므로 문단·줄 경계에서 나눠 보낸다
+    for text in split_message("\n".join(lines)):
+        await update.message.reply_text(text)
@@ -0,0 +1,161 @@
+"""파이프라인 워커 프로세스와 SQLite 작업 큐 (봇 쪽).
+
+PIPELINE_WORKERS > 0이면 봇 프로세스는 파이프라인을 직접 실행하지 않고 pipeline_jobs에
+작업을 넣은 뒤 결과를 기다린다. 실제 실행(검색·스크래핑 파싱·LLM 호출)은 `python -m src.worker`
+프로세스들이 나눠 맡으므로 봇의 이벤트 루프는 업데이트 처리에만 쓰인다.
+
+작업과 결과가 DB에 남으므로 봇이 재시작돼도 대기·실행 중이던 작업은 워커가 계속 처리하고,
+결과는 scheduler.restore_pipeline_jobs가 다시 받아 전송한다.
+"""
+
+import asyncio
+import logging
+import sys
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+from src.config import DB_PATH, JOB_POLL_SECONDS
+from src.storage import repository as repo
+
+logger = logging.getLogger(__name__)
+
+_processes: list[asyncio.subprocess.Process] = []
+_supervisor: asyncio.Task | None = None
+# 워커가 비정상 종료했을 때 다시 띄우기 전 대기(초)
+_RESTART_DELAY_SECONDS = 5
+
+
+# delivery_scope 안에서 결과를 받은 작업 ID (블록이 끝난 뒤 전송 완료로 표시)
+_received: ContextVar[list[int] | None] = ContextVar("pipeline_jobs_received", default=None)
+
+
+class PipelineJobError(RuntimeError):
+    """워커에서 실패한 작업. 메시지는 워커가 만든 사용자용 오류 문구다."""
+
+
+# --- 결과 직렬화 ---
+
+def encode_check_result(outcome: tuple) -> dict:
+    results, since, now, haiku_filtered = outcome
+    return {
+        "results": results,
+        "since": since.isoformat(),
+        "now": now.isoformat(),
+        "haiku_filtered": haiku_filtered,
+    }
+
+
+def decode_check_result(data: dict) -> tuple:
+    return (
+        data["results"],
+        datetime.fromisoformat(data["since"]),
+        datetime.fromisoformat(data["now"]),
+        data["haiku_filtered"],
+    )
+
+
+# --- 작업 실행 ---
+
+@asynccontextmanager
+async def delivery_scope(db):
+    """블록 안에서 받은 작업 결과를 블록이 끝난 뒤에야 전송 완료(delivered)로 표시한다.
+
+    결과 저장·전송(실패 안내 포함) 도중 예외가 나거나 프로세스가 죽으면 표시하지 않으므로,
+    재시작 시 restore_pipeline_jobs가 그 결과를 다시 전송한다.
+    """
+    job_ids: list[int] = []
+    token = _received.set(job_ids)
+    try:
+        yield
+    finally:
+        _received.reset(token)
+    for job_id in job_ids:
+        await repo.mark_pipeline_job_delivered(db, job_id)
+
+
+async def wait_job(db, job_id: int):
+    """작업이 끝날 때까지 기다려 결과를 반환한다.
+
+    실패한 작업은 PipelineJobError로 올린다. 기다리는 쪽이 취소되면(/cancel_check)
+    작업도 취소해 워커가 실행을 멈추게 한다. delivery_scope 안이면 전송 완료 표시는
+    블록이 끝날 때로 미루고, 아니면 바로 표시한다.
+    """
+    try:
+        while True:
+            job = await repo.get_pipeline_job(db, job_id)
+            if job is None or job["status"] == "cancelled":
+                raise asyncio.CancelledError()
+            if job["status"] in ("done", "failed"):
+                break
+            await asyncio.sleep(JOB_POLL_SECONDS)
+    except asyncio.CancelledError:
+        await asyncio.shield(repo.cancel_pipeline_job(db, job_id))
+        raise
+
+    received = _received.get()
+    if received is None:
+        await repo.mark_pipeline_job_delivered(db, job_id)
+    else:
+        received.append(job_id)
+    if job["status"] == "failed":
+        raise PipelineJobError(job["error"] or "파이프라인 실행 실패")
+    return job["result"]
+
+
+async def run_job(db, journalist: dict, command: str, priority: int, payload: dict | None = None):
+    """작업을 큐에 넣고 워커가 끝낼 때까지 기다린다."""
+    job_id = await repo.enqueue_pipeline_job(
+        db, journalist["id"], journalist["telegram_id"], command, priority, payload or {},
+    )
+    logger.info("파이프라인 작업 등록: #%d %s (journalist=%d)", job_id, command, journalist["id"])
+    return await wait_job(db, job_id)
+
+
+# --- 워커 프로세스 관리 ---
+
+async def _spawn(name: str) -> asyncio.subprocess.Process:
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "src.worker", "--name", name, "--db", DB_PATH,
+    )
+    logger.info("파이프라인 워커 시작: %s (pid=%d)", name, proc.pid)
+    return proc
+
+
+async def _supervise() -> None:
+    """종료된 워커를 다시 띄운다."""
+    while True:
+        waits = {asyncio.ensure_future(p.wait()): i for i, p in enumerate(_processes)}
+        done, pending = await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+        for t in pending:
+            t.cancel()
+        for t in done:
+            i = waits[t]
+            logger.warning("파이프라인 워커 종료: w%d (code=%s), 재시작", i, t.result())
+            await asyncio.sleep(_RESTART_DELAY_SECONDS)
+            _processes[i] = await _spawn(f"w{i}")
+
+
+async def start_workers(count: int) -> None:
+    """워커 프로세스 count개를 띄우고 감시를 시작한다."""
+    global _supervisor
+    for i in range(count):
+        _processes.append(await _spawn(f"w{i}"))
+    _supervisor = asyncio.create_task(_supervise())
+
+
+async def stop_workers(timeout: float = 10.0) -> None:
+    """워커 프로세스를 종료한다. 실행 중이던 작업은 다음 시작 때 회수돼 다시 실행된다."""
+    global _supervisor
+    if _supervisor is not None:
+        _supervisor.cancel()
+        _supervisor = None
+    for proc in _processes:
+        if proc.returncode is None:
+            proc.terminate()
+    for proc in _processes:
+        try:
+            await asyncio.wait_for(proc.wait(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+    _processes.clear()
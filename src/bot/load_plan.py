@@ -0,0 +1,242 @@
+"""예약 실행 부하 분산 계획과 시뮬레이션.
+
+기자들이 09:00, 12:00 같은 정각을 많이 고르기 때문에 같은 분의 예약을 한꺼번에 시작하면
+파이프라인 슬롯 앞에 대기열이 몰린다. 디스패처는 plan_minute로 그 분의 예약을 분산 구간
+(SCHEDULE_SPREAD_SECONDS) 안에 고르게 펼친다.
+
+- 같은 부서 report는 같은 시각에 묶어 시작한다. 부서 수집·분석 공유(report_engine)가
+  같은 계산을 한 번만 하도록 하기 위함이다.
+- 분산 구간은 예상 실행 시간을 더해도 전송 SLA(SCHEDULE_SLA_SECONDS) 안에 끝나도록 줄인다.
+
+    python -m src.bot.load_plan            # DB의 schedules로 하루를 재생해 예상 최대 동시 실행 수 출력
+
+관리자 /stats의 용량 계획(capacity_forecast)도 같은 시뮬레이션을 쓴다.
+"""
+
+import argparse
+import asyncio
+import heapq
+from dataclasses import dataclass
+
+from src import metrics
+from src.bot.report_engine import _dept_label, shared_analysis_enabled
+from src.storage import repository as repo
+from src.storage.models import init_db
+from src.config import (
+    DB_PATH, MAX_CONCURRENT_PIPELINES, DEPARTMENT_PROFILES,
+    REPORT_SHARE_BUCKET_SECONDS, REPORT_SHARED_API_KEY,
+    SCHEDULE_SPREAD_SECONDS, SCHEDULE_SLA_SECONDS, SCHEDULE_EST_RUN_SECONDS,
+)
+
+
+@dataclass
+class Due:
+    """한 분에 실행할 예약 항목."""
+    kind: str            # "check" / "report" / "prewarm"
+    journalist_id: int
+    time_kst: str
+    telegram_id: str
+    second: int = 0      # 분 안에서 지정된 초 (prewarm 분산용)
+    department: str = ""
+
+
+def estimated_run_seconds(kind: str) -> float:
+    """파이프라인 예상 소요(초). 계측 표본이 있으면 단계별 p90 합, 없으면 설정값."""
+    stats = metrics.summary()
+    total = sum(s["p90"] for (pipeline, _), s in stats.items() if pipeline == kind)
+    return total or SCHEDULE_EST_RUN_SECONDS[kind]
+
+
+def spread_window(kind: str, spread: float = SCHEDULE_SPREAD_SECONDS, sla: float = SCHEDULE_SLA_SECONDS) -> float:
+    """분산 구간(초). 분산 후 시작해도 SLA 안에 끝나도록 제한한다."""
+    return max(0.0, min(spread, sla - estimated_run_seconds(kind)))
+
+
+def plan_minute(entries: list[Due], windows: dict[str, float] | None = None) -> list[tuple[float, Due]]:
+    """한 분의 예약에 시작 오프셋(분 시작 기준 초)을 배정한다.
+
+    check는 사용자별로, report는 부서별 묶음으로 한 단위씩 세어 종류별 분산 구간에 고르게
+    배치한다. prewarm은 등록 시 이미 분산됐으므로 지정된 초를 그대로 쓴다.
+    """
+    if windows is None:
+        windows = {kind: spread_window(kind) for kind in ("check", "report")}
+    planned: list[tuple[float, Due]] = [(e.second, e) for e in entries if e.kind == "prewarm"]
+
+    checks = sorted((e for e in entries if e.kind == "check"), key=lambda e: e.journalist_id)
+    for i, e in enumerate(checks):
+        planned.append((windows["check"] * i / len(checks), e))
+
+    groups: dict[str, list[Due]] = {}
+    for e in entries:
+        if e.kind == "report":
+            groups.setdefault(e.department, []).append(e)
+    # 큰 부서부터 먼저 시작
+    ordered = sorted(groups.items(), key=lambda kv: (-len(kv[1]), kv[0]))
+    for i, (_, members) in enumerate(ordered):
+        offset = windows["report"] * i / len(ordered)
+        planned += [(offset, e) for e in members]
+
+    planned.sort(key=lambda p: p[0])
+    return planned
+
+
+def simulate(
+    schedules: list[dict],
+    capacity: int = MAX_CONCURRENT_PIPELINES,
+    spread: bool = True,
+    run_seconds: dict[str, float] | None = None,
+) -> dict:
+    """schedules 하루치를 재생해 동시 실행·대기·SLA 초과를 추정한다.
+
+    Args:
+        schedules: {"journalist_id", "command", "time_kst", "department"} 목록.
+        capacity: 동시 파이프라인 한도.
+        spread: False면 예약 시각 정각에 모두 시작 (기존 동작).
+        run_seconds: 종류별 실행 시간(초). 없으면 estimated_run_seconds.
+
+    Returns:
+        peak_demand(분산 후 같은 순간 시작을 원하는 최대 실행 수), peak_running,
+        peak_waiting, max_latency(예약 시각→완료 초), sla_misses, runs.
+    """
+    run_seconds = run_seconds or {k: estimated_run_seconds(k) for k in ("check", "report")}
+    windows = {k: spread_window(k) if spread else 0.0 for k in ("check", "report")}
+
+    by_minute: dict[int, list[Due]] = {}
+    for s in schedules:
+        h, m = map(int, s["time_kst"].split(":"))
+        by_minute.setdefault(h * 60 + m, []).append(Due(
+            s["command"], s["journalist_id"], s["time_kst"], "", department=s.get("department", ""),
+        ))
+
+    # (요청 시작 시각, 예약 시각, 종류)
+    starts: list[tuple[float, float, str]] = []
+    for minute, entries in by_minute.items():
+        for offset, e in plan_minute(entries, windows):
+            starts.append((minute * 60 + offset, minute * 60, e.kind))
+    starts.sort()
+
+    # 슬롯 capacity개 FIFO 대기열
+    running: list[float] = []  # 실행 중인 항목의 종료 시각 heap
+    queued: list[float] = []   # 대기 중인 항목의 시작 시각 heap
+    peak_running = peak_waiting = sla_misses = 0
+    max_latency = max_wait = total_wait = 0.0
+    demand: dict[float, int] = {}
+    starts_by_minute: dict[int, int] = {}
+    for start, due_at, kind in starts:
+        demand[start] = demand.get(start, 0) + 1
+        minute = int(start // 60) % (24 * 60)
+        starts_by_minute[minute] = starts_by_minute.get(minute, 0) + 1
+        while running and running[0] <= start:
+            heapq.heappop(running)
+        while queued and queued[0] <= start:
+            heapq.heappop(queued)
+        begin = start
+        if len(running) >= capacity:
+            begin = heapq.heappop(running)
+            heapq.heappush(queued, begin)
+        peak_waiting = max(peak_waiting, len(queued))
+        max_wait = max(max_wait, begin - start)
+        total_wait += begin - start
+        end = begin + run_seconds[kind]
+        heapq.heappush(running, end)
+        peak_running = max(peak_running, len(running))
+        latency = end - due_at
+        max_latency = max(max_latency, latency)
+        if latency > SCHEDULE_SLA_SECONDS:
+            sla_misses += 1
+
+    return {
+        "runs": len(starts),
+        "peak_demand": max(demand.values(), default=0),
+        "peak_running": peak_running,
+        "peak_waiting": peak_waiting,
+        "max_latency": max_latency,
+        "sla_misses": sla_misses,
+        "max_wait": max_wait,
+        "avg_wait": total_wait / len(starts) if starts else 0.0,
+        "starts_by_minute": starts_by_minute,
+    }
+
+
+def projected_calls(schedules: list[dict]) -> dict[str, int]:
+    """예약 하루치의 외부 API 호출 수 추정 (재시도·추가 페이지 제외 최소치).
+
+    - 네이버: check는 키워드당 1회, report는 공유 구간(REPORT_SHARE_BUCKET_SECONDS)마다
+      부서 report 키워드당 1회.
+    - Anthropic: check는 LLM 필터 + 분석 2회. report는 공유 구간마다 LLM 필터 1회에,
+      분석은 사용자별 1회 (REPORT_SHARED_ANALYSIS면 공유 구간마다 1회).
+
+    report 검색은 키와 무관하게 부서 단위로 공유된다. LLM 필터는 지정 키
+    (REPORT_SHARED_API_KEY)가 있을 때만 부서 단위로 공유되고, 없으면 사용자(키)별로 실행된다.
+    """
+    naver = anthropic = 0
+    shared_analysis = shared_analysis_enabled()
+    buckets: set[tuple] = set()
+    filters: set[tuple] = set()
+    for s in schedules:
+        if s["command"] == "check":
+            naver += len(s.get("keywords", []))
+            anthropic += 2
+            continue
+        h, m = map(int, s["time_kst"].split(":"))
+        dept = _dept_label(s.get("department", ""))
+        key = (dept, (h * 60 + m) * 60 // REPORT_SHARE_BUCKET_SECONDS)
+        if key not in buckets:
+            buckets.add(key)
+            naver += len(DEPARTMENT_PROFILES.get(dept, {}).get("report_keywords", []))
+            if shared_analysis:
+                anthropic += 1
+        filter_key = key if REPORT_SHARED_API_KEY else key + (s["journalist_id"],)
+        if filter_key not in filters:
+            filters.add(filter_key)
+            anthropic += 1
+        if not shared_analysis:
+            anthropic += 1
+    return {"naver": naver, "anthropic": anthropic}
+
+
+def capacity_forecast(schedules: list[dict], capacity: int, top: int = 5) -> dict:
+    """/stats 용량 계획: 분산 적용 시뮬레이션 + 최다 시작 분 + 하루 API 호출 추정.
+
+    Returns:
+        simulate 결과에 peak_minutes([(분, 시작 수)], 많은 순 top개), calls, run_seconds를 더한 dict.
+    """
+    run_seconds = {k: estimated_run_seconds(k) for k in ("check", "report")}
+    result = simulate(schedules, capacity, spread=True, run_seconds=run_seconds)
+    result["peak_minutes"] = sorted(
+        result["starts_by_minute"].items(), key=lambda kv: (-kv[1], kv[0]),
+    )[:top]
+    result["calls"] = projected_calls(schedules)
+    result["run_seconds"] = run_seconds
+    return result
+
+
+async def _load_schedules(db_path: str) -> list[dict]:
+    db = await init_db(db_path)
+    try:
+        return await repo.get_all_schedules(db)
+    finally:
+        await db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="예약 실행 부하 시뮬레이션")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--capacity", type=int, default=MAX_CONCURRENT_PIPELINES)
+    args = parser.parse_args()
+
+    schedules = asyncio.run(_load_schedules(args.db))
+    print(f"예약 {len(schedules)}건, 동시 실행 한도 {args.capacity}, SLA {SCHEDULE_SLA_SECONDS}초")
+    for label, spread in (("정각 시작", False), ("분산 시작", True)):
+        r = simulate(schedules, args.capacity, spread)
+        print(
+            f"  {label}: 동시 시작 최대 {r['peak_demand']}건, 대기 최대 {r['peak_waiting']}건, "
+            f"평균/최대 대기 {r['avg_wait']:.0f}/{r['max_wait']:.0f}초, "
+            f"최대 지연 {r['max_latency']:.0f}초, SLA 초과 {r['sla_misses']}/{r['runs']}건"
+        )
+    calls = projected_calls(schedules)
+    print(f"  하루 예상 호출: 네이버 {calls['naver']}회, Anthropic {calls['anthropic']}회")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,425 @@
+"""부서 단위 report 공유 계산 엔진.
+
+report 수집(검색 → 언론사 필터 → 규칙 분류 → LLM 필터 → 본문 수집)은
+부서의 report_keywords와 시간 윈도우에만 의존한다. 같은 부서·시간 구간의 요청은
+최대 윈도우로 한 번만 계산해 공유하고(single-flight), 사용자별로는
+윈도우(since) 필터와 이력 diff만 수행한다. 08:30/12:30 같은 예약 실행 피크에서
+같은 부서 사용자 수만큼 반복되던 검색·스크래핑·LLM 필터 호출을 1회로 줄인다.
+
+부서별 마지막 스냅샷 이후 구간만 새로 수집하는 델타 수집을 지원해,
+예약 시각 전에 사전 계산(prewarm)해 두면 예약 시각에는 짧은 델타 수집만 남는다.
+
+검색·언론사/제목 필터와 본문 스크래핑은 API 키를 쓰지 않으므로 키와 무관하게
+부서·구간마다 한 번만 실행한다. API 키가 필요한 LLM 필터만 키 범위별로 나눈다.
+지정 키(REPORT_SHARED_API_KEY)가 있으면 LLM 필터도 부서 단위로 공유하고, 없으면
+요청자 키별로 따로 계산해 한 사용자의 키로 부서 전체를 과금하거나 그 키의 인증·한도
+오류가 다른 사용자에게 전달되지 않게 한다. 지정 키가 인증·한도 오류를 내면 각 요청자는
+공유 수집 결과에 자기 키로 LLM 필터만 다시 실행한다.
+
+지정 키와 REPORT_SHARED_ANALYSIS가 설정되면 후보 분석까지 부서 단위로 공유하고,
+사용자별 시나리오 A/B 결과는 report_items와의 로컬 diff로 만든다.
+"""
+
+import asyncio
+import copy
+import hashlib
+import logging
+from datetime import UTC, datetime, timedelta, timezone
+
+import anthropic
+
+from src import metrics
+from src.config import (
+    DEPARTMENT_PROFILES, REPORT_MAX_WINDOW_SECONDS,
+    REPORT_SHARE_BUCKET_SECONDS, REPORT_SHARED_API_KEY, REPORT_SHARED_ANALYSIS,
+)
+from src.tools.search import search_news
+from src.tools.scraper import fetch_articles_batch
+from src.filters.publisher import filter_by_publisher, get_publisher_name
+from src.filters.rules import split_by_title_rules, split_by_body_rules
+from src.filters.history import DUPLICATE_TITLE_THRESHOLD, estimate_tokens, title_similarity
+from src.agents.report_agent import filter_articles, analyze_report_articles
+
+logger = logging.getLogger(__name__)
+
+_KST = timezone(timedelta(hours=9))
+
+# (scope, 시간 구간) → 부서 공유 수집 Task (검색 → 언론사 필터 → 제목 규칙). API 키와 무관하다
+_collections: dict[tuple, asyncio.Task] = {}
+# (scope, 시간 구간, 키 범위) → LLM 필터·본문 수집까지 마친 스냅샷 Task
+_snapshots: dict[tuple, asyncio.Task] = {}
+_candidates: dict[tuple[str, int], asyncio.Task] = {}
+# 부서별 마지막 공유 수집 (다음 수집의 델타 기준, 키와 무관)
+_latest: dict[str, dict] = {}
+# (부서, 키 범위)별 마지막 스냅샷 (LLM 필터를 이미 거친 link와 기사의 델타 기준)
+_latest_filtered: dict[tuple[str, str], dict] = {}
+# 부서별 본문 수집 결과 (link → fetch_articles_batch Task). 키 범위가 달라도 한 번만 스크래핑한다
+_bodies: dict[str, dict[str, asyncio.Task]] = {}
+# 델타 검색 시작을 직전 스냅샷보다 앞당기는 여유 (pubDate가 분 단위)
+_DELTA_OVERLAP_SECONDS = 60
+# 지정 키(REPORT_SHARED_API_KEY)로 계산한 스냅샷의 키 범위
+_SHARED_SCOPE = "shared"
+
+
+def _dept_label(department: str) -> str:
+    return department if department.endswith("부") else f"{department}부"
+
+
+def _bucket(now: datetime) -> int:
+    return int(now.timestamp()) // REPORT_SHARE_BUCKET_SECONDS
+
+
+def _key_scope(api_key: str) -> str:
+    """single-flight 키에 넣을 API 키 식별자 (원문 키를 캐시 키로 들고 있지 않는다)."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:12]
+
+
+def _is_key_error(e: BaseException) -> bool:
+    """키 자체의 문제(인증·권한·요청 한도)로 난 오류인지. 다른 키로는 성공할 수 있다."""
+    return isinstance(e, anthropic.APIStatusError) and e.status_code in (401, 403, 429)
+
+
+async def _single_flight(cache: dict, key: tuple[str, int], factory, name: str = "report"):
+    """같은 key의 계산은 한 번만 실행하고 동시 요청자는 그 결과를 기다린다.
+
+    실패한 계산은 캐시하지 않는다. 대기자 취소가 공유 계산을 취소하지 않도록 shield한다.
+    재사용 여부는 name 캐시의 적중/미스로 집계한다.
+    """
+    task = cache.get(key)
+    miss = task is None or (task.done() and (task.cancelled() or task.exception() is not None))
+    metrics.cache_lookup(name, not miss)
+    if miss:
+        # 지난 구간의 완료된 계산 정리
+        for old in [k for k, t in cache.items() if k[1] < key[1] and t.done()]:
+            del cache[old]
+        task = asyncio.create_task(factory())
+        cache[key] = task
+    else:
+        logger.info("부서 공유 계산 재사용: %s (구간 %d)", key[0], key[1])
+    return await asyncio.shield(task)
+
+
+async def _collect_department(dept_label: str, now: datetime) -> dict:
+    """부서 최대 윈도우로 LLM 필터 직전까지의 후보를 수집한다 (검색 → 언론사 필터 → 제목 규칙).
+
+    API 키를 쓰지 않으므로 부서·시간 구간마다 한 번만 실행해 모든 키 범위가 공유한다.
+    직전 수집(예: 예약 시각 전 사전 계산)이 최대 윈도우 안에 있으면 그 이후 구간만 검색하고
+    처음 보는 link만 필터해 병합한다(델타 수집). 이미 본 link(seen_links: link → pubDate)는
+    이번 검색 시작보다 오래된 것을 버린다. 검색은 since 이후 기사만 돌려주므로 다시 나올 일이 없다.
+
+    Returns:
+        {now, candidates, seen_links}. candidates는 pubDate가 datetime인 네이버 검색 결과.
+    """
+    window_start = now - timedelta(seconds=REPORT_MAX_WINDOW_SECONDS)
+    base = _latest.get(dept_label)
+    is_delta = base is not None and window_start <= base["now"] <= now
+    if is_delta:
+        since = base["now"] - timedelta(seconds=_DELTA_OVERLAP_SECONDS)
+        seen_links = {link: pub for link, pub in base["seen_links"].items() if pub >= since}
+        base_candidates = [a for a in base["candidates"] if a["pubDate"] >= window_start]
+    else:
+        since = window_start
+        seen_links = {}
+        base_candidates = []
+
+    collection = {"now": now, "candidates": base_candidates, "seen_links": seen_links}
+    report_keywords = DEPARTMENT_PROFILES.get(dept_label, {}).get("report_keywords", [])
+    if report_keywords:
+        # 네이버 API 수집 (report는 400건 상한)
+        with metrics.stage("report", "search") as st:
+            raw_articles = await search_news(report_keywords, since, max_results=300)
+            raw_articles = [a for a in raw_articles if a["link"] not in seen_links]
+            st["out"] = len(raw_articles)
+        seen_links.update((a["link"], a["pubDate"]) for a in raw_articles)
+
+        # 언론사 필터
+        with metrics.stage("report", "publisher_filter", len(raw_articles)) as st:
+            filtered = filter_by_publisher(raw_articles)
+            st["out"] = len(filtered)
+
+        # 제목 규칙 사전 분류 (분석 가치 없는 기사 유형 skip)
+        with metrics.stage("report", "title_filter", len(filtered)) as st:
+            filtered, title_skipped = split_by_title_rules(filtered)
+            st["out"] = len(filtered)
+        if title_skipped:
+            logger.info("report 제목 규칙 skip: %s %d건", dept_label, len(title_skipped))
+        collection["candidates"] = filtered + base_candidates
+
+        logger.info(
+            "부서 공유 수집 완료: %s, 후보 %d건 (신규 %d건, 검색 %d건%s)",
+            dept_label, len(collection["candidates"]), len(filtered), len(raw_articles),
+            ", 델타" if is_delta else "",
+        )
+
+    # 윈도우를 벗어난 후보의 본문은 더 쓰지 않는다
+    live = {a["link"] for a in collection["candidates"]}
+    _bodies[dept_label] = {
+        link: task for link, task in _bodies.get(dept_label, {}).items() if link in live
+    }
+    _latest[dept_label] = collection
+    return collection
+
+
+async def _fetch_bodies(dept_label: str, links: list[str]) -> dict[str, str]:
+    """부서 본문 캐시로 본문을 가져온다. 진행 중이거나 끝난 link는 다시 스크래핑하지 않는다."""
+    cache = _bodies.setdefault(dept_label, {})
+    missing = [
+        link for link in links
+        if link not in cache or (cache[link].done() and (cache[link].cancelled() or cache[link].exception()))
+    ]
+    if missing:
+        batch = asyncio.create_task(fetch_articles_batch(missing))
+        for link in missing:
+            cache[link] = batch
+    bodies = {}
+    with metrics.stage("report", "scrape", len(links)) as st:
+        for link in links:
+            bodies[link] = (await asyncio.shield(cache[link])).get(link, "") or ""
+        st["out"] = sum(1 for b in bodies.values() if b)
+        st["bytes"] = sum(len(b.encode()) for b in bodies.values() if b)
+    metrics.inc("tasa_cache_requests_total", len(links) - len(missing), cache="report_bodies", result="hit")
+    metrics.inc("tasa_cache_requests_total", len(missing), cache="report_bodies", result="miss")
+    return bodies
+
+
+async def _build_snapshot(
+    dept_label: str, scope: str, key_scope: str, api_key: str, now: datetime,
+) -> dict:
+    """공유 수집 후보에 api_key로 LLM 필터를 적용하고 본문을 붙여 분석 직전 기사 목록을 만든다.
+
+    LLM 필터만 키 범위(key_scope)별로 실행한다. 같은 키 범위의 직전 스냅샷이 윈도우 안에 있으면
+    그 스냅샷이 이미 판정한 link는 다시 필터하지 않고 결과를 이어 쓴다.
+    """
+    collection = await _single_flight(
+        _collections, (scope, _bucket(now)), lambda: _collect_department(dept_label, now),
+        name="report_collection",
+    )
+    now = collection["now"]
+    window_start = now - timedelta(seconds=REPORT_MAX_WINDOW_SECONDS)
+    live = {a["link"] for a in collection["candidates"]}
+    base = _latest_filtered.get((dept_label, key_scope))
+    if base is not None and window_start <= base["now"] <= now:
+        judged = base["judged"] & live
+        base_articles = [a for a in base["articles"] if a["link"] in live]
+    else:
+        judged = set()
+        base_articles = []
+
+    pending = [a for a in collection["candidates"] if a["link"] not in judged]
+    snapshot = {"now": now, "articles": base_articles, "judged": judged | {a["link"] for a in pending}}
+    if not pending:
+        _latest_filtered[(dept_label, key_scope)] = snapshot
+        return snapshot
+
+    # LLM 필터 (Haiku) — 제목+description 기반
+    with metrics.stage("report", "llm_filter", len(pending)) as st:
+        st["tokens"] = estimate_tokens(
+            "".join(a.get("title", "") + a.get("description", "") for a in pending)
+        )
+        filtered = await filter_articles(api_key, pending, dept_label)
+        st["out"] = len(filtered)
+
+    # 본문 수집 (첫 3문단)
+    bodies = await _fetch_bodies(dept_label, [a["link"] for a in filtered]) if filtered else {}
+
+    # 본문 규칙 사전 분류 (오늘자 날짜 표기 없음)
+    with metrics.stage("report", "body_filter", len(filtered)) as st:
+        filtered, body_skipped = split_by_body_rules(filtered, bodies)
+        st["out"] = len(filtered)
+    if body_skipped:
+        logger.info("report 본문 규칙 skip: %s %d건, LLM 분석 %d건", dept_label, len(body_skipped), len(filtered))
+
+    # 분석용 데이터 조립 (신규 기사를 최신순으로 앞에 병합)
+    new_articles = []
+    for a in filtered:
+        publisher = get_publisher_name(a["originallink"]) or ""
+        body = bodies.get(a["link"], "") or ""
+        pub_date_str = (
+            a["pubDate"].strftime("%Y-%m-%d %H:%M")
+            if hasattr(a["pubDate"], "strftime")
+            else str(a["pubDate"])
+        )
+        new_articles.append({
+            "title": a["title"],
+            "publisher": publisher,
+            "body": body,
+            "originallink": a["originallink"],
+            "link": a["link"],
+            "pubDate": pub_date_str,
+        })
+    snapshot["articles"] = new_articles + base_articles
+
+    logger.info(
+        "부서 스냅샷 완료: %s (%s), 기사 %d건 (LLM 필터 %d건 → %d건)",
+        dept_label, key_scope, len(snapshot["articles"]), len(pending), len(new_articles),
+    )
+    _latest_filtered[(dept_label, key_scope)] = snapshot
+    return snapshot
+
+
+async def _department_snapshot(dept_label: str, scope: str, api_key: str, now: datetime) -> dict:
+    """부서 스냅샷을 single-flight로 만든다.
+
+    검색·언론사/제목 필터는 키와 무관하게 (scope, 구간)마다 한 번만 실행한다. LLM 필터는
+    지정 키가 있으면 부서 공유, 없거나 지정 키가 인증·한도 오류를 내면 요청자 키별로 실행한다.
+    """
+    bucket = _bucket(now)
+    if REPORT_SHARED_API_KEY:
+        try:
+            return await _single_flight(
+                _snapshots, (scope, bucket, _SHARED_SCOPE),
+                lambda: _build_snapshot(dept_label, scope, _SHARED_SCOPE, REPORT_SHARED_API_KEY, now),
+                name="report_snapshot",
+            )
+        except anthropic.APIStatusError as e:
+            if not _is_key_error(e):
+                raise
+            logger.warning("부서 공유 키 오류(%d): %s, 요청자 키로 재계산", e.status_code, dept_label)
+    key_scope = _key_scope(api_key)
+    return await _single_flight(
+        _snapshots, (scope, bucket, key_scope),
+        lambda: _build_snapshot(dept_label, scope, key_scope, api_key, now),
+        name="report_snapshot",
+    )
+
+
+async def get_department_articles(department: str, api_key: str) -> dict:
+    """부서·시간 구간별 공유 수집 결과를 반환한다.
+
+    Args:
+        department: 부서명
+        api_key: 지정 키가 없거나 지정 키가 실패했을 때 LLM 필터에 쓸 요청자 API 키
+
+    Returns:
+        {now, articles}. articles는 공유 객체이므로 articles_since로 복사해 사용한다.
+    """
+    dept_label = _dept_label(department)
+    return await _department_snapshot(dept_label, dept_label, api_key, datetime.now(UTC))
+
+
+async def prewarm_department_articles(department: str, api_key: str) -> dict:
+    """예약 실행 전 부서 수집을 미리 계산한다.
+
+    구간 캐시에는 넣지 않고 델타 기준(_latest)만 갱신하므로,
+    예약 시각의 요청은 항상 사전 계산 이후 구간의 델타 수집을 거친다.
+    """
+    dept_label = _dept_label(department)
+    return await _department_snapshot(dept_label, f"{dept_label}:prewarm", api_key, datetime.now(UTC))
+
+
+def _pub_datetime(article: dict) -> datetime | None:
+    try:
+        return datetime.strptime(article.get("pubDate", ""), "%Y-%m-%d %H:%M").replace(tzinfo=_KST)
+    except ValueError:
+        return None
+
+
+def _is_after(article: dict, start: datetime) -> bool:
+    pub = _pub_datetime(article)
+    return pub is None or pub >= start.replace(second=0, microsecond=0)
+
+
+def articles_since(snapshot: dict, since: datetime) -> list[dict]:
+    """공유 수집 결과에서 사용자 윈도우(since 이후) 기사만 복사해 반환한다.
+
+    pubDate는 분 단위이므로 since도 분 단위로 내림해 비교한다.
+    """
+    return [dict(a) for a in snapshot["articles"] if _is_after(a, since)]
+
+
+def shared_analysis_enabled() -> bool:
+    """부서 후보 분석 공유 여부 (지정 키 필요)."""
+    return REPORT_SHARED_ANALYSIS and bool(REPORT_SHARED_API_KEY)
+
+
+async def _analyze_candidates(dept_label: str, snapshot: dict) -> list[dict]:
+    if not snapshot["articles"]:
+        return []
+    return await analyze_report_articles(
+        api_key=REPORT_SHARED_API_KEY,
+        articles=snapshot["articles"],
+        report_history=[],
+        existing_items=None,
+        department=dept_label,
+    )
+
+
+async def get_department_candidates(department: str, snapshot: dict) -> list[dict] | None:
+    """지정 키로 부서 후보 분석(시나리오 A, 이력 없음)을 한 번만 수행하고 사본을 반환한다.
+
+    결과의 source_indices는 snapshot["articles"] 기준이다. 지정 키가 인증·한도 오류를 내면
+    None을 반환하고, 호출자는 자기 키로 분석한다.
+    """
+    dept_label = _dept_label(department)
+    key = (dept_label, _bucket(snapshot["now"]))
+    try:
+        candidates = await _single_flight(
+            _candidates, key, lambda: _analyze_candidates(dept_label, snapshot),
+            name="report_candidates",
+        )
+    except anthropic.APIStatusError as e:
+        if not _is_key_error(e):
+            raise
+        logger.warning("부서 공유 키 오류(%d): %s, 요청자 키로 분석", e.status_code, dept_label)
+        return None
+    return copy.deepcopy(candidates)
+
+
+def diff_candidates(
+    candidates: list[dict],
+    articles: list[dict],
+    since: datetime,
+    report_history: list[dict],
+    existing_items: list[dict] | None,
+) -> list[dict]:
+    """원본 기사가 매핑된 부서 후보를 사용자 이력과 비교해 시나리오 A/B 결과로 만든다.
+
+    - 사용자 윈도우(since) 이전 기사만 참조하는 후보 제외
+    - 시나리오 A: 최근 이력과 제목이 유사한 후보 제외
+    - 시나리오 B: 기존 항목과 URL이 같으면 제외, 제목이 유사하면 modified, 그 외 added
+
+    Args:
+        candidates: _map_results_to_articles로 url/publisher가 채워진 후보
+        articles: 공유 수집 기사 (후보 url → 배포 시각 조회용)
+        since: 사용자 윈도우 시작 시각
+        report_history: get_recent_report_items 반환값
+        existing_items: 시나리오 B 당일 기존 항목 (시나리오 A면 None)
+
+    Returns:
+        시나리오 B면 action/item_id(DB ID)가 채워진 결과 리스트
+    """
+    pub_by_link = {a["link"]: _pub_datetime(a) for a in articles}
+    since_minute = since.replace(second=0, microsecond=0)
+
+    results = []
+    for c in candidates:
+        pub = pub_by_link.get(c.get("url", ""))
+        if pub is not None and pub < since_minute:
+            continue
+
+        title = c.get("title", "")
+        if existing_items is None:
+            if any(
+                title_similarity(title, h.get("title", "")) >= DUPLICATE_TITLE_THRESHOLD
+                for h in report_history
+            ):
+                continue
+            results.append(c)
+            continue
+
+        if any(c.get("url") and c.get("url") == e.get("url") for e in existing_items):
+            continue
+        similar = next(
+            (
+                e for e in existing_items
+                if title_similarity(title, e.get("title", "")) >= DUPLICATE_TITLE_THRESHOLD
+            ),
+            None,
+        )
+        if similar:
+            c["action"], c["item_id"] = "modified", similar["id"]
+        else:
+            c["action"], c["item_id"] = "added", 0
+        results.append(c)
+
+    return results
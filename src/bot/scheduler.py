@@ -1,33 +1,91 @@
 """스케줄 자동 실행 — JobQueue 콜백 + 서버 시작 시 복원."""
 
-import asyncio
 import logging
 
-from datetime import datetime, time, timedelta, timezone
+from datetime import date, datetime, time, timedelta, timezone
 
 from telegram.ext import Application, ContextTypes
 
+from src.config import (
+    BATCH_POLL_INTERVAL_SECONDS, BATCH_MAX_WAIT_SECONDS, REPORT_PREWARM_LEAD_MINUTES,
+    SCHEDULE_SLA_SECONDS, SCHEDULE_CATCHUP_GRACE_MINUTES,
+)
+from src import metrics
 from src.storage import repository as repo
+from src.agents.batch import submit_batch, get_batch_results, cancel_batch
+from src.agents.check_agent import (
+    analyze_articles, build_analysis_request, _parse_analysis_response,
+)
+from src.agents.report_agent import (
+    analyze_report_articles, build_report_request, _parse_report_response,
+)
 from src.bot.handlers import (
-    _run_check_pipeline,
-    _run_report_pipeline,
+    _execute_check,
+    _execute_report,
+    _collect_check_articles,
+    _collect_report_articles,
+    _finish_check_results,
+    _finish_report_results,
+    _deliver_check_results,
     _user_locks,
-    _pipeline_semaphore,
+    _run_coalesced,
     _handle_report_scenario_a,
     _handle_report_scenario_b,
     format_error_message,
 )
-from src.bot.formatters import (
-    format_check_header,
-    format_article_message,
-    format_no_results,
-    format_skipped_articles,
-)
+from src.bot.delivery import chat_sender
+from src.bot.jobs import decode_check_result, delivery_scope, wait_job
+from src.bot.admission import pipeline_slots, PRIORITY_SCHEDULED, PRIORITY_BACKGROUND
+from src.bot.report_engine import prewarm_department_articles
+from src.bot.load_plan import Due, plan_minute
+from src.bot.formatters import format_no_results
 
 logger = logging.getLogger(__name__)
 
 _KST = timezone(timedelta(hours=9))
 
+# 사전 계산은 예약 시각보다 최소 이만큼 앞서 끝나도록 분산 구간을 잡는다
+_PREWARM_MIN_GAP_SECONDS = 120
+
+
+def _make_send_fn(bot, chat_id: int):
+    """chat_id로 메시지를 보내는 send_fn을 만든다 (reply_text와 같은 시그니처, 속도 제한 적용)."""
+    async def send_fn(text, **kwargs):
+        await bot.send_message(chat_id=chat_id, text=text, **kwargs)
+    return chat_sender(send_fn, chat_id)
+
+
+def _sla_due(data: dict) -> float | None:
+    """전송 SLA 시각(epoch 초). 실행 마감은 파이프라인 슬롯을 얻은 뒤 이 시각까지로 걸린다."""
+    due_at = data.get("due_at")
+    return None if due_at is None else due_at + SCHEDULE_SLA_SECONDS
+
+
+def _record_sla(command: str, data: dict) -> None:
+    """예약 시각부터 전송 완료까지 걸린 시간을 기록하고 SLA 초과를 센다."""
+    due_at = data.get("due_at")
+    if due_at is None:
+        return
+    latency = datetime.now(_KST).timestamp() - due_at
+    metrics.record("schedule", command, latency)
+    if latency > SCHEDULE_SLA_SECONDS:
+        metrics.inc("tasa_schedule_sla_miss_total", command=command)
+        logger.warning("예약 %s SLA 초과: %.0f초 (journalist=%d)", command, latency, data["journalist_id"])
+
+
+async def _update_run(db, data: dict, status: str) -> None:
+    """예약 실행 기록(schedule_runs) 상태 갱신. 기록 없이 실행된 job이면 무시."""
+    run_id = data.get("run_id")
+    if run_id is not None:
+        await repo.update_schedule_run(db, run_id, status)
+
+
+def _schedule_header(title: str, data: dict) -> str:
+    header = f"━━━━━━━━━━━━━━━━━━━━\n⏰ {title}"
+    if data.get("catch_up"):
+        header += f" ({data['time_kst']} 예약, 서버 재시작으로 지연 실행)"
+    return header
+
 
 # --- JobQueue 콜백 ---
 
@@ -39,53 +97,50 @@ async def scheduled_check(context: ContextTypes.DEFAULT_TYPE) -> None:
     telegram_id = str(chat_id)
     db = context.bot_data["db"]
 
-    lock = _user_locks.setdefault(telegram_id, asyncio.Lock())
-
     journalist = await repo.get_journalist(db, telegram_id)
     if not journalist:
+        await _update_run(db, job.data, "failed")
         return
 
-    async def send_fn(text, **kwargs):
-        await context.bot.send_message(chat_id=chat_id, text=text, **kwargs)
+    send_fn = _make_send_fn(context.bot, chat_id)
+    priority = job.data.get("priority", PRIORITY_SCHEDULED)
+    failed = False
+    await _update_run(db, job.data, "running")
 
-    async with lock:
-        await send_fn("━━━━━━━━━━━━━━━━━━━━\n⏰ 자동 타사체크")
+    async def _run() -> None:
+        nonlocal failed
+        async with _user_locks.hold(telegram_id), delivery_scope(db):
+            await send_fn(_schedule_header("자동 타사체크", job.data))
+
+            if journalist["batch_mode"]:
+                await _submit_check_batch(context, db, journalist, chat_id, send_fn)
+                return
 
-        async with _pipeline_semaphore:
             try:
-                results, since, now, haiku_filtered = await _run_check_pipeline(db, journalist)
+                results, since, now, haiku_filtered = await _execute_check(
+                    db, journalist, priority, sla_due=_sla_due(job.data),
+                )
             except Exception as e:
+                failed = True
                 logger.error("자동 check 실패 (journalist=%d): %s", journalist_id, e, exc_info=True)
                 await send_fn(f"[자동 체크] 실패: {format_error_message(e)}")
                 return
 
-        # check 실행 완료 시점에 항상 last_check_at 갱신
-        await repo.update_last_check_at(db, journalist["id"])
-
-        if results is None:
-            await send_fn(format_no_results())
-            return
-
-        reported = [r for r in results if r["category"] != "skip"]
-        skipped = [r for r in results if r["category"] == "skip"]
-
-        await repo.save_reported_articles(db, journalist["id"], results)
+            if results is None:
+                # 결과가 없어도 수집한 구간은 처리한 것으로 기록
+                await repo.update_last_check_at(db, journalist["id"], at=now)
+                await send_fn(format_no_results())
+                return
 
-        total = len(results) + haiku_filtered
-        await send_fn(
-            format_check_header(total, len(reported), since, now),
-            parse_mode="HTML",
-        )
-        sorted_reported = sorted(reported, key=lambda r: r.get("pub_time", ""), reverse=True)
-        for article in sorted_reported:
-            await send_fn(
-                format_article_message(article),
-                parse_mode="HTML",
-                disable_web_page_preview=True,
+            await _deliver_check_results(
+                send_fn, db, journalist["id"], results, since, now, haiku_filtered,
             )
-        if skipped:
-            for msg in format_skipped_articles(skipped, haiku_filtered):
-                await send_fn(msg, parse_mode="HTML", disable_web_page_preview=True)
+
+    # 같은 사용자의 체크가 이미 실행 중이면(수동 요청 포함) 그 결과를 공유한다
+    if not await _run_coalesced(telegram_id, "check", _run):
+        logger.info("자동 check: 진행 중인 실행에 합류 (journalist=%d)", journalist_id)
+    _record_sla("check", job.data)
+    await _update_run(db, job.data, "failed" if failed else "done")
 
 
 async def scheduled_report(context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -96,58 +151,426 @@ async def scheduled_report(context: ContextTypes.DEFAULT_TYPE) -> None:
     telegram_id = str(chat_id)
     db = context.bot_data["db"]
 
-    lock = _user_locks.setdefault(telegram_id, asyncio.Lock())
-
     journalist = await repo.get_journalist(db, telegram_id)
     if not journalist:
+        await _update_run(db, job.data, "failed")
         return
 
-    async def send_fn(text, **kwargs):
-        await context.bot.send_message(chat_id=chat_id, text=text, **kwargs)
-
-    async with lock:
-        await send_fn("━━━━━━━━━━━━━━━━━━━━\n⏰ 자동 브리핑")
-
-        today = datetime.now(_KST).strftime("%Y-%m-%d")
-        department = journalist["department"]
-
-        cache_id, is_new = await repo.get_or_create_report_cache(db, journalist["id"], today)
-        existing_items = []
-        if not is_new:
-            existing_items = await repo.get_report_items_by_cache(db, cache_id)
-        is_scenario_a = is_new or len(existing_items) == 0
+    send_fn = _make_send_fn(context.bot, chat_id)
+    priority = job.data.get("priority", PRIORITY_SCHEDULED)
+    failed = False
+    await _update_run(db, job.data, "running")
+
+    async def _run() -> None:
+        nonlocal failed
+        async with _user_locks.hold(telegram_id), delivery_scope(db):
+            await send_fn(_schedule_header("자동 브리핑", job.data))
+
+            today = datetime.now(_KST).strftime("%Y-%m-%d")
+            department = journalist["department"]
+
+            cache_id, is_new = await repo.get_or_create_report_cache(db, journalist["id"], today)
+            existing_items = []
+            if not is_new:
+                existing_items = await repo.get_report_items_by_cache(db, cache_id)
+            is_scenario_a = is_new or len(existing_items) == 0
+
+            if journalist["batch_mode"]:
+                await _submit_report_batch(
+                    context, db, journalist, chat_id, send_fn,
+                    cache_id, today, existing_items if not is_scenario_a else None,
+                )
+                return
 
-        async with _pipeline_semaphore:
             try:
-                results = await _run_report_pipeline(
-                    db, journalist,
-                    existing_items=existing_items if not is_scenario_a else None,
+                results = await _execute_report(
+                    db, journalist, priority, cache_id, today,
+                    existing_items if not is_scenario_a else None,
+                    sla_due=_sla_due(job.data),
                 )
             except Exception as e:
+                failed = True
                 logger.error("자동 report 실패 (journalist=%d): %s", journalist_id, e, exc_info=True)
                 await send_fn(f"[자동 브리핑] 실패: {format_error_message(e)}")
                 return
 
-        # report 실행 완료 시점에 항상 last_report_at 갱신
-        await repo.update_last_report_at(db, journalist["id"])
+            if results is None:
+                await repo.update_last_report_at(db, journalist["id"])
+                await send_fn("관련 뉴스를 찾지 못했습니다.")
+                return
 
-        if results is None:
-            await send_fn("관련 뉴스를 찾지 못했습니다.")
+            # last_report_at·결과 저장 + 전송 (세마포어 해제 후)
+            if is_scenario_a:
+                await _handle_report_scenario_a(
+                    send_fn, db, journalist["id"], cache_id, department, today, results,
+                )
+            else:
+                await _handle_report_scenario_b(
+                    send_fn, db, journalist["id"], cache_id, department, today,
+                    existing_items, results,
+                )
+
+    # 같은 사용자의 브리핑이 이미 실행 중이면(수동 요청 포함) 그 결과를 공유한다
+    if not await _run_coalesced(telegram_id, "report", _run):
+        logger.info("자동 report: 진행 중인 실행에 합류 (journalist=%d)", journalist_id)
+    _record_sla("report", job.data)
+    await _update_run(db, job.data, "failed" if failed else "done")
+
+
+async def prewarm_report(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """예약 report 전 부서 수집(검색·필터·본문)을 미리 계산한다.
+
+    예약 시각의 scheduled_report는 사전 계산 이후 구간만 델타 수집한다.
+    """
+    job = context.job
+    journalist_id = job.data["journalist_id"]
+    db = context.bot_data["db"]
+
+    journalist = await repo.get_journalist(db, str(job.chat_id))
+    if not journalist:
+        return
+
+    try:
+        async with pipeline_slots.slot(PRIORITY_BACKGROUND, str(job.chat_id)):
+            snapshot = await prewarm_department_articles(
+                journalist["department"], journalist["api_key"],
+            )
+    except Exception:
+        logger.warning("report 사전 계산 실패 (journalist=%d)", journalist_id, exc_info=True)
+        return
+    logger.info(
+        "report 사전 계산 완료 (journalist=%d): 기사 %d건", journalist_id, len(snapshot["articles"]),
+    )
+
+
+def _prewarm_time(job_time: time, journalist_id: int) -> time:
+    """사전 계산 시각. 예약 시각 N분 전 ~ 최소 간격 전 사이에 사용자별로 분산한다."""
+    lead = REPORT_PREWARM_LEAD_MINUTES * 60
+    spread = max(lead - _PREWARM_MIN_GAP_SECONDS, 1)
+    offset = (journalist_id * 97) % spread
+    scheduled = datetime.combine(date(2000, 1, 3), job_time.replace(tzinfo=None))
+    return (scheduled - timedelta(seconds=lead - offset)).time().replace(tzinfo=_KST)
+
+
+# --- Message Batches 실행 모드 ---
+#
+# 배치 결과는 폴링 job이 받아 전송한다. 제출한 배치는 수집 상태와 함께 pending_batches에
+# 기록하고(last_*_at 갱신과 같은 트랜잭션), 재시작하면 restore_batch_polls가 폴링을 다시 건다.
+
+def _encode_batch_state(command: str, state: dict) -> dict:
+    """폴링 job 상태를 DB에 저장할 JSON 형태로 바꾼다."""
+    collected = state["collected"]
+    if command == "check":
+        collected = {**collected, "since": collected["since"].isoformat(), "now": collected["now"].isoformat()}
+    else:
+        # 결과 처리에는 분석 입력 기사와 이력만 필요하다 (부서 스냅샷은 저장하지 않음)
+        collected = {"articles": collected["articles"], "report_history": collected["report_history"]}
+    return {**state, "collected": collected}
+
+
+def _decode_batch_state(command: str, state: dict) -> dict:
+    if command == "check":
+        collected = state["collected"]
+        state["collected"] = {
+            **collected,
+            "since": datetime.fromisoformat(collected["since"]),
+            "now": datetime.fromisoformat(collected["now"]),
+        }
+    return state
+
+
+async def _submit_check_batch(context, db, journalist: dict, chat_id: int, send_fn) -> None:
+    """수집까지만 동기 실행하고 분석 요청은 배치로 제출한다. 결과는 폴링 job이 전송."""
+    try:
+        async with pipeline_slots.slot(PRIORITY_SCHEDULED, journalist["telegram_id"]):
+            collected = await _collect_check_articles(db, journalist)
+
+        if not collected["articles"]:
+            results = collected["local_skipped"] or None
+            if results is None:
+                await repo.update_last_check_at(db, journalist["id"], at=collected["now"])
+                await send_fn(format_no_results())
+                return
+            await _deliver_check_results(
+                send_fn, db, journalist["id"], results,
+                collected["since"], collected["now"], collected["haiku_filtered"],
+            )
             return
 
-        # 결과 전송 (세마포어 해제 후)
-        if is_scenario_a:
-            await _handle_report_scenario_a(
-                send_fn, db, cache_id, department, today, results,
+        params = build_analysis_request(
+            collected["articles"], collected["history"],
+            journalist["department"], journalist["keywords"],
+        )
+        batch_id = await submit_batch(journalist["api_key"], [("check", params)])
+        submitted_at = datetime.now(_KST)
+        state = {"collected": collected}
+        async with repo.unit_of_work(db):
+            await repo.update_last_check_at(db, journalist["id"], at=collected["now"])
+            await repo.save_pending_batch(
+                db, batch_id, journalist["id"], chat_id, "check",
+                _encode_batch_state("check", state), submitted_at,
             )
-        else:
+    except Exception as e:
+        logger.error("자동 check 배치 제출 실패 (journalist=%d): %s", journalist["id"], e, exc_info=True)
+        await send_fn(f"[자동 체크] 실패: {format_error_message(e)}")
+        return
+
+    _schedule_batch_poll(context.job_queue, "check", journalist["id"], chat_id, batch_id, submitted_at, state)
+
+
+async def _submit_report_batch(
+    context, db, journalist: dict, chat_id: int, send_fn,
+    cache_id: int, today: str, existing_items: list[dict] | None,
+) -> None:
+    """수집까지만 동기 실행하고 브리핑 분석 요청은 배치로 제출한다."""
+    try:
+        async with pipeline_slots.slot(PRIORITY_SCHEDULED, journalist["telegram_id"]):
+            collected = await _collect_report_articles(db, journalist, cache_id, existing_items)
+
+        if collected is None:
+            await repo.update_last_report_at(db, journalist["id"])
+            await send_fn("관련 뉴스를 찾지 못했습니다.")
+            return
+        if not collected["articles"]:
+            # 시나리오 B 신규 기사 없음: LLM 호출 없이 기존 항목 전송
             await _handle_report_scenario_b(
-                send_fn, db, cache_id, department, today,
-                existing_items, results,
+                send_fn, db, journalist["id"], cache_id, journalist["department"], today,
+                existing_items, [],
+            )
+            return
+
+        params = build_report_request(
+            collected["articles"], collected["report_history"],
+            existing_items, journalist["department"],
+        )
+        batch_id = await submit_batch(journalist["api_key"], [("report", params)])
+        submitted_at = datetime.now(_KST)
+        state = {
+            "collected": collected,
+            "cache_id": cache_id,
+            "today": today,
+            "existing_items": existing_items,
+        }
+        async with repo.unit_of_work(db):
+            await repo.update_last_report_at(db, journalist["id"], at=submitted_at)
+            await repo.save_pending_batch(
+                db, batch_id, journalist["id"], chat_id, "report",
+                _encode_batch_state("report", state), submitted_at,
             )
+    except Exception as e:
+        logger.error("자동 report 배치 제출 실패 (journalist=%d): %s", journalist["id"], e, exc_info=True)
+        await send_fn(f"[자동 브리핑] 실패: {format_error_message(e)}")
+        return
+
+    _schedule_batch_poll(context.job_queue, "report", journalist["id"], chat_id, batch_id, submitted_at, state)
+
+
+def _schedule_batch_poll(
+    job_queue, command: str, journalist_id: int, chat_id: int, batch_id: str,
+    submitted_at: datetime, state: dict,
+) -> None:
+    """배치 완료를 확인하는 반복 job을 등록한다."""
+    job_queue.run_repeating(
+        poll_batch_job,
+        interval=BATCH_POLL_INTERVAL_SECONDS,
+        first=BATCH_POLL_INTERVAL_SECONDS,
+        chat_id=chat_id,
+        name=f"batch_{command}_{journalist_id}_{batch_id}",
+        data={
+            "command": command,
+            "journalist_id": journalist_id,
+            "batch_id": batch_id,
+            "submitted_at": submitted_at,
+            **state,
+        },
+    )
+    logger.info("배치 폴링 등록: %s (journalist=%d)", batch_id, journalist_id)
+
+
+async def restore_batch_polls(app: Application, db) -> None:
+    """서버 시작 시 결과를 아직 전송하지 못한 배치의 폴링을 다시 등록한다."""
+    pending = await repo.get_pending_batches(db)
+    for p in pending:
+        _schedule_batch_poll(
+            app.job_queue, p["command"], p["journalist_id"], p["chat_id"], p["batch_id"],
+            p["submitted_at"], _decode_batch_state(p["command"], p["state"]),
+        )
+    if pending:
+        logger.info("배치 폴링 복원: %d건", len(pending))
+
+
+async def poll_batch_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """배치 완료 여부를 확인하고, 끝났으면 결과를 파싱해 전송한다.
+
+    대기 한도를 넘기거나 결과 파싱에 실패하면 동기 분석으로 대체한다.
+    전송(또는 실패 안내)까지 마치면 pending_batches 기록을 지운다.
+    """
+    job = context.job
+    data = job.data
+    chat_id = job.chat_id
+    db = context.bot_data["db"]
+    command = data["command"]
+
+    journalist = await repo.get_journalist(db, str(chat_id))
+    if not journalist:
+        job.schedule_removal()
+        await repo.delete_pending_batch(db, data["batch_id"])
+        return
+    api_key = journalist["api_key"]
+    send_fn = _make_send_fn(context.bot, chat_id)
+
+    message = None
+    try:
+        batch_results = await get_batch_results(api_key, data["batch_id"])
+    except Exception:
+        logger.warning("배치 조회 실패: %s", data["batch_id"], exc_info=True)
+        return
+    if batch_results is None:
+        waited = (datetime.now(_KST) - data["submitted_at"]).total_seconds()
+        if waited < BATCH_MAX_WAIT_SECONDS:
+            return
+        logger.warning("배치 대기 한도 초과: %s, 동기 분석으로 대체", data["batch_id"])
+        await cancel_batch(api_key, data["batch_id"])
+    else:
+        message = batch_results.get(command)
+    job.schedule_removal()
+
+    async with _user_locks.hold(str(chat_id)):
+        try:
+            if command == "check":
+                await _complete_check_batch(db, journalist, send_fn, data, message)
+            else:
+                await _complete_report_batch(db, journalist, send_fn, data, message)
+        except Exception as e:
+            logger.error("배치 결과 처리 실패 (journalist=%d): %s", journalist["id"], e, exc_info=True)
+            label = "[자동 체크]" if command == "check" else "[자동 브리핑]"
+            await send_fn(f"{label} 실패: {format_error_message(e)}")
+        finally:
+            await repo.delete_pending_batch(db, data["batch_id"])
+
+
+def _complete_message(message, parse):
+    """배치 응답을 바로 쓸 수 있으면 파싱 결과를, 동기 분석으로 이어가야 하면 None을 반환한다.
+
+    max_tokens로 잘린 응답은 동기 경로처럼 회수분을 유지하고 나머지를 이어쓰기로 받아야 하므로
+    여기서 파싱하지 않는다.
+    """
+    if message is None:
+        return None
+    if message.stop_reason == "max_tokens":
+        logger.warning("배치 응답이 출력 한도로 잘림: 동기 분석으로 이어쓰기")
+        return None
+    return parse(message)
+
+
+async def _complete_check_batch(db, journalist: dict, send_fn, data: dict, message) -> None:
+    """배치 check 결과를 파싱·매핑하여 전송한다."""
+    collected = data["collected"]
+    results = _complete_message(message, _parse_analysis_response)
+    if not results:
+        # 배치 실패/만료/파싱 실패/절단 → 복구·이어쓰기 로직이 있는 동기 분석으로 대체
+        async with pipeline_slots.slot(PRIORITY_SCHEDULED, journalist["telegram_id"]):
+            results = await analyze_articles(
+                api_key=journalist["api_key"],
+                articles=collected["articles"],
+                history=collected["history"],
+                department=journalist["department"],
+                keywords=journalist["keywords"],
+                first_message=message,
+            )
+    results = _finish_check_results(results, collected)
+    await _deliver_check_results(
+        send_fn, db, journalist["id"], results,
+        collected["since"], collected["now"], collected["haiku_filtered"],
+    )
 
 
-# --- JobQueue 등록/해제 ---
+async def _complete_report_batch(db, journalist: dict, send_fn, data: dict, message) -> None:
+    """배치 report 결과를 파싱·매핑하여 시나리오 A/B로 전송한다."""
+    collected = data["collected"]
+    existing_items = data["existing_items"]
+    scenario = "B" if existing_items else "A"
+    results = _complete_message(message, lambda m: _parse_report_response(m, scenario))
+    if results is None:
+        async with pipeline_slots.slot(PRIORITY_SCHEDULED, journalist["telegram_id"]):
+            results = await analyze_report_articles(
+                api_key=journalist["api_key"],
+                articles=collected["articles"],
+                report_history=collected["report_history"],
+                existing_items=existing_items,
+                department=journalist["department"],
+                first_message=message,
+            )
+    results = _finish_report_results(results, collected["articles"], existing_items)
+    await repo.add_processed_links(db, data["cache_id"], [a["link"] for a in collected["articles"]])
+
+    department = journalist["department"]
+    if existing_items:
+        await _handle_report_scenario_b(
+            send_fn, db, journalist["id"], data["cache_id"], department, data["today"],
+            existing_items, results, reported_at=data["submitted_at"],
+        )
+    else:
+        await _handle_report_scenario_a(
+            send_fn, db, journalist["id"], data["cache_id"], department, data["today"], results,
+            reported_at=data["submitted_at"],
+        )
+
+
+# --- 예약 색인 + 분 단위 디스패처 ---
+
+class _ScheduleIndex:
+    """예약 실행 색인: 하루 중 분(0~1439) → 그 분에 실행할 항목.
+
+    사용자·명령별 역색인을 같이 두어 등록·해제가 JobQueue 전체를 훑지 않고
+    해당 사용자 항목 수만큼만 걸린다. 항목 kind는 "check" / "report" / "prewarm".
+    """
+
+    def __init__(self):
+        # minute -> {(kind, journalist_id, time_kst): (telegram_id, second)}
+        self._by_minute: dict[int, dict[tuple, tuple[str, int]]] = {}
+        # (journalist_id, command) -> {(minute, key)}
+        self._by_user: dict[tuple[int, str], set[tuple[int, tuple]]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._by_minute.values())
+
+    def add(
+        self, kind: str, command: str, journalist_id: int, telegram_id: str,
+        time_kst: str, at: time,
+    ) -> None:
+        """at(시:분:초)에 실행할 항목을 추가한다. command는 해제 단위 (prewarm은 "report")."""
+        minute = at.hour * 60 + at.minute
+        key = (kind, journalist_id, time_kst)
+        self._by_minute.setdefault(minute, {})[key] = (telegram_id, at.second)
+        self._by_user.setdefault((journalist_id, command), set()).add((minute, key))
+
+    def remove(self, journalist_id: int, command: str) -> None:
+        for minute, key in self._by_user.pop((journalist_id, command), ()):
+            entries = self._by_minute.get(minute)
+            if entries is None:
+                continue
+            entries.pop(key, None)
+            if not entries:
+                del self._by_minute[minute]
+
+    def due(self, minute: int) -> list[tuple[str, int, str, str, int]]:
+        """해당 분에 실행할 (kind, journalist_id, time_kst, telegram_id, second) 목록."""
+        return [
+            (kind, journalist_id, time_kst, telegram_id, second)
+            for (kind, journalist_id, time_kst), (telegram_id, second)
+            in self._by_minute.get(minute, {}).items()
+        ]
+
+
+_schedule_index = _ScheduleIndex()
+# 마지막으로 처리한 분 (하루 중 분). 틱이 늦거나 빠지면 그 사이 분을 이어서 처리한다
+_last_minute: int | None = None
+# 한 번의 틱에서 따라잡을 최대 분 수 (그 이상 밀린 예약은 건너뜀)
+_MAX_CATCHUP_MINUTES = 5
+# 디스패처 job 이름 (dispatcher_ticks 기록 키)
+_DISPATCHER_NAME = "schedule_dispatch"
+
 
 def register_job(
     app: Application,
@@ -156,19 +579,17 @@ def register_job(
     telegram_id: str,
     time_kst_str: str,
 ) -> None:
-    """하나의 스케줄 job을 JobQueue에 등록한다."""
-    callback = scheduled_check if command == "check" else scheduled_report
+    """하나의 예약을 색인에 등록한다. 실행은 dispatch_schedules가 맡는다."""
     h, m = map(int, time_kst_str.split(":"))
     job_time = time(hour=h, minute=m, tzinfo=_KST)
-    job_name = f"{command}_{journalist_id}_{time_kst_str}"
-
-    app.job_queue.run_daily(
-        callback,
-        time=job_time,
-        chat_id=int(telegram_id),
-        name=job_name,
-        data={"journalist_id": journalist_id},
-    )
+    _schedule_index.add(command, command, journalist_id, telegram_id, time_kst_str, job_time)
+
+    # report는 예약 시각 전에 수집을 사전 계산 (report 해제 시 함께 해제됨)
+    if command == "report" and REPORT_PREWARM_LEAD_MINUTES > 0:
+        _schedule_index.add(
+            "prewarm", command, journalist_id, telegram_id, time_kst_str,
+            _prewarm_time(job_time, journalist_id),
+        )
 
 
 def unregister_jobs(
@@ -176,24 +597,86 @@ def unregister_jobs(
     journalist_id: int,
     command: str | None = None,
 ) -> None:
-    """사용자의 스케줄 job을 JobQueue에서 제거한다.
+    """사용자의 예약을 색인에서 제거한다.
 
     command가 지정되면 해당 명령만, None이면 전체 제거.
     """
-    prefixes = []
-    if command:
-        prefixes.append(f"{command}_{journalist_id}_")
-    else:
-        prefixes.append(f"check_{journalist_id}_")
-        prefixes.append(f"report_{journalist_id}_")
+    for c in [command] if command else ["check", "report"]:
+        _schedule_index.remove(journalist_id, c)
+
+
+def _due_minutes(now_minute: int) -> list[int]:
+    """지난 틱 이후 처리할 분 목록 (자정 넘김 포함)."""
+    global _last_minute
+    last, _last_minute = _last_minute, now_minute
+    if last is None:
+        return [now_minute]
+    gap = (now_minute - last) % (24 * 60)
+    if gap == 0:
+        return []
+    if gap > _MAX_CATCHUP_MINUTES:
+        logger.warning("예약 디스패처 %d분 지연: 최근 %d분만 처리", gap, _MAX_CATCHUP_MINUTES)
+        gap = _MAX_CATCHUP_MINUTES
+    return [(now_minute - k) % (24 * 60) for k in range(gap - 1, -1, -1)]
+
+
+async def dispatch_schedules(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """매분 실행: 이번 분에 예약된 항목을 분산 시각에 맞춰 일회성 job으로 내보낸다.
+
+    시작 시각은 load_plan.plan_minute가 정한다 (check는 고르게, report는 부서별 묶음).
+    각 실행은 scheduled_check / scheduled_report / prewarm_report가 받아 우선순위
+    스케줄러(pipeline_slots)에서 슬롯을 기다린다.
+    """
+    now = datetime.now(_KST)
+    current = now.hour * 60 + now.minute
+    callbacks = {"check": scheduled_check, "report": scheduled_report, "prewarm": prewarm_report}
+    fired = 0
+    for minute in _due_minutes(current):
+        entries = [Due(*item) for item in _schedule_index.due(minute)]
+        if not entries:
+            continue
+        departments = await repo.get_departments(
+            context.bot_data["db"], [e.journalist_id for e in entries if e.kind == "report"],
+        )
+        for e in entries:
+            e.department = departments.get(e.journalist_id, "")
+
+        # 따라잡는 지난 분은 그만큼 이미 지났으므로 남은 오프셋만 기다린다
+        elapsed = (current - minute) % (24 * 60) * 60 + now.second
+        due_at = now.timestamp() - elapsed
+        run_date = datetime.fromtimestamp(due_at, _KST).strftime("%Y-%m-%d")
+        for offset, e in plan_minute(entries):
+            data = {"journalist_id": e.journalist_id, "due_at": due_at, "time_kst": e.time_kst}
+            if e.kind != "prewarm":
+                data["run_id"] = await repo.record_schedule_run(
+                    context.bot_data["db"], e.journalist_id, e.kind, run_date, e.time_kst,
+                )
+            context.job_queue.run_once(
+                callbacks[e.kind],
+                when=max(offset - elapsed, 0),
+                chat_id=int(e.telegram_id),
+                name=f"{e.kind}_{e.journalist_id}_{e.time_kst}",
+                data=data,
+            )
+            fired += 1
+    if fired:
+        logger.info("예약 실행 %d건 (%02d:%02d)", fired, now.hour, now.minute)
+    # 재시작 시 이 시각 이전 예약은 디스패처가 처리한 것으로 본다 (catch_up_missed_runs)
+    await repo.record_dispatcher_tick(context.bot_data["db"], _DISPATCHER_NAME, now)
+
 
-    for job in app.job_queue.jobs():
-        if job.name and any(job.name.startswith(p) for p in prefixes):
-            job.schedule_removal()
+def start_dispatcher(app: Application) -> None:
+    """분 경계에 맞춰 매분 도는 디스패처 job을 등록한다."""
+    now = datetime.now(_KST)
+    first = 60 - now.second - now.microsecond / 1_000_000
+    app.job_queue.run_repeating(dispatch_schedules, interval=60, first=first, name=_DISPATCHER_NAME)
 
 
 async def restore_schedules(app: Application, db) -> None:
-    """서버 시작 시 DB의 스케줄을 JobQueue에 복원한다."""
+    """서버 시작 시 DB의 스케줄을 색인에 복원하고 디스패처를 시작한다.
+
+    결과를 기다리던 배치의 폴링도 다시 등록한다.
+    """
     schedules = await repo.get_all_schedules(db)
     for s in schedules:
         register_job(
@@ -203,5 +686,139 @@ async def restore_schedules(app: Application, db) -> None:
             telegram_id=s["telegram_id"],
             time_kst_str=s["time_kst"],
         )
+    start_dispatcher(app)
     if schedules:
         logger.info("스케줄 복원 완료: %d건", len(schedules))
+    await restore_batch_polls(app, db)
+    await catch_up_missed_runs(app, db, schedules)
+
+
+def _missed_runs(
+    schedules: list[dict], ledger: dict[tuple, str], now: datetime, grace_minutes: int,
+    last_tick: datetime | None,
+) -> list[tuple[dict, datetime]]:
+    """grace_minutes 안에 예약됐지만 끝나지 않은 실행 목록.
+
+    내보냈지만 끝나지 않은(dispatched/running) 실행은 따라잡는다. 기록이 없는 실행은
+    마지막 디스패처 틱(last_tick) 뒤에 예약된 것만 놓친 것으로 본다. 틱 이전 예약에 기록이
+    없으면 디스패처가 돌 때 그 예약이 없었던 것(예: 지난 시각으로 새로 만든 예약)이고,
+    틱 기록이 없으면(첫 배포) 디스패처가 돈 적이 없으므로 따라잡지 않는다.
+    시작 시각이 속한 분은 포함한다. 디스패처의 첫 틱은 다음 분부터 처리한다.
+    """
+    missed = []
+    for s in schedules:
+        h, m = map(int, s["time_kst"].split(":"))
+        due = now.replace(hour=h, minute=m, second=0, microsecond=0)
+        if due > now:
+            due -= timedelta(days=1)
+        if now - due > timedelta(minutes=grace_minutes):
+            continue
+        key = (s["journalist_id"], s["command"], due.strftime("%Y-%m-%d"), s["time_kst"])
+        status = ledger.get(key)
+        if status is None:
+            if last_tick is None or due <= last_tick:
+                continue
+        elif status not in ("dispatched", "running"):
+            continue
+        missed.append((s, due))
+    return missed
+
+
+async def catch_up_missed_runs(app: Application, db, schedules: list[dict]) -> None:
+    """재시작 중 놓친 예약을 낮은 우선순위로 나눠 실행한다.
+
+    대상은 _missed_runs가 정한다 (중단된 실행, 마지막 디스패처 틱 이후의 기록 없는 실행).
+    한꺼번에 몰리지 않도록 plan_minute로 분산 구간에 펼쳐 PRIORITY_BACKGROUND로 슬롯을 기다리게 한다.
+    """
+    now = datetime.now(_KST)
+    since = (now - timedelta(days=1)).strftime("%Y-%m-%d")
+    ledger = await repo.get_schedule_runs_since(db, since)
+    last_tick = await repo.get_dispatcher_tick(db, _DISPATCHER_NAME)
+    missed = _missed_runs(schedules, ledger, now, SCHEDULE_CATCHUP_GRACE_MINUTES, last_tick)
+    if not missed:
+        return
+
+    callbacks = {"check": scheduled_check, "report": scheduled_report}
+    entries = [
+        Due(s["command"], s["journalist_id"], s["time_kst"], s["telegram_id"], department=s["department"])
+        for s, _ in missed
+    ]
+    due_by_entry = {id(e): due for e, (_, due) in zip(entries, missed)}
+    for offset, e in plan_minute(entries):
+        due = due_by_entry[id(e)]
+        run_id = await repo.record_schedule_run(
+            db, e.journalist_id, e.kind, due.strftime("%Y-%m-%d"), e.time_kst, catch_up=True,
+        )
+        app.job_queue.run_once(
+            callbacks[e.kind],
+            when=offset,
+            chat_id=int(e.telegram_id),
+            name=f"{e.kind}_{e.journalist_id}_{e.time_kst}_catchup",
+            data={
+                "journalist_id": e.journalist_id, "time_kst": e.time_kst, "run_id": run_id,
+                "priority": PRIORITY_BACKGROUND, "catch_up": True,
+            },
+        )
+    logger.warning("재시작으로 놓친 예약 %d건 따라잡기 실행", len(missed))
+
+
+async def restore_pipeline_jobs(app: Application, db) -> None:
+    """서버 시작 시 결과를 아직 받지 못한 워커 작업을 다시 기다려 전송한다."""
+    pending = await repo.get_undelivered_pipeline_jobs(db)
+    for job in pending:
+        app.create_task(_resume_pipeline_job(app.bot, db, job), name=f"pipeline_job_{job['id']}")
+    if pending:
+        logger.info("워커 작업 복원: %d건", len(pending))
+
+
+async def _resume_pipeline_job(bot, db, job: dict) -> None:
+    """재시작 전에 등록된 작업의 결과를 받아 전송한다. 같은 명령의 새 요청은 여기에 합류한다."""
+    telegram_id = job["telegram_id"]
+    command = job["command"]
+    journalist = await repo.get_journalist(db, telegram_id)
+    if not journalist:
+        await repo.cancel_pipeline_job(db, job["id"])
+        await repo.mark_pipeline_job_delivered(db, job["id"])
+        return
+    send_fn = _make_send_fn(bot, int(telegram_id))
+
+    async def _run() -> None:
+        async with _user_locks.hold(telegram_id), delivery_scope(db):
+            label = "타사 체크" if command == "check" else "브리핑"
+            try:
+                result = await wait_job(db, job["id"])
+            except Exception as e:
+                logger.error("복원 작업 실패: #%d: %s", job["id"], e)
+                await send_fn(f"[{label}] 실패: {format_error_message(e)}")
+                return
+
+            if command == "check":
+                results, since, now, haiku_filtered = decode_check_result(result)
+                if results is None:
+                    await repo.update_last_check_at(db, journalist["id"], at=now)
+                    await send_fn(format_no_results())
+                    return
+                await _deliver_check_results(
+                    send_fn, db, journalist["id"], results, since, now, haiku_filtered,
+                )
+                return
+
+            payload = job["payload"]
+            if result is None:
+                await repo.update_last_report_at(db, journalist["id"])
+                await send_fn("관련 뉴스를 찾지 못했습니다.")
+                return
+            department = journalist["department"]
+            if payload["scenario_a"]:
+                await _handle_report_scenario_a(
+                    send_fn, db, journalist["id"], payload["cache_id"], department,
+                    payload["today"], result,
+                )
+            else:
+                existing_items = await repo.get_report_items_by_cache(db, payload["cache_id"])
+                await _handle_report_scenario_b(
+                    send_fn, db, journalist["id"], payload["cache_id"], department, payload["today"],
+                    existing_items, result,
+                )
+
+    await _run_coalesced(telegram_id, command, _run)
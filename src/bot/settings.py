@@ -139,14 +139,18 @@ async def schedule_entry(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     check_times = [s["time_kst"] for s in schedules if s["command"] == "check"]
     report_times = [s["time_kst"] for s in schedules if s["command"] == "report"]
 
+    batch_label = "켜짐" if journalist["batch_mode"] else "꺼짐"
+
     lines = [
         "현재 자동 실행 설정:",
         f"  check: {', '.join(check_times) if check_times else '(없음)'}",
         f"  report: {', '.join(report_times) if report_times else '(없음)'}",
+        f"  배치 모드: {batch_label}",
         "",
         "변경하려면 아래 형식으로 입력해주세요.",
         "  check 09:00 12:00 15:00 (최대 30건)",
         "  report 08:30 12:30 14:30 (최대 30건)",
+        "  batch on / batch off — 배치 모드 (전송이 늦어지는 대신 API 비용 절감)",
         "  off — 전체 해제",
         "",
         "/cancel — 취소",
@@ -183,10 +187,27 @@ async def receive_schedule(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         context.user_data.pop("_settings_journalist_id", None)
         return ConversationHandler.END
 
+    # batch on/off — 예약 실행 배치 모드
+    if args[0].lower() == "batch":
+        mode = args[1].lower() if len(args) > 1 else ""
+        if mode not in ("on", "off"):
+            await update.message.reply_text("batch on 또는 batch off로 입력해주세요.")
+            return AWAIT_SCHEDULE
+        await repo.update_batch_mode(db, journalist_id, mode == "on")
+        if mode == "on":
+            await update.message.reply_text(
+                "배치 모드가 켜졌습니다.\n"
+                "자동 실행 결과가 수 분~최대 1시간 늦게 전송되는 대신 API 비용이 절감됩니다."
+            )
+        else:
+            await update.message.reply_text("배치 모드가 꺼졌습니다.")
+        context.user_data.pop("_settings_journalist_id", None)
+        return ConversationHandler.END
+
     command = args[0].lower()
     if command not in ("check", "report"):
         await update.message.reply_text(
-            "check 또는 report로 시작해야 합니다.\n"
+            "check, report, batch 중 하나로 시작해야 합니다.\n"
             "예: check 09:00 12:00"
         )
         return AWAIT_SCHEDULE
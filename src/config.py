@@ -19,6 +19,75 @@ CHECK_MAX_WINDOW_SECONDS: int = 3 * 60 * 60
 # /report 시간 윈도우 (초) — 최근 3시간 기사 수집
 REPORT_MAX_WINDOW_SECONDS: int = 3 * 60 * 60
 
+# 부서 단위 report 공유 계산: 같은 부서·시간 구간(초)의 요청은 수집 결과를 한 번만 계산해 공유
+REPORT_SHARE_BUCKET_SECONDS: int = 5 * 60
+# 부서 공유 계산에 쓸 지정 API 키 (없으면 계산을 시작한 사용자의 키로 LLM 필터 실행)
+REPORT_SHARED_API_KEY: str = os.environ.get("REPORT_SHARED_API_KEY", "")
+# 지정 키로 부서 후보 분석까지 공유하고 사용자별로는 이력 diff만 수행 (지정 키 필요)
+REPORT_SHARED_ANALYSIS: bool = os.environ.get("REPORT_SHARED_ANALYSIS", "") == "1"
+
+# 예약 report 사전 계산: 예약 시각 N분 전부터 분산 실행해 수집을 미리 수행 (0이면 끔)
+REPORT_PREWARM_LEAD_MINUTES: int = 10
+
+# 전역 동시 파이프라인 수 (1GB RAM 서버 OOM 방지). 시작값이며 메모리 여유에 따라
+# PIPELINE_MIN_CONCURRENCY ~ PIPELINE_MAX_CONCURRENCY 사이에서 조정된다
+MAX_CONCURRENT_PIPELINES: int = 5
+PIPELINE_MIN_CONCURRENCY: int = 1
+PIPELINE_MAX_CONCURRENCY: int = 10
+# 파이프라인 입장 허용 RSS 상한(MB)과 파이프라인당 메모리 초기 추정치(MB), 샘플링 주기(초)
+PIPELINE_MEMORY_LIMIT_MB: int = int(os.environ.get("PIPELINE_MEMORY_LIMIT_MB", "700"))
+PIPELINE_MEMORY_ESTIMATE_MB: int = 80
+PIPELINE_MEMORY_SAMPLE_SECONDS: int = 5
+# /check 실행 마감(초)과 그중 분석 단계 몫으로 남겨 둘 시간(초).
+# 수집 단계가 마감에 닿으면 그때까지 모은 부분 결과로 분석한다
+CHECK_DEADLINE_SECONDS: int = 300
+CHECK_ANALYSIS_RESERVE_SECONDS: int = 120
+# 마감이 짧아도 수집 단계에 최소 이만큼(초)은 준다
+CHECK_MIN_COLLECT_SECONDS: int = 60
+# 대기 중인 파이프라인이 이 시간(초)만큼 기다릴 때마다 우선순위 한 단계 승격
+PIPELINE_AGING_SECONDS: int = 60
+
+# 예약 실행 분산: 같은 분의 예약을 이 구간(초) 안에 나눠 시작한다. 예약 시각부터 전송 완료까지
+# SLA(초) 안에 끝나도록 구간을 줄이며, 실행 시간 계측이 없을 때는 종류별 예상값(초)을 쓴다
+SCHEDULE_SPREAD_SECONDS: int = 180
+SCHEDULE_SLA_SECONDS: int = 600
+SCHEDULE_EST_RUN_SECONDS: dict[str, float] = {"check": 90.0, "report": 120.0}
+# SLA가 거의 남지 않았어도 슬롯을 얻은 파이프라인에 이만큼(초)은 준다 (check 수집 최소 + 분석 몫)
+SCHEDULE_MIN_RUN_SECONDS: int = CHECK_MIN_COLLECT_SECONDS + CHECK_ANALYSIS_RESERVE_SECONDS
+# 재시작으로 놓친 예약은 이 시간(분) 안이면 시작 시 낮은 우선순위로 따라잡아 실행한다
+SCHEDULE_CATCHUP_GRACE_MINUTES: int = 60
+
+# 파이프라인 워커 프로세스 수 (0이면 봇 프로세스 안에서 실행). 켜면 봇은 SQLite 작업 큐
+# (pipeline_jobs)에 작업을 넣고, 워커가 꺼내 실행한 결과를 받아 전송한다
+PIPELINE_WORKERS: int = int(os.environ.get("PIPELINE_WORKERS", "0"))
+# 워커 프로세스당 동시 실행 작업 수
+PIPELINE_WORKER_CONCURRENCY: int = 2
+# 작업 큐 폴링 주기(초), 워커 생존 신호 주기(초)와 끊긴 작업 회수 기준(초), 최대 시도 횟수
+JOB_POLL_SECONDS: float = 1.0
+JOB_HEARTBEAT_SECONDS: int = 10
+JOB_LEASE_SECONDS: int = 60
+JOB_MAX_ATTEMPTS: int = 2
+
+# Message Batches 실행 모드 (예약 실행 opt-in)
+# "anthropic" = Message Batches API, "local" = 로컬 대체 구현 (테스트·개발용)
+BATCH_BACKEND: str = os.environ.get("BATCH_BACKEND", "anthropic")
+BATCH_POLL_INTERVAL_SECONDS: int = 60
+# 이 시간 안에 배치가 끝나지 않으면 취소하고 동기 호출로 대체
+BATCH_MAX_WAIT_SECONDS: int = 60 * 60
+
+# 파이프라인 단계별 계측: 단계별 롤링 히스토그램 크기, 구조화 로그(JSON) 출력 여부
+METRICS_WINDOW: int = 500
+METRICS_LOG: bool = os.environ.get("METRICS_LOG", "") == "1"
+# Telegram 전송 속도 제한 (전체 초당, 채팅별 초당·순간 허용량) 및 본문 메시지 묶음 전송 여부
+TELEGRAM_GLOBAL_RATE: float = 30.0
+TELEGRAM_CHAT_RATE: float = 1.0
+TELEGRAM_CHAT_BURST: int = 10
+DELIVERY_PACK_MESSAGES: bool = os.environ.get("DELIVERY_PACK_MESSAGES", "") == "1"
+
+# /metrics HTTP 엔드포인트 (0이면 끔). 기본은 로컬에서만 접근 가능
+METRICS_PORT: int = int(os.environ.get("METRICS_PORT", "0"))
+METRICS_HOST: str = os.environ.get("METRICS_HOST", "127.0.0.1")
+
 # 캐시 보관 기간 (일)
 CACHE_RETENTION_DAYS: int = 5
 
@@ -0,0 +1,94 @@
+"""파이프라인 실행 마감 시각 전파.
+
+마감은 contextvar로 현재 작업과 그 하위 작업(gather/create_task)에 전파되므로
+검색·스크래핑·LLM 호출 함수의 시그니처를 바꾸지 않고도 각 단계가 남은 시간을 알 수 있다.
+마감이 없으면(None) 모든 함수는 기존 동작과 같다.
+
+    with deadline.scope(300):
+        with deadline.scope(180):   # 수집 단계는 분석 시간을 남기고 먼저 끝낸다
+            ...
+        ...
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+@contextmanager
+def scope(seconds: float):
+    """with 블록 동안 마감을 seconds 뒤로 둔다. 바깥 마감보다 늦출 수는 없다."""
+    new = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        new = min(new, outer)
+    token = _deadline.set(new)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def scope_until(timestamp: float | None, minimum: float = 0.0):
+    """벽시계 시각(epoch 초)까지를 마감으로 둔다. 남은 시간이 minimum보다 짧으면 minimum.
+
+    timestamp가 None이면 마감을 걸지 않는다.
+    """
+    if timestamp is None:
+        yield
+        return
+    with scope(max(timestamp - time.time(), minimum)):
+        yield
+
+
+def remaining() -> float | None:
+    """남은 시간(초). 마감이 없으면 None."""
+    d = _deadline.get()
+    if d is None:
+        return None
+    return max(d - time.monotonic(), 0.0)
+
+
+def expired() -> bool:
+    r = remaining()
+    return r is not None and r <= 0
+
+
+def request_options() -> dict:
+    """API 호출에 넘길 timeout 옵션. 마감이 없으면 빈 dict."""
+    r = remaining()
+    return {} if r is None else {"timeout": max(r, 1.0)}
+
+
+async def gather_partial(coros: list, fallbacks: list) -> list:
+    """asyncio.gather와 같지만, 마감까지 끝나지 않은 작업은 취소하고 fallback 값을 쓴다.
+
+    끝난 작업의 예외는 gather처럼 그대로 전파한다. 마감이 없으면 gather와 같다.
+    """
+    r = remaining()
+    if r is None:
+        return list(await asyncio.gather(*coros))
+    tasks = [asyncio.ensure_future(c) for c in coros]
+    if not tasks:
+        return []
+    try:
+        done, pending = await asyncio.wait(tasks, timeout=r)
+    except asyncio.CancelledError:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    if pending:
+        for t in pending:
+            t.cancel()
+        # 취소된 작업이 세마포어·연결을 반납할 때까지 기다린다
+        await asyncio.gather(*pending, return_exceptions=True)
+        logger.warning("마감 도달: %d건 중 %d건 미완료, 부분 결과 사용", len(tasks), len(pending))
+    return [t.result() if t in done else fb for t, fb in zip(tasks, fallbacks)]
@@ -0,0 +1,144 @@
+"""보고 이력 기반 로컬 중복 제거 모듈.
+
+LLM 호출 전에 이미 체크한 기사(URL 일치, 제목·핵심 팩트 고유사)를 걸러내고,
+남은 기사와 관련 있는 이력만 프롬프트에 포함하도록 선별한다.
+유사도는 한국어 제목에 맞춰 문자 bigram 집합으로 계산한다.
+"""
+
+import re
+
+# 대괄호 태그 제거 후 문자·숫자만 남겨 비교
+_TAG_RE = re.compile(r"\[[^\]]*\]")
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+# 제목 Jaccard 유사도가 이 값 이상이면 같은 기사로 간주
+DUPLICATE_TITLE_THRESHOLD = 0.7
+# 핵심 팩트 bigram이 이 비율 이상 기사 제목+설명에 포함되면 해당 팩트 일치
+_FACT_CONTAINMENT_THRESHOLD = 0.9
+# 이력 항목 bigram이 기사에 이 비율 이상 포함되어야 프롬프트에 남긴다
+RELEVANT_HISTORY_THRESHOLD = 0.3
+# 토큰 수 추정용 (한국어 위주 텍스트 기준 대략치)
+_CHARS_PER_TOKEN = 1.5
+
+
+def _bigrams(text: str) -> set[str]:
+    """태그·공백·기호를 제거한 문자 bigram 집합."""
+    norm = _NON_WORD_RE.sub("", _TAG_RE.sub("", text or "")).lower()
+    if len(norm) < 2:
+        return {norm} if norm else set()
+    return {norm[i:i + 2] for i in range(len(norm) - 1)}
+
+
+def _jaccard(a: set[str], b: set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _containment(part: set[str], whole: set[str]) -> float:
+    """part의 bigram 중 whole에 포함된 비율."""
+    if not part:
+        return 0.0
+    return len(part & whole) / len(part)
+
+
+def _facts_match(facts: list[set[str]], text: set[str]) -> bool:
+    """이력의 핵심 팩트(2개 이상)가 모두 기사 텍스트에 포함되는지 판단한다."""
+    if len(facts) < 2:
+        return False
+    return all(_containment(f, text) >= _FACT_CONTAINMENT_THRESHOLD for f in facts)
+
+
+def dedup_against_history(
+    articles: list[dict],
+    history: list[dict],
+) -> tuple[list[dict], list[tuple[dict, dict, str]]]:
+    """보고 이력과 중복되는 기사를 제거한다.
+
+    1순위: URL 일치 (article_urls에 link 또는 originallink 포함)
+    2순위: 제목 유사도 DUPLICATE_TITLE_THRESHOLD 이상
+    3순위: 이력의 핵심 팩트(key_facts)가 모두 제목+설명에 포함
+
+    Args:
+        articles: search_news 반환 형태 기사 리스트 (title, link, originallink, description)
+        history: get_recent_reported_articles 반환 형태 이력
+
+    Returns:
+        (남은 기사 리스트, [(제외 기사, 일치 이력, 사유)] 리스트)
+    """
+    if not history:
+        return articles, []
+
+    url_index: dict[str, dict] = {}
+    for h in history:
+        for url in h.get("article_urls", []):
+            url_index.setdefault(url, h)
+
+    fingerprints = [
+        (
+            h,
+            _bigrams(h.get("title", "")),
+            [_bigrams(f) for f in h.get("key_facts", []) if f],
+        )
+        for h in history
+    ]
+
+    remaining: list[dict] = []
+    dropped: list[tuple[dict, dict, str]] = []
+    for a in articles:
+        matched = url_index.get(a.get("link", "")) or url_index.get(a.get("originallink", ""))
+        if matched:
+            dropped.append((a, matched, "URL 일치"))
+            continue
+
+        title_grams = _bigrams(a.get("title", ""))
+        text_grams = title_grams | _bigrams(a.get("description", ""))
+        reason = ""
+        for h, h_title, h_facts in fingerprints:
+            if h_title and _jaccard(title_grams, h_title) >= DUPLICATE_TITLE_THRESHOLD:
+                matched, reason = h, "제목 유사"
+                break
+            if _facts_match(h_facts, text_grams):
+                matched, reason = h, "핵심 팩트 일치"
+                break
+        if matched:
+            dropped.append((a, matched, reason))
+        else:
+            remaining.append(a)
+
+    return remaining, dropped
+
+
+def title_similarity(a: str, b: str) -> float:
+    """두 제목의 bigram Jaccard 유사도."""
+    return _jaccard(_bigrams(a), _bigrams(b))
+
+
+def select_relevant_history(
+    articles: list[dict],
+    history: list[dict],
+    threshold: float = RELEVANT_HISTORY_THRESHOLD,
+) -> list[dict]:
+    """남은 기사와 관련 있는 이력 항목만 선별한다.
+
+    이력 항목의 주제·제목 bigram이 어느 한 기사(제목+본문)에
+    threshold 비율 이상 포함되면 관련 이력으로 본다. 원래 순서를 유지한다.
+    """
+    if not history or not articles:
+        return []
+
+    article_grams = [
+        _bigrams(a.get("title", "")) | _bigrams(a.get("body", "") or a.get("description", ""))
+        for a in articles
+    ]
+    relevant = []
+    for h in history:
+        h_grams = _bigrams(h.get("topic_cluster", "")) | _bigrams(h.get("title", ""))
+        if any(_containment(h_grams, grams) >= threshold for grams in article_grams):
+            relevant.append(h)
+    return relevant
+
+
+def estimate_tokens(text: str) -> int:
+    """텍스트 길이로 토큰 수를 대략 추정한다."""
+    return int(len(text) / _CHARS_PER_TOKEN)
@@ -0,0 +1,206 @@
+"""규칙 기반 사전 분류 모듈.
+
+check/report 시스템 프롬프트의 규칙 중 기계적으로 판정 가능한 것을
+LLM 호출 전에 로컬에서 적용한다. 확실한 skip만 판정하고,
+애매한 기사는 그대로 LLM에 넘긴다.
+
+- 제목 태그: [포토]/[카드뉴스] 등 분석 가치 없는 기사 → skip
+- 키워드 관련성(step_1): 제목+설명+본문에 키워드가 문자 그대로 없음 → skip
+- 오늘자 팩트(step_2): 본문에 오늘(또는 전날) "N일" 날짜 표기가 없음 → skip
+- [단독] 태그 → exclusive
+
+키워드·태그 탐색은 Aho-Corasick 오토마톤으로 한 번의 순회에 처리한다.
+"""
+
+import re
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+_KST = timezone(timedelta(hours=9))
+
+# 분석 가치 없는 기사의 제목 태그
+SKIP_TITLE_TAGS = ("[포토]", "[사진]", "[영상]", "[동영상]", "[화보]", "[카드뉴스]", "[인포그래픽]")
+EXCLUSIVE_TAG = "[단독]"
+
+# "N일" 날짜 표기. "지난 N일"은 과거 팩트, "N일간/N일째"는 기간이므로 구분한다.
+_DAY_RE = re.compile(r"(지난\s*)?(?<![\d.,])(\d{1,2})\s?일(?![간째])")
+# 스크래핑이 불완전한 짧은 본문은 날짜 규칙을 적용하지 않는다
+_MIN_BODY_CHARS = 100
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize(text: str) -> str:
+    """공백 제거 + 소문자화 ("서부 지검"과 "서부지검"을 같게 본다)."""
+    return _WHITESPACE_RE.sub("", text or "").lower()
+
+
+class _Automaton:
+    """Aho-Corasick 다중 패턴 탐색기."""
+
+    def __init__(self, patterns):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[set[str]] = [set()]
+
+        for pattern in patterns:
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(set())
+                state = nxt
+            self._out[state].add(pattern)
+
+        # BFS로 실패 링크 구성
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> set[str]:
+        """text에 등장하는 패턴 집합."""
+        found: set[str] = set()
+        state = 0
+        for ch in text:
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            if self._out[state]:
+                found |= self._out[state]
+        return found
+
+
+@lru_cache(maxsize=256)
+def _compile(keywords: tuple[str, ...]) -> tuple[_Automaton, frozenset[str]]:
+    """키워드 + 태그 오토마톤과 정규화된 키워드 집합. 키워드 조합별로 캐시한다."""
+    norm_keywords = frozenset(k for k in (_normalize(k) for k in keywords) if k)
+    patterns = set(norm_keywords) | {_normalize(t) for t in SKIP_TITLE_TAGS} | {_normalize(EXCLUSIVE_TAG)}
+    return _Automaton(sorted(patterns)), norm_keywords
+
+
+def _pub_day(article: dict) -> int | None:
+    """기사 배포일(KST)의 일(day). 알 수 없으면 None."""
+    pub_date = article.get("pubDate")
+    if hasattr(pub_date, "astimezone"):
+        return pub_date.astimezone(_KST).day
+    return None
+
+
+def title_skip_reason(title: str) -> str:
+    """제목 태그로 skip 여부를 판정한다. skip이 아니면 빈 문자열."""
+    automaton, _ = _compile(())
+    hits = automaton.find(_normalize(title))
+    for tag in SKIP_TITLE_TAGS:
+        if _normalize(tag) in hits:
+            return f"분석 대상 아닌 기사 유형 ({tag})"
+    return ""
+
+
+def is_exclusive(title: str) -> bool:
+    """제목에 [단독] 태그가 있는지 판정한다."""
+    return _normalize(EXCLUSIVE_TAG) in _normalize(title)
+
+
+def _has_today_marker(body: str, days: set[int]) -> bool:
+    """본문에 허용 날짜의 "N일" 표기가 있는지 ("지난 N일" 제외)."""
+    for m in _DAY_RE.finditer(body):
+        if m.group(1):
+            continue
+        if int(m.group(2)) in days:
+            return True
+    return False
+
+
+def body_skip_reason(
+    article: dict,
+    body: str,
+    keywords: list[str] | None = None,
+    now: datetime | None = None,
+) -> str:
+    """본문 수집 후 키워드·날짜 규칙으로 skip 여부를 판정한다. skip이 아니면 빈 문자열.
+
+    본문이 비었거나 짧으면(스크래핑 실패) 판정하지 않는다.
+
+    Args:
+        article: search_news 반환 형태 기사 (title, description, pubDate)
+        body: 수집된 본문
+        keywords: 취재 키워드. None이면 키워드 규칙을 적용하지 않는다 (report).
+        now: 기준 시각 (기본: 현재)
+    """
+    if len(body or "") < _MIN_BODY_CHARS:
+        return ""
+
+    automaton, norm_keywords = _compile(tuple(keywords or ()))
+    if norm_keywords:
+        text = _normalize(f"{article.get('title', '')} {article.get('description', '')} {body}")
+        if not automaton.find(text) & norm_keywords:
+            return "키워드 미포함"
+
+    # 오늘·전날(외신 인용 허용) + 배포일 (자정 전후 기사)
+    today = (now or datetime.now(_KST)).astimezone(_KST)
+    days = {today.day, (today - timedelta(days=1)).day}
+    pub_day = _pub_day(article)
+    if pub_day is not None:
+        days.add(pub_day)
+    if not _has_today_marker(body, days):
+        return "본문에 오늘자 날짜 표기 없음"
+
+    return ""
+
+
+def split_by_title_rules(articles: list[dict]) -> tuple[list[dict], list[tuple[dict, str]]]:
+    """제목 규칙으로 확실한 skip을 분리한다.
+
+    Returns:
+        (남은 기사 리스트, [(skip 기사, 사유)] 리스트)
+    """
+    remaining: list[dict] = []
+    skipped: list[tuple[dict, str]] = []
+    for a in articles:
+        reason = title_skip_reason(a.get("title", ""))
+        if reason:
+            skipped.append((a, reason))
+        else:
+            remaining.append(a)
+    return remaining, skipped
+
+
+def split_by_body_rules(
+    articles: list[dict],
+    bodies: dict[str, str],
+    keywords: list[str] | None = None,
+    now: datetime | None = None,
+) -> tuple[list[dict], list[tuple[dict, str]]]:
+    """본문 규칙으로 확실한 skip을 분리한다.
+
+    Args:
+        articles: search_news 반환 형태 기사 리스트
+        bodies: fetch_articles_batch 반환 {link: 본문}
+        keywords: 취재 키워드 (None이면 키워드 규칙 생략)
+        now: 기준 시각
+
+    Returns:
+        (남은 기사 리스트, [(skip 기사, 사유)] 리스트)
+    """
+    remaining: list[dict] = []
+    skipped: list[tuple[dict, str]] = []
+    for a in articles:
+        reason = body_skip_reason(a, bodies.get(a.get("link", ""), "") or "", keywords, now)
+        if reason:
+            skipped.append((a, reason))
+        else:
+            remaining.append(a)
+    return remaining, skipped
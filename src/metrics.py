@@ -0,0 +1,332 @@
+"""파이프라인 단계별 계측 + Prometheus 형식 내보내기.
+
+/check, /report 파이프라인의 단계(검색, 언론사 필터, 제목 필터, LLM 필터, 본문 수집,
+이력 로드, 분석, 매핑, DB 저장, 텔레그램 전송)마다 소요 시간, 입력·출력 건수,
+바이트·토큰 수를 기록한다. 단계별 최근 METRICS_WINDOW건을 롤링 히스토그램으로
+유지해 관리자 /stats에 표시하고, METRICS_LOG=1이면 구조화 로그(JSON)로도 남긴다.
+
+METRICS_PORT가 설정되면 post_init에서 /metrics HTTP 엔드포인트를 열어
+단계 지연 히스토그램, 카운터(외부 API 상태 코드, 캐시 적중), 게이지(세마포어 점유·대기,
+이벤트 루프 지연, RSS)를 Prometheus 텍스트 형식으로 내보낸다.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import resource
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from src.config import METRICS_WINDOW, METRICS_LOG
+
+logger = logging.getLogger(__name__)
+
+# (pipeline, stage) → 최근 기록 deque
+_samples: dict[tuple[str, str], deque] = {}
+
+# Prometheus 누적 히스토그램 버킷 (초)
+_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+# (pipeline, stage, status) → {"buckets": [...], "sum": float, "count": int}
+_histograms: dict[tuple[str, str], dict] = {}
+# (metric 이름, 정렬된 label 튜플) → 누적값
+_counters: dict[tuple[str, tuple], float] = {}
+# metric 이름 → (설명, 값 함수)
+_gauges: dict[str, tuple[str, callable]] = {}
+_COUNTER_HELP = {
+    "tasa_http_responses_total": "외부 API 응답 수 (service, status별)",
+    "tasa_cache_requests_total": "캐시 조회 수 (cache, result=hit|miss별)",
+}
+
+# 이벤트 루프 지연 측정 주기 (초)
+_LOOP_LAG_INTERVAL = 1.0
+_loop_lag = {"last": 0.0, "max": 0.0}
+_lag_task: asyncio.Task | None = None
+_server: asyncio.AbstractServer | None = None
+
+
+def record(
+    pipeline: str,
+    stage: str,
+    duration: float,
+    items_in: int | None = None,
+    items_out: int | None = None,
+    nbytes: int | None = None,
+    tokens: int | None = None,
+    status: str = "ok",
+) -> None:
+    """단계 실행 1건을 기록한다. status는 ok / error / timeout / cancelled."""
+    sample = {
+        "duration": duration,
+        "in": items_in,
+        "out": items_out,
+        "bytes": nbytes,
+        "tokens": tokens,
+        "status": status,
+    }
+    _samples.setdefault((pipeline, stage), deque(maxlen=METRICS_WINDOW)).append(sample)
+
+    hist = _histograms.setdefault(
+        (pipeline, stage, status), {"buckets": [0] * len(_LATENCY_BUCKETS), "sum": 0.0, "count": 0},
+    )
+    for i, bound in enumerate(_LATENCY_BUCKETS):
+        if duration <= bound:
+            hist["buckets"][i] += 1
+    hist["sum"] += duration
+    hist["count"] += 1
+
+    if METRICS_LOG:
+        logger.info(json.dumps(
+            {"event": "stage", "pipeline": pipeline, "stage": stage,
+             **{k: v for k, v in sample.items() if v is not None}},
+            ensure_ascii=False,
+        ))
+
+
+@contextmanager
+def stage(pipeline: str, name: str, items_in: int | None = None):
+    """with 블록의 소요 시간을 재서 기록한다.
+
+    블록 안에서 반환된 dict에 out/bytes/tokens를 채우면 함께 기록된다.
+    예외로 끝난 단계도 그때까지의 소요 시간을 status(error / timeout / cancelled)와 함께 기록한다.
+
+        with metrics.stage("check", "search") as st:
+            raw = await search_news(...)
+            st["out"] = len(raw)
+    """
+    st = {"in": items_in, "out": None, "bytes": None, "tokens": None}
+    started = time.monotonic()
+    status = "ok"
+    try:
+        yield st
+    except asyncio.CancelledError:
+        status = "cancelled"
+        raise
+    except BaseException as e:
+        # httpx·anthropic의 타임아웃 예외는 TimeoutError를 상속하지 않는다
+        status = "timeout" if isinstance(e, TimeoutError) or "Timeout" in type(e).__name__ else "error"
+        raise
+    finally:
+        record(
+            pipeline, name, time.monotonic() - started,
+            items_in=st["in"], items_out=st["out"], nbytes=st["bytes"], tokens=st["tokens"],
+            status=status,
+        )
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(int(q * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[idx]
+
+
+def _mean(values: list) -> float | None:
+    values = [v for v in values if v is not None]
+    return sum(values) / len(values) if values else None
+
+
+def summary() -> dict[tuple[str, str], dict]:
+    """단계별 요약 통계 (건수, 실패 건수, p50/p90/p99/최대 소요, 평균 입출력·바이트·토큰).
+
+    소요 통계는 실패한 실행도 포함한다 (시간 한도에 걸린 실행도 그만큼 슬롯을 점유했다).
+    """
+    result = {}
+    for key, samples in _samples.items():
+        durations = sorted(s["duration"] for s in samples)
+        result[key] = {
+            "count": len(durations),
+            "errors": sum(1 for s in samples if s["status"] != "ok"),
+            "p50": _percentile(durations, 0.5),
+            "p90": _percentile(durations, 0.9),
+            "p99": _percentile(durations, 0.99),
+            "max": durations[-1] if durations else 0.0,
+            "avg_in": _mean([s["in"] for s in samples]),
+            "avg_out": _mean([s["out"] for s in samples]),
+            "avg_bytes": _mean([s["bytes"] for s in samples]),
+            "avg_tokens": _mean([s["tokens"] for s in samples]),
+        }
+    return result
+
+
+def inc(name: str, value: float = 1, **labels: str) -> None:
+    """카운터를 증가시킨다."""
+    key = (name, tuple(sorted(labels.items())))
+    _counters[key] = _counters.get(key, 0) + value
+
+
+def cache_lookup(cache: str, hit: bool) -> None:
+    """캐시 조회 결과를 기록한다 (적중률 = hit / (hit + miss))."""
+    inc("tasa_cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+
+def register_gauge(name: str, help_text: str, fn) -> None:
+    """스크레이프 시점에 fn()으로 값을 읽는 게이지를 등록한다."""
+    _gauges[name] = (help_text, fn)
+
+
+class TrackedSemaphore:
+    """점유 수와 대기 수를 직접 세는 asyncio.Semaphore 래퍼 (게이지용).
+
+    asyncio.Semaphore의 내부 속성(_value, _waiters)에 기대지 않도록
+    잡기 전에 대기 수를 늘리고, 잡은 뒤·취소 시 줄인다.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.in_use = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(capacity)
+
+    async def __aenter__(self):
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_use += 1
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.in_use -= 1
+        self._semaphore.release()
+
+
+def register_semaphore(name: str, semaphore: TrackedSemaphore) -> None:
+    """세마포어 점유 수와 대기 수를 게이지로 등록한다."""
+    register_gauge(
+        f"tasa_{name}_in_use", f"{name} 점유 수 (최대 {semaphore.capacity})",
+        lambda: semaphore.in_use,
+    )
+    register_gauge(
+        f"tasa_{name}_waiting", f"{name} 대기 중인 작업 수",
+        lambda: semaphore.waiting,
+    )
+
+
+def http_response_hook(service: str):
+    """httpx 응답 이벤트 훅. 서비스·상태 코드별 호출 수를 센다."""
+    async def _hook(response) -> None:
+        inc("tasa_http_responses_total", service=service, status=str(response.status_code))
+    return _hook
+
+
+def rss_bytes() -> int:
+    """현재 프로세스 RSS (바이트). /proc이 없으면 최대 RSS로 대체한다."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{v}"' for k, v in labels)
+    return "{" + inner + "}"
+
+
+def render_prometheus() -> str:
+    """모든 지표를 Prometheus 텍스트 형식(0.0.4)으로 만든다."""
+    lines = [
+        "# HELP tasa_stage_duration_seconds 파이프라인 단계 소요 시간",
+        "# TYPE tasa_stage_duration_seconds histogram",
+    ]
+    for (pipeline, stage_name, status), hist in sorted(_histograms.items()):
+        base = (("pipeline", pipeline), ("stage", stage_name), ("status", status))
+        for bound, count in zip(_LATENCY_BUCKETS, hist["buckets"]):
+            labels = _format_labels(base + (("le", str(bound)),))
+            lines.append(f"tasa_stage_duration_seconds_bucket{labels} {count}")
+        labels = _format_labels(base + (("le", "+Inf"),))
+        lines.append(f"tasa_stage_duration_seconds_bucket{labels} {hist['count']}")
+        lines.append(f"tasa_stage_duration_seconds_sum{_format_labels(base)} {hist['sum']:.6f}")
+        lines.append(f"tasa_stage_duration_seconds_count{_format_labels(base)} {hist['count']}")
+
+    for name in sorted({n for n, _ in _counters}):
+        lines.append(f"# HELP {name} {_COUNTER_HELP.get(name, name)}")
+        lines.append(f"# TYPE {name} counter")
+        for (n, labels), value in sorted(_counters.items()):
+            if n == name:
+                lines.append(f"{name}{_format_labels(labels)} {value:g}")
+
+    gauges = {
+        "tasa_event_loop_lag_seconds": ("이벤트 루프 지연 (최근 측정)", lambda: _loop_lag["last"]),
+        "tasa_event_loop_lag_max_seconds": ("이벤트 루프 지연 (최대)", lambda: _loop_lag["max"]),
+        "tasa_process_rss_bytes": ("프로세스 RSS", rss_bytes),
+        **_gauges,
+    }
+    for name, (help_text, fn) in sorted(gauges.items()):
+        try:
+            value = fn()
+        except Exception:
+            logger.warning("게이지 조회 실패: %s", name, exc_info=True)
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value:g}")
+
+    return "\n".join(lines) + "\n"
+
+
+async def _monitor_loop_lag() -> None:
+    """주기적으로 sleep 초과 시간을 재서 이벤트 루프 지연을 기록한다."""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(_LOOP_LAG_INTERVAL)
+        lag = max(loop.time() - started - _LOOP_LAG_INTERVAL, 0.0)
+        _loop_lag["last"] = lag
+        _loop_lag["max"] = max(_loop_lag["max"], lag)
+
+
+async def _handle_http(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """GET /metrics만 처리하는 최소 HTTP 핸들러."""
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), timeout=5.0)
+        # 헤더는 읽고 버린다
+        while (await asyncio.wait_for(reader.readline(), timeout=5.0)) not in (b"\r\n", b"\n", b""):
+            pass
+        parts = request_line.decode("latin-1").split()
+        if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+            status, body = "200 OK", render_prometheus().encode()
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            status, body, content_type = "404 Not Found", b"not found\n", "text/plain"
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(host: str, port: int) -> None:
+    """/metrics 엔드포인트와 이벤트 루프 지연 측정을 시작한다."""
+    global _server, _lag_task
+    _server = await asyncio.start_server(_handle_http, host, port)
+    _lag_task = asyncio.create_task(_monitor_loop_lag())
+    logger.info("메트릭 엔드포인트 시작: http://%s:%d/metrics", host, port)
+
+
+async def stop_server() -> None:
+    """메트릭 엔드포인트를 닫는다. 앱 종료 시 호출."""
+    global _server, _lag_task
+    if _lag_task is not None:
+        _lag_task.cancel()
+        _lag_task = None
+    if _server is not None:
+        _server.close()
+        await _server.wait_closed()
+        _server = None
+
+
+def reset() -> None:
+    """기록을 모두 지운다 (테스트용)."""
+    _samples.clear()
+    _histograms.clear()
+    _counters.clear()
@@ -9,6 +9,7 @@ CREATE TABLE IF NOT EXISTS journalists (
     api_key TEXT NOT NULL,           -- Fernet 암호화된 값
     last_check_at DATETIME,
     last_report_at DATETIME,
+    batch_mode INTEGER DEFAULT 0,    -- 예약 실행 Message Batches 모드 (0/1)
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -16,6 +17,7 @@ CREATE TABLE IF NOT EXISTS report_cache (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     journalist_id INTEGER NOT NULL REFERENCES journalists(id),
     date DATE NOT NULL,
+    processed_links TEXT DEFAULT '[]', -- 분석에 보낸 기사 link JSON 배열 (시나리오 B 델타용)
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     UNIQUE(journalist_id, date)
 );
@@ -44,6 +46,7 @@ CREATE TABLE IF NOT EXISTS reported_articles (
     journalist_id INTEGER NOT NULL REFERENCES journalists(id),
     checked_at DATETIME NOT NULL,
     topic_cluster TEXT NOT NULL,
+    title TEXT DEFAULT '',           -- 원본 기사 제목 (로컬 중복 제거용)
     key_facts TEXT NOT NULL,         -- JSON 배열
     summary TEXT NOT NULL,
     article_urls TEXT NOT NULL,      -- JSON 배열
@@ -58,29 +61,159 @@ CREATE TABLE IF NOT EXISTS schedules (
     time_kst TEXT NOT NULL,          -- "HH:MM" 형식
     UNIQUE(journalist_id, command, time_kst)
 );
+
+CREATE TABLE IF NOT EXISTS schedule_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    journalist_id INTEGER NOT NULL REFERENCES journalists(id),
+    command TEXT NOT NULL,           -- "check" / "report"
+    run_date DATE NOT NULL,          -- 예약 실행일 (KST)
+    time_kst TEXT NOT NULL,          -- "HH:MM"
+    status TEXT NOT NULL,            -- dispatched / running / done / failed
+    catch_up INTEGER DEFAULT 0,      -- 재시작 후 따라잡기 실행 여부 (0/1)
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(journalist_id, command, run_date, time_kst)
+);
+
+CREATE TABLE IF NOT EXISTS pipeline_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    journalist_id INTEGER NOT NULL REFERENCES journalists(id),
+    telegram_id TEXT NOT NULL,
+    command TEXT NOT NULL,           -- "check" / "report"
+    priority INTEGER NOT NULL,       -- admission.PRIORITY_* (작을수록 먼저)
+    payload TEXT DEFAULT '{}',       -- 실행 인자 JSON
+    status TEXT NOT NULL DEFAULT 'queued', -- queued / running / done / failed / cancelled
+    worker TEXT,                     -- 실행 중인 워커 이름
+    attempts INTEGER DEFAULT 0,
+    result TEXT,                     -- 실행 결과 JSON
+    error TEXT,                      -- 사용자에게 보일 실패 메시지
+    delivered INTEGER DEFAULT 0,     -- 봇이 결과를 가져갔는지 (0/1)
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    heartbeat_at DATETIME,
+    finished_at DATETIME
+);
+CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_status ON pipeline_jobs(status, priority, id);
+
+CREATE TABLE IF NOT EXISTS pending_batches (
+    batch_id TEXT PRIMARY KEY,       -- Message Batches ID
+    journalist_id INTEGER NOT NULL REFERENCES journalists(id),
+    chat_id INTEGER NOT NULL,
+    command TEXT NOT NULL,           -- "check" / "report"
+    state TEXT NOT NULL,             -- 결과 처리에 필요한 수집 상태 JSON
+    submitted_at DATETIME NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS dispatcher_ticks (
+    name TEXT PRIMARY KEY,           -- 디스패처 job 이름 ("schedule_dispatch")
+    ticked_at DATETIME NOT NULL      -- 마지막으로 처리를 마친 틱 시각 (UTC ISO)
+);
+
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,     -- 적용된 MIGRATIONS 버전
+    applied_at DATETIME NOT NULL
+);
+"""
+
+# 조회·정리 쿼리용 인덱스. schedules(journalist_id)는 UNIQUE(journalist_id, ...) 인덱스가 맡는다
+INDEX_DDL = """
+CREATE INDEX IF NOT EXISTS idx_reported_articles_journalist
+    ON reported_articles(journalist_id, checked_at);
+CREATE INDEX IF NOT EXISTS idx_reported_articles_checked ON reported_articles(checked_at);
+CREATE INDEX IF NOT EXISTS idx_report_items_cache ON report_items(report_cache_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_report_cache_date ON report_cache(date);
 """
 
+# WAL: 읽기가 쓰기를 막지 않고 커밋마다 fsync하지 않는다 (synchronous=NORMAL은 WAL에서
+# 전원 장애 시 마지막 커밋 일부만 잃을 수 있고 DB 손상은 없다). 캐시 8MB, mmap 64MB는 1GB 서버 기준
+PRAGMAS = [
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -8000",
+    "PRAGMA mmap_size = 67108864",
+    "PRAGMA busy_timeout = 5000",
+]
+
+
+# --- 스키마 버전 관리 ---
+#
+# DDL은 항상 최신 스키마로 테이블을 만든다. MIGRATIONS는 예전 스키마로 만들어진 DB를 최신으로
+# 올리는 단계들로, schema_version에 기록된 버전보다 높은 것만 순서대로 한 번씩 실행한다.
+# 새 DB에서도 한 번은 실행되므로 각 단계는 여러 번 실행해도 결과가 같아야 한다.
+
+async def _columns(db: aiosqlite.Connection, table: str) -> set[str]:
+    cursor = await db.execute(f"PRAGMA table_info({table})")
+    return {r["name"] for r in await cursor.fetchall()}
+
+
+async def _add_column(db: aiosqlite.Connection, table: str, column: str, decl: str) -> None:
+    """컬럼이 없을 때만 추가한다."""
+    if column not in await _columns(db, table):
+        await db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+async def _migrate_v1(db: aiosqlite.Connection) -> None:
+    """초기 배포 이후 추가된 컬럼들."""
+    for table, column, decl in [
+        ("reported_articles", "reason", "TEXT DEFAULT ''"),
+        ("report_items", "reason", "TEXT DEFAULT ''"),
+        ("report_items", "exclusive", "INTEGER DEFAULT 0"),
+        ("report_items", "publisher", "TEXT DEFAULT ''"),
+        ("report_items", "pub_time", "TEXT DEFAULT ''"),
+        ("report_items", "key_facts", "TEXT DEFAULT '[]'"),
+        ("journalists", "last_report_at", "DATETIME"),
+        ("report_items", "source_count", "INTEGER DEFAULT 1"),
+        ("reported_articles", "title", "TEXT DEFAULT ''"),
+        ("journalists", "batch_mode", "INTEGER DEFAULT 0"),
+        ("report_cache", "processed_links", "TEXT DEFAULT '[]'"),
+    ]:
+        await _add_column(db, table, column, decl)
+
+
+async def _migrate_v2(db: aiosqlite.Connection) -> None:
+    """이력 조회·정리용 인덱스."""
+    await db.executescript(INDEX_DDL)
+
+
+MIGRATIONS = [
+    (1, _migrate_v1),
+    (2, _migrate_v2),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+async def get_schema_version(db: aiosqlite.Connection) -> int:
+    cursor = await db.execute("SELECT MAX(version) FROM schema_version")
+    row = await cursor.fetchone()
+    return row[0] or 0
+
+
+async def migrate(db: aiosqlite.Connection) -> list[int]:
+    """아직 적용되지 않은 마이그레이션을 순서대로 실행하고 적용한 버전 목록을 반환한다."""
+    current = await get_schema_version(db)
+    applied = []
+    for version, step in MIGRATIONS:
+        if version <= current:
+            continue
+        await step(db)
+        await db.execute(
+            "INSERT INTO schema_version (version, applied_at) VALUES (?, CURRENT_TIMESTAMP)",
+            (version,),
+        )
+        await db.commit()
+        applied.append(version)
+    if applied:
+        # 인덱스가 새로 생겼으면 통계를 갱신한다 (변경 없는 테이블은 건너뛰므로 가벼움)
+        await db.execute("PRAGMA optimize")
+        await db.commit()
+    return applied
+
 
 async def init_db(db_path: str) -> aiosqlite.Connection:
     """DB 연결을 열고 스키마를 초기화한다."""
     db = await aiosqlite.connect(db_path)
     db.row_factory = aiosqlite.Row
+    for pragma in PRAGMAS:
+        await db.execute(pragma)
     await db.executescript(DDL)
-    # 기존 DB 마이그레이션
-    _migrations = [
-        "ALTER TABLE reported_articles ADD COLUMN reason TEXT DEFAULT ''",
-        "ALTER TABLE report_items ADD COLUMN reason TEXT DEFAULT ''",
-        "ALTER TABLE report_items ADD COLUMN exclusive INTEGER DEFAULT 0",
-        "ALTER TABLE report_items ADD COLUMN publisher TEXT DEFAULT ''",
-        "ALTER TABLE report_items ADD COLUMN pub_time TEXT DEFAULT ''",
-        "ALTER TABLE report_items ADD COLUMN key_facts TEXT DEFAULT '[]'",
-        "ALTER TABLE journalists ADD COLUMN last_report_at DATETIME",
-        "ALTER TABLE report_items ADD COLUMN source_count INTEGER DEFAULT 1",
-    ]
-    for sql in _migrations:
-        try:
-            await db.execute(sql)
-        except Exception:
-            pass  # 이미 존재하면 무시
-    await db.commit()
+    await migrate(db)
     return db
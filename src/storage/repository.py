@@ -1,4 +1,8 @@
+import asyncio
 import json
+import weakref
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import UTC, datetime, timedelta, timezone
 
 _KST = timezone(timedelta(hours=9))
@@ -10,6 +14,45 @@ from src.config import FERNET_KEY, CACHE_RETENTION_DAYS
 
 _fernet = Fernet(FERNET_KEY.encode())
 
+# unit_of_work 블록 안이면 (연결, 블록을 연 태스크). 같은 태스크의 쓰기만 블록의 트랜잭션에
+# 합류한다 (블록 안에서 만든 태스크는 컨텍스트를 물려받지만 잠금을 기다린다)
+_unit_of_work: ContextVar[tuple | None] = ContextVar("unit_of_work", default=None)
+# 연결별 쓰기 잠금. 봇 전체가 연결 하나를 공유하므로, 한 트랜잭션이 열려 있는 동안 다른
+# 코루틴의 쓰기·커밋·롤백이 끼어들면 남의 미완료 쓰기를 커밋하거나 되돌리게 된다
+_write_locks: "weakref.WeakKeyDictionary[aiosqlite.Connection, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+
+def _write_lock(db: aiosqlite.Connection) -> asyncio.Lock:
+    lock = _write_locks.get(db)
+    if lock is None:
+        lock = _write_locks[db] = asyncio.Lock()
+    return lock
+
+
+@asynccontextmanager
+async def unit_of_work(db: aiosqlite.Connection):
+    """블록 안의 쓰기를 한 트랜잭션으로 묶는다. 예외가 나면 전부 되돌린다.
+
+    블록 동안 연결의 쓰기 잠금을 잡으므로 다른 코루틴의 쓰기는 커밋 뒤로 밀린다.
+    블록 안에서는 DB 작업만 하고 네트워크 대기는 하지 않는다. 중첩되면 바깥 블록이 커밋한다.
+    repository의 모든 쓰기 함수가 이 블록 안에서 실행된다.
+    """
+    owner = (db, asyncio.current_task())
+    if _unit_of_work.get() == owner:
+        yield
+        return
+    async with _write_lock(db):
+        token = _unit_of_work.set(owner)
+        try:
+            yield
+        except BaseException:
+            await db.rollback()
+            raise
+        else:
+            await db.commit()
+        finally:
+            _unit_of_work.reset(token)
+
 
 def encrypt_api_key(plain: str) -> str:
     return _fernet.encrypt(plain.encode()).decode()
@@ -31,20 +74,20 @@ async def upsert_journalist(
     """프로필 등록 또는 갱신. journalist id를 반환한다."""
     encrypted_key = encrypt_api_key(api_key)
     keywords_json = json.dumps(keywords, ensure_ascii=False)
-    await db.execute(
-        """
-        INSERT INTO journalists (telegram_id, department, keywords, api_key)
-        VALUES (?, ?, ?, ?)
-        ON CONFLICT(telegram_id) DO UPDATE SET
-            department = excluded.department,
-            keywords = excluded.keywords,
-            api_key = excluded.api_key,
-            last_check_at = NULL,
-            last_report_at = NULL
-        """,
-        (telegram_id, department, keywords_json, encrypted_key),
-    )
-    await db.commit()
+    async with unit_of_work(db):
+        await db.execute(
+            """
+            INSERT INTO journalists (telegram_id, department, keywords, api_key)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(telegram_id) DO UPDATE SET
+                department = excluded.department,
+                keywords = excluded.keywords,
+                api_key = excluded.api_key,
+                last_check_at = NULL,
+                last_report_at = NULL
+            """,
+            (telegram_id, department, keywords_json, encrypted_key),
+        )
     cursor = await db.execute(
         "SELECT id FROM journalists WHERE telegram_id = ?", (telegram_id,)
     )
@@ -67,79 +110,104 @@ async def get_journalist(db: aiosqlite.Connection, telegram_id: str) -> dict | N
         "keywords": json.loads(row["keywords"]),
         "api_key": decrypt_api_key(row["api_key"]),
         "last_check_at": row["last_check_at"],
-        "last_report_at": row["last_report_at"] if "last_report_at" in row.keys() else None,
+        "last_report_at": row["last_report_at"],
+        "batch_mode": bool(row["batch_mode"]),
         "created_at": row["created_at"],
     }
 
 
+async def get_departments(db: aiosqlite.Connection, journalist_ids: list[int]) -> dict[int, str]:
+    """journalist_id → 부서 매핑. 예약 분산 시 같은 부서 report를 묶는 데 쓴다."""
+    if not journalist_ids:
+        return {}
+    marks = ",".join("?" * len(journalist_ids))
+    cursor = await db.execute(
+        f"SELECT id, department FROM journalists WHERE id IN ({marks})", tuple(journalist_ids),
+    )
+    return {r["id"]: r["department"] for r in await cursor.fetchall()}
+
+
 async def clear_journalist_data(db: aiosqlite.Connection, journalist_id: int) -> None:
     """기자의 report/check 데이터를 삭제한다. 스케줄은 유지."""
-    await db.execute(
-        """
-        DELETE FROM report_items WHERE report_cache_id IN (
-            SELECT id FROM report_cache WHERE journalist_id = ?
+    async with unit_of_work(db):
+        await db.execute(
+            """
+            DELETE FROM report_items WHERE report_cache_id IN (
+                SELECT id FROM report_cache WHERE journalist_id = ?
+            )
+            """,
+            (journalist_id,),
         )
-        """,
-        (journalist_id,),
-    )
-    await db.execute("DELETE FROM report_cache WHERE journalist_id = ?", (journalist_id,))
-    await db.execute("DELETE FROM reported_articles WHERE journalist_id = ?", (journalist_id,))
-    await db.commit()
+        await db.execute("DELETE FROM report_cache WHERE journalist_id = ?", (journalist_id,))
+        await db.execute("DELETE FROM reported_articles WHERE journalist_id = ?", (journalist_id,))
 
 
 async def update_api_key(db: aiosqlite.Connection, telegram_id: str, api_key: str) -> None:
     """API 키만 변경한다."""
     encrypted_key = encrypt_api_key(api_key)
-    await db.execute(
-        "UPDATE journalists SET api_key = ? WHERE telegram_id = ?",
-        (encrypted_key, telegram_id),
-    )
-    await db.commit()
+    async with unit_of_work(db):
+        await db.execute(
+            "UPDATE journalists SET api_key = ? WHERE telegram_id = ?",
+            (encrypted_key, telegram_id),
+        )
 
 
 async def update_keywords(db: aiosqlite.Connection, telegram_id: str, keywords: list[str]) -> None:
     """키워드를 변경하고 last_check_at/last_report_at을 초기화한다."""
     keywords_json = json.dumps(keywords, ensure_ascii=False)
-    await db.execute(
-        "UPDATE journalists SET keywords = ?, last_check_at = NULL, last_report_at = NULL WHERE telegram_id = ?",
-        (keywords_json, telegram_id),
-    )
-    await db.commit()
+    async with unit_of_work(db):
+        await db.execute(
+            "UPDATE journalists SET keywords = ?, last_check_at = NULL, last_report_at = NULL WHERE telegram_id = ?",
+            (keywords_json, telegram_id),
+        )
 
 
 async def clear_check_data(db: aiosqlite.Connection, journalist_id: int) -> None:
     """check 이력(reported_articles)만 삭제한다. report 이력은 유지."""
-    await db.execute("DELETE FROM reported_articles WHERE journalist_id = ?", (journalist_id,))
-    await db.commit()
+    async with unit_of_work(db):
+        await db.execute("DELETE FROM reported_articles WHERE journalist_id = ?", (journalist_id,))
 
 
 async def update_department(db: aiosqlite.Connection, telegram_id: str, department: str) -> None:
     """부서를 변경하고 last_check_at/last_report_at을 초기화한다."""
-    await db.execute(
-        "UPDATE journalists SET department = ?, last_check_at = NULL, last_report_at = NULL WHERE telegram_id = ?",
-        (department, telegram_id),
-    )
-    await db.commit()
+    async with unit_of_work(db):
+        await db.execute(
+            "UPDATE journalists SET department = ?, last_check_at = NULL, last_report_at = NULL WHERE telegram_id = ?",
+            (department, telegram_id),
+        )
 
 
-async def update_last_check_at(db: aiosqlite.Connection, journalist_id: int) -> None:
-    """마지막 /check 시각을 현재로 갱신한다."""
-    now = datetime.now(UTC).isoformat()
-    await db.execute(
-        "UPDATE journalists SET last_check_at = ? WHERE id = ?",
-        (now, journalist_id),
-    )
-    await db.commit()
+async def update_last_check_at(
+    db: aiosqlite.Connection, journalist_id: int, at: datetime | None = None,
+) -> None:
+    """마지막 /check 시각을 갱신한다. at이 없으면 현재 시각."""
+    now = (at or datetime.now(UTC)).astimezone(UTC).isoformat()
+    async with unit_of_work(db):
+        await db.execute(
+            "UPDATE journalists SET last_check_at = ? WHERE id = ?",
+            (now, journalist_id),
+        )
 
 
-async def update_last_report_at(db: aiosqlite.Connection, journalist_id: int) -> None:
-    """마지막 /report 시각을 현재로 갱신한다."""
-    now = datetime.now(UTC).isoformat()
-    await db.execute(
-        "UPDATE journalists SET last_report_at = ? WHERE id = ?",
-        (now, journalist_id),
-    )
-    await db.commit()
+async def update_last_report_at(
+    db: aiosqlite.Connection, journalist_id: int, at: datetime | None = None,
+) -> None:
+    """마지막 /report 시각을 갱신한다. at이 없으면 현재 시각."""
+    now = (at or datetime.now(UTC)).astimezone(UTC).isoformat()
+    async with unit_of_work(db):
+        await db.execute(
+            "UPDATE journalists SET last_report_at = ? WHERE id = ?",
+            (now, journalist_id),
+        )
+
+
+async def update_batch_mode(db: aiosqlite.Connection, journalist_id: int, enabled: bool) -> None:
+    """예약 실행의 Message Batches 모드 사용 여부를 변경한다."""
+    async with unit_of_work(db):
+        await db.execute(
+            "UPDATE journalists SET batch_mode = ? WHERE id = ?",
+            (int(enabled), journalist_id),
+        )
 
 
 # --- reported_articles ---
@@ -151,29 +219,31 @@ async def save_reported_articles(
 ) -> None:
     """Claude가 분석한 기사들을 저장한다 (skip 포함).
 
-    articles 각 항목: {topic_cluster, key_facts, summary, url, category, reason}
+    articles 각 항목: {topic_cluster, title, key_facts, summary, url, category, reason}
     """
     now = datetime.now(UTC).isoformat()
-    for article in articles:
-        url = article.get("url", "")
-        await db.execute(
+    async with unit_of_work(db):
+        await db.executemany(
             """
             INSERT INTO reported_articles
-                (journalist_id, checked_at, topic_cluster, key_facts, summary, article_urls, category, reason)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                (journalist_id, checked_at, topic_cluster, title, key_facts, summary, article_urls, category, reason)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            (
-                journalist_id,
-                now,
-                article.get("topic_cluster", ""),
-                json.dumps(article.get("key_facts", []), ensure_ascii=False),
-                article.get("summary", ""),
-                json.dumps([url] if url else [], ensure_ascii=False),
-                article["category"],
-                article.get("reason", ""),
-            ),
+            [
+                (
+                    journalist_id,
+                    now,
+                    article.get("topic_cluster", ""),
+                    article.get("title", ""),
+                    json.dumps(article.get("key_facts", []), ensure_ascii=False),
+                    article.get("summary", ""),
+                    json.dumps([article["url"]] if article.get("url") else [], ensure_ascii=False),
+                    article["category"],
+                    article.get("reason", ""),
+                )
+                for article in articles
+            ],
         )
-    await db.commit()
 
 
 async def get_recent_reported_articles(
@@ -197,11 +267,12 @@ async def get_recent_reported_articles(
             "id": r["id"],
             "checked_at": r["checked_at"],
             "topic_cluster": r["topic_cluster"],
+            "title": r["title"],
             "key_facts": json.loads(r["key_facts"]),
             "summary": r["summary"],
             "article_urls": json.loads(r["article_urls"]),
             "category": r["category"],
-            "reason": r["reason"] if "reason" in r.keys() else "",
+            "reason": r["reason"],
         }
         for r in rows
     ]
@@ -219,21 +290,49 @@ async def get_or_create_report_cache(
     Returns:
         (cache_id, is_new) — is_new가 True면 시나리오 A, False면 시나리오 B.
     """
+    async with unit_of_work(db):
+        cursor = await db.execute(
+            "SELECT id FROM report_cache WHERE journalist_id = ? AND date = ?",
+            (journalist_id, date),
+        )
+        row = await cursor.fetchone()
+        if row:
+            return row["id"], False
+
+        now = datetime.now(UTC).isoformat()
+        cursor = await db.execute(
+            "INSERT INTO report_cache (journalist_id, date, updated_at) VALUES (?, ?, ?)",
+            (journalist_id, date, now),
+        )
+    return cursor.lastrowid, True
+
+
+async def get_processed_links(db: aiosqlite.Connection, report_cache_id: int) -> set[str]:
+    """report_cache에서 이미 분석에 보낸 기사 link 집합을 조회한다."""
     cursor = await db.execute(
-        "SELECT id FROM report_cache WHERE journalist_id = ? AND date = ?",
-        (journalist_id, date),
+        "SELECT processed_links FROM report_cache WHERE id = ?",
+        (report_cache_id,),
     )
     row = await cursor.fetchone()
-    if row:
-        return row["id"], False
+    if not row or not row["processed_links"]:
+        return set()
+    return set(json.loads(row["processed_links"]))
 
-    now = datetime.now(UTC).isoformat()
-    cursor = await db.execute(
-        "INSERT INTO report_cache (journalist_id, date, updated_at) VALUES (?, ?, ?)",
-        (journalist_id, date, now),
-    )
-    await db.commit()
-    return cursor.lastrowid, True
+
+async def add_processed_links(
+    db: aiosqlite.Connection,
+    report_cache_id: int,
+    links: list[str],
+) -> None:
+    """분석에 보낸 기사 link를 report_cache에 누적 기록한다."""
+    async with unit_of_work(db):
+        processed = await get_processed_links(db, report_cache_id)
+        processed.update(links)
+        now = datetime.now(UTC).isoformat()
+        await db.execute(
+            "UPDATE report_cache SET processed_links = ?, updated_at = ? WHERE id = ?",
+            (json.dumps(sorted(processed), ensure_ascii=False), now, report_cache_id),
+        )
 
 
 async def get_report_items_by_cache(
@@ -254,12 +353,12 @@ async def get_report_items_by_cache(
             "summary": r["summary"],
             "category": r["category"],
             "prev_reference": r["prev_reference"],
-            "reason": r["reason"] if "reason" in r.keys() else "",
-            "exclusive": bool(r["exclusive"]) if "exclusive" in r.keys() else False,
-            "publisher": r["publisher"] if "publisher" in r.keys() else "",
-            "pub_time": r["pub_time"] if "pub_time" in r.keys() else "",
-            "key_facts": json.loads(r["key_facts"]) if "key_facts" in r.keys() else [],
-            "source_count": r["source_count"] if "source_count" in r.keys() else 1,
+            "reason": r["reason"],
+            "exclusive": bool(r["exclusive"]),
+            "publisher": r["publisher"],
+            "pub_time": r["pub_time"],
+            "key_facts": json.loads(r["key_facts"]),
+            "source_count": r["source_count"],
         }
         for r in rows
     ]
@@ -272,8 +371,8 @@ async def save_report_items(
 ) -> None:
     """report_items에 항목들을 저장한다."""
     now = datetime.now(UTC).isoformat()
-    for item in items:
-        await db.execute(
+    async with unit_of_work(db):
+        await db.executemany(
             """
             INSERT INTO report_items
                 (report_cache_id, title, url, summary, tags, category,
@@ -281,25 +380,27 @@ async def save_report_items(
                  key_facts, source_count, created_at, updated_at)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            (
-                report_cache_id,
-                item["title"],
-                item["url"],
-                item["summary"],
-                json.dumps(item.get("tags", []), ensure_ascii=False),
-                item["category"],
-                item.get("prev_reference"),
-                item.get("reason", ""),
-                int(item.get("exclusive", False)),
-                item.get("publisher", ""),
-                item.get("pub_time", ""),
-                json.dumps(item.get("key_facts", []), ensure_ascii=False),
-                item.get("source_count", 1),
-                now,
-                now,
-            ),
+            [
+                (
+                    report_cache_id,
+                    item["title"],
+                    item["url"],
+                    item["summary"],
+                    json.dumps(item.get("tags", []), ensure_ascii=False),
+                    item["category"],
+                    item.get("prev_reference"),
+                    item.get("reason", ""),
+                    int(item.get("exclusive", False)),
+                    item.get("publisher", ""),
+                    item.get("pub_time", ""),
+                    json.dumps(item.get("key_facts", []), ensure_ascii=False),
+                    item.get("source_count", 1),
+                    now,
+                    now,
+                )
+                for item in items
+            ],
         )
-    await db.commit()
 
 
 async def update_report_item(
@@ -313,21 +414,37 @@ async def update_report_item(
 
     summary는 항상 갱신. reason/exclusive는 값이 전달된 경우만 갱신.
     """
-    now = datetime.now(UTC).isoformat()
-    fields = ["summary = ?", "updated_at = ?"]
-    params: list = [summary, now]
-    if reason is not None:
-        fields.append("reason = ?")
-        params.append(reason)
-    if exclusive is not None:
-        fields.append("exclusive = ?")
-        params.append(int(exclusive))
-    params.append(item_id)
-    await db.execute(
-        f"UPDATE report_items SET {', '.join(fields)} WHERE id = ?",
-        params,
+    await update_report_items(
+        db, [{"id": item_id, "summary": summary, "reason": reason, "exclusive": exclusive}],
     )
-    await db.commit()
+
+
+async def update_report_items(db: aiosqlite.Connection, updates: list[dict]) -> None:
+    """report_item 여러 건을 한 번에 갱신한다.
+
+    updates 각 항목: {id, summary, reason?, exclusive?}. reason/exclusive가 None이거나 없으면 유지.
+    """
+    now = datetime.now(UTC).isoformat()
+    async with unit_of_work(db):
+        await db.executemany(
+            """
+            UPDATE report_items SET
+                summary = ?, updated_at = ?,
+                reason = COALESCE(?, reason),
+                exclusive = COALESCE(?, exclusive)
+            WHERE id = ?
+            """,
+            [
+                (
+                    u["summary"],
+                    now,
+                    u.get("reason"),
+                    None if u.get("exclusive") is None else int(u["exclusive"]),
+                    u["id"],
+                )
+                for u in updates
+            ],
+        )
 
 
 async def get_recent_report_items(
@@ -396,16 +513,16 @@ async def save_schedules(
     times_kst: list[str],
 ) -> None:
     """해당 command의 기존 스케줄을 교체한다 (삭제 후 새로 저장)."""
-    await db.execute(
-        "DELETE FROM schedules WHERE journalist_id = ? AND command = ?",
-        (journalist_id, command),
-    )
-    for t in times_kst:
+    async with unit_of_work(db):
         await db.execute(
-            "INSERT INTO schedules (journalist_id, command, time_kst) VALUES (?, ?, ?)",
-            (journalist_id, command, t),
+            "DELETE FROM schedules WHERE journalist_id = ? AND command = ?",
+            (journalist_id, command),
         )
-    await db.commit()
+        for t in times_kst:
+            await db.execute(
+                "INSERT INTO schedules (journalist_id, command, time_kst) VALUES (?, ?, ?)",
+                (journalist_id, command, t),
+            )
 
 
 async def get_schedules(
@@ -425,7 +542,7 @@ async def get_all_schedules(db: aiosqlite.Connection) -> list[dict]:
     """전체 사용자의 스케줄을 조회한다. 서버 시작 시 JobQueue 복원용."""
     cursor = await db.execute(
         """
-        SELECT s.journalist_id, s.command, s.time_kst, j.telegram_id
+        SELECT s.journalist_id, s.command, s.time_kst, j.telegram_id, j.department, j.keywords
         FROM schedules s
         JOIN journalists j ON s.journalist_id = j.id
         ORDER BY s.journalist_id, s.command, s.time_kst
@@ -438,6 +555,8 @@ async def get_all_schedules(db: aiosqlite.Connection) -> list[dict]:
             "command": r["command"],
             "time_kst": r["time_kst"],
             "telegram_id": r["telegram_id"],
+            "department": r["department"],
+            "keywords": json.loads(r["keywords"]),
         }
         for r in rows
     ]
@@ -448,8 +567,308 @@ async def delete_all_schedules(
     journalist_id: int,
 ) -> None:
     """사용자의 전체 스케줄을 삭제한다."""
-    await db.execute("DELETE FROM schedules WHERE journalist_id = ?", (journalist_id,))
-    await db.commit()
+    async with unit_of_work(db):
+        await db.execute("DELETE FROM schedules WHERE journalist_id = ?", (journalist_id,))
+
+
+# --- schedule_runs (예약 실행 기록) ---
+
+async def record_schedule_run(
+    db: aiosqlite.Connection,
+    journalist_id: int,
+    command: str,
+    run_date: str,
+    time_kst: str,
+    catch_up: bool = False,
+) -> int:
+    """예약 실행을 dispatched로 기록하고 ID를 반환한다. 이미 있으면(따라잡기 재실행) 상태를 되돌린다."""
+    now = datetime.now(UTC).isoformat()
+    async with unit_of_work(db):
+        rows = await db.execute_fetchall(
+            """
+            INSERT INTO schedule_runs (journalist_id, command, run_date, time_kst, status, catch_up, updated_at)
+            VALUES (?, ?, ?, ?, 'dispatched', ?, ?)
+            ON CONFLICT(journalist_id, command, run_date, time_kst)
+            DO UPDATE SET status = 'dispatched', catch_up = excluded.catch_up, updated_at = excluded.updated_at
+            RETURNING id
+            """,
+            (journalist_id, command, run_date, time_kst, int(catch_up), now),
+        )
+    return rows[0]["id"]
+
+
+async def update_schedule_run(db: aiosqlite.Connection, run_id: int, status: str) -> None:
+    async with unit_of_work(db):
+        await db.execute(
+            "UPDATE schedule_runs SET status = ?, updated_at = ? WHERE id = ?",
+            (status, datetime.now(UTC).isoformat(), run_id),
+        )
+
+
+async def get_schedule_runs_since(db: aiosqlite.Connection, run_date: str) -> dict[tuple, str]:
+    """run_date 이후 예약 실행 기록. (journalist_id, command, run_date, time_kst) → status."""
+    cursor = await db.execute(
+        """
+        SELECT journalist_id, command, run_date, time_kst, status
+        FROM schedule_runs WHERE run_date >= ?
+        """,
+        (run_date,),
+    )
+    return {
+        (r["journalist_id"], r["command"], r["run_date"], r["time_kst"]): r["status"]
+        for r in await cursor.fetchall()
+    }
+
+
+async def record_dispatcher_tick(db: aiosqlite.Connection, name: str, at: datetime) -> None:
+    """디스패처가 at 시각의 틱까지 처리했음을 기록한다."""
+    async with unit_of_work(db):
+        await db.execute(
+            """
+            INSERT INTO dispatcher_ticks (name, ticked_at) VALUES (?, ?)
+            ON CONFLICT(name) DO UPDATE SET ticked_at = excluded.ticked_at
+            """,
+            (name, at.astimezone(UTC).isoformat()),
+        )
+
+
+async def get_dispatcher_tick(db: aiosqlite.Connection, name: str) -> datetime | None:
+    """디스패처가 마지막으로 처리를 마친 틱 시각 (UTC). 기록이 없으면 None."""
+    cursor = await db.execute("SELECT ticked_at FROM dispatcher_ticks WHERE name = ?", (name,))
+    row = await cursor.fetchone()
+    return datetime.fromisoformat(row["ticked_at"]) if row else None
+
+
+# --- pipeline_jobs (워커 작업 큐) ---
+
+def _job_row(row) -> dict:
+    return {
+        "id": row["id"],
+        "journalist_id": row["journalist_id"],
+        "telegram_id": row["telegram_id"],
+        "command": row["command"],
+        "priority": row["priority"],
+        "payload": json.loads(row["payload"] or "{}"),
+        "status": row["status"],
+        "worker": row["worker"],
+        "attempts": row["attempts"],
+        "result": json.loads(row["result"]) if row["result"] else None,
+        "error": row["error"],
+        "delivered": bool(row["delivered"]),
+    }
+
+
+async def enqueue_pipeline_job(
+    db: aiosqlite.Connection,
+    journalist_id: int,
+    telegram_id: str,
+    command: str,
+    priority: int,
+    payload: dict,
+) -> int:
+    """파이프라인 작업을 큐에 넣고 작업 ID를 반환한다."""
+    async with unit_of_work(db):
+        cursor = await db.execute(
+            """
+            INSERT INTO pipeline_jobs (journalist_id, telegram_id, command, priority, payload)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (journalist_id, telegram_id, command, priority, json.dumps(payload, ensure_ascii=False)),
+        )
+    return cursor.lastrowid
+
+
+async def claim_pipeline_job(db: aiosqlite.Connection, worker: str) -> dict | None:
+    """대기 중인 작업 하나를 우선순위·입력 순으로 가져가 running으로 바꾼다. 없으면 None.
+
+    UPDATE 한 문장으로 고르고 표시하므로 여러 워커 프로세스가 같은 작업을 가져가지 않는다.
+    """
+    now = datetime.now(UTC).isoformat()
+    async with unit_of_work(db):
+        # RETURNING 문은 결과를 끝까지 읽어야 커밋할 수 있으므로, 다른 코루틴의 커밋이
+        # 끼어들지 않도록 실행과 읽기를 한 번에 한다
+        rows = await db.execute_fetchall(
+            """
+            UPDATE pipeline_jobs
+            SET status = 'running', worker = ?, attempts = attempts + 1, heartbeat_at = ?
+            WHERE id = (
+                SELECT id FROM pipeline_jobs WHERE status = 'queued' ORDER BY priority, id LIMIT 1
+            )
+            RETURNING *
+            """,
+            (worker, now),
+        )
+    return _job_row(rows[0]) if rows else None
+
+
+async def heartbeat_pipeline_jobs(
+    db: aiosqlite.Connection, worker: str, job_ids: list[int],
+) -> set[int]:
+    """워커가 실행 중인 작업의 생존 신호를 갱신한다.
+
+    Returns:
+        job_ids 중 더 이상 이 워커의 running 작업이 아닌(취소·회수된) 작업 ID.
+    """
+    if not job_ids:
+        return set()
+    now = datetime.now(UTC).isoformat()
+    marks = ",".join("?" * len(job_ids))
+    async with unit_of_work(db):
+        await db.execute(
+            f"""
+            UPDATE pipeline_jobs SET heartbeat_at = ?
+            WHERE worker = ? AND status = 'running' AND id IN ({marks})
+            """,
+            (now, worker, *job_ids),
+        )
+        cursor = await db.execute(
+            f"""
+            SELECT id FROM pipeline_jobs
+            WHERE worker = ? AND status = 'running' AND id IN ({marks})
+            """,
+            (worker, *job_ids),
+        )
+        alive = {r["id"] for r in await cursor.fetchall()}
+    return set(job_ids) - alive
+
+
+async def finish_pipeline_job(
+    db: aiosqlite.Connection,
+    job_id: int,
+    worker: str,
+    result=None,
+    error: str | None = None,
+) -> None:
+    """작업 결과를 기록한다. 그사이 취소·회수된 작업이면 아무것도 바꾸지 않는다."""
+    now = datetime.now(UTC).isoformat()
+    async with unit_of_work(db):
+        await db.execute(
+            """
+            UPDATE pipeline_jobs SET status = ?, result = ?, error = ?, finished_at = ?
+            WHERE id = ? AND worker = ? AND status = 'running'
+            """,
+            (
+                "failed" if error is not None else "done",
+                json.dumps(result, ensure_ascii=False), error, now, job_id, worker,
+            ),
+        )
+
+
+async def requeue_stale_pipeline_jobs(
+    db: aiosqlite.Connection, lease_seconds: int, max_attempts: int,
+) -> int:
+    """생존 신호가 lease_seconds 넘게 끊긴 running 작업을 다시 대기시킨다.
+
+    이미 max_attempts번 시도한 작업은 실패로 닫는다. 처리한 작업 수를 반환한다.
+    """
+    now = datetime.now(UTC)
+    cutoff = (now - timedelta(seconds=lease_seconds)).isoformat()
+    async with unit_of_work(db):
+        cursor = await db.execute(
+            """
+            UPDATE pipeline_jobs
+            SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END,
+                error = CASE WHEN attempts >= ? THEN '작업 처리 중 워커가 중단되었습니다.' ELSE error END,
+                finished_at = CASE WHEN attempts >= ? THEN ? ELSE finished_at END,
+                worker = NULL
+            WHERE status = 'running' AND heartbeat_at < ?
+            """,
+            (max_attempts, max_attempts, max_attempts, now.isoformat(), cutoff),
+        )
+    return cursor.rowcount
+
+
+async def release_pipeline_jobs(db: aiosqlite.Connection, worker: str) -> None:
+    """종료하는 워커의 running 작업을 시도 횟수를 되돌려 다시 대기시킨다."""
+    async with unit_of_work(db):
+        await db.execute(
+            """
+            UPDATE pipeline_jobs SET status = 'queued', worker = NULL, attempts = attempts - 1
+            WHERE worker = ? AND status = 'running'
+            """,
+            (worker,),
+        )
+
+
+async def get_pipeline_job(db: aiosqlite.Connection, job_id: int) -> dict | None:
+    cursor = await db.execute("SELECT * FROM pipeline_jobs WHERE id = ?", (job_id,))
+    row = await cursor.fetchone()
+    return _job_row(row) if row else None
+
+
+async def get_undelivered_pipeline_jobs(db: aiosqlite.Connection) -> list[dict]:
+    """봇이 아직 결과를 가져가지 않은 작업 목록. 서버 재시작 시 복원용."""
+    cursor = await db.execute(
+        """
+        SELECT * FROM pipeline_jobs
+        WHERE delivered = 0 AND status IN ('queued', 'running', 'done', 'failed')
+        ORDER BY id
+        """,
+    )
+    return [_job_row(r) for r in await cursor.fetchall()]
+
+
+async def mark_pipeline_job_delivered(db: aiosqlite.Connection, job_id: int) -> None:
+    async with unit_of_work(db):
+        await db.execute("UPDATE pipeline_jobs SET delivered = 1 WHERE id = ?", (job_id,))
+
+
+async def cancel_pipeline_job(db: aiosqlite.Connection, job_id: int) -> None:
+    """대기·실행 중인 작업을 취소한다. 실행 중이면 워커가 다음 생존 신호 때 중단한다."""
+    async with unit_of_work(db):
+        await db.execute(
+            """
+            UPDATE pipeline_jobs SET status = 'cancelled', delivered = 1, finished_at = ?
+            WHERE id = ? AND status IN ('queued', 'running')
+            """,
+            (datetime.now(UTC).isoformat(), job_id),
+        )
+
+
+# --- pending_batches (결과 대기 중인 배치) ---
+
+async def save_pending_batch(
+    db: aiosqlite.Connection,
+    batch_id: str,
+    journalist_id: int,
+    chat_id: int,
+    command: str,
+    state: dict,
+    submitted_at: datetime,
+) -> None:
+    """제출한 배치와 결과 처리에 필요한 상태를 기록한다. 재시작 후 폴링 복원용."""
+    async with unit_of_work(db):
+        await db.execute(
+            """
+            INSERT OR REPLACE INTO pending_batches
+                (batch_id, journalist_id, chat_id, command, state, submitted_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                batch_id, journalist_id, chat_id, command,
+                json.dumps(state, ensure_ascii=False), submitted_at.isoformat(),
+            ),
+        )
+
+
+async def get_pending_batches(db: aiosqlite.Connection) -> list[dict]:
+    cursor = await db.execute("SELECT * FROM pending_batches ORDER BY submitted_at")
+    return [
+        {
+            "batch_id": r["batch_id"],
+            "journalist_id": r["journalist_id"],
+            "chat_id": r["chat_id"],
+            "command": r["command"],
+            "state": json.loads(r["state"]),
+            "submitted_at": datetime.fromisoformat(r["submitted_at"]),
+        }
+        for r in await cursor.fetchall()
+    ]
+
+
+async def delete_pending_batch(db: aiosqlite.Connection, batch_id: str) -> None:
+    async with unit_of_work(db):
+        await db.execute("DELETE FROM pending_batches WHERE batch_id = ?", (batch_id,))
 
 
 # --- 캐시 정리 ---
@@ -457,21 +876,25 @@ async def delete_all_schedules(
 async def cleanup_old_data(db: aiosqlite.Connection) -> None:
     """보관 기간이 지난 report_items, reported_articles를 삭제한다."""
     cutoff = (datetime.now(UTC) - timedelta(days=CACHE_RETENTION_DAYS)).isoformat()
+    async with unit_of_work(db):
 
-    # report_items: report_cache 기준으로 삭제
-    await db.execute(
-        """
-        DELETE FROM report_items WHERE report_cache_id IN (
-            SELECT id FROM report_cache WHERE date < ?
+        # report_items: report_cache 기준으로 삭제
+        await db.execute(
+            """
+            DELETE FROM report_items WHERE report_cache_id IN (
+                SELECT id FROM report_cache WHERE date < ?
+            )
+            """,
+            (cutoff[:10],),  # DATE 형식 비교
         )
-        """,
-        (cutoff[:10],),  # DATE 형식 비교
-    )
-    await db.execute("DELETE FROM report_cache WHERE date < ?", (cutoff[:10],))
-    await db.execute(
-        "DELETE FROM reported_articles WHERE checked_at < ?", (cutoff,)
-    )
-    await db.commit()
+        await db.execute("DELETE FROM report_cache WHERE date < ?", (cutoff[:10],))
+        await db.execute(
+            "DELETE FROM reported_articles WHERE checked_at < ?", (cutoff,)
+        )
+        await db.execute(
+            "DELETE FROM pipeline_jobs WHERE delivered = 1 AND finished_at < ?", (cutoff,)
+        )
+        await db.execute("DELETE FROM schedule_runs WHERE run_date < ?", (cutoff[:10],))
 
 
 # --- 관리자 통계 ---
@@ -4,12 +4,13 @@ n.news.naver.com 기사 페이지에서 본문을 추출한다 (최대 800자).
 소제목·사진 캡션을 건너뛰고 실제 본문 문단만 가져온다.
 """
 
-import asyncio
 import logging
 
 import httpx
 from bs4 import BeautifulSoup
 
+from src import deadline, metrics
+
 logger = logging.getLogger(__name__)
 
 _TIMEOUT = 10.0
@@ -116,7 +117,8 @@ async def fetch_article_body(url: str) -> str | None:
 
 
 # 전역 동시 스크래핑 제한 (모든 파이프라인이 공유)
-_scrape_semaphore = asyncio.Semaphore(50)
+SCRAPE_CONCURRENCY = 50
+scrape_semaphore = metrics.TrackedSemaphore(SCRAPE_CONCURRENCY)
 
 
 async def fetch_articles_batch(urls: list[str]) -> dict[str, str | None]:
@@ -124,12 +126,13 @@ async def fetch_articles_batch(urls: list[str]) -> dict[str, str | None]:
 
     httpx.AsyncClient를 공유하여 연결을 재사용하고,
     전역 세마포어로 동시 요청 수를 제한한다.
+    실행 마감(deadline)까지 받지 못한 URL은 None(수집 실패)으로 둔다.
     """
     if not urls:
         return {}
 
     async def _fetch_one(client: httpx.AsyncClient, url: str) -> tuple[str, str | None]:
-        async with _scrape_semaphore:
+        async with scrape_semaphore:
             try:
                 resp = await client.get(url)
                 resp.raise_for_status()
@@ -143,7 +146,7 @@ async def fetch_articles_batch(urls: list[str]) -> dict[str, str | None]:
         timeout=_TIMEOUT, headers=_HEADERS, follow_redirects=True
     ) as client:
         tasks = [_fetch_one(client, url) for url in urls]
-        results = await asyncio.gather(*tasks)
+        results = await deadline.gather_partial(tasks, [(url, None) for url in urls])
 
     logger.info("본문 스크래핑 완료: %d건 중 %d건 성공", len(urls), sum(1 for _, b in results if b))
     return dict(results)
@@ -11,6 +11,7 @@ from email.utils import parsedate_to_datetime
 
 import httpx
 
+from src import deadline, metrics
 from src.config import NAVER_CLIENT_ID, NAVER_CLIENT_SECRET
 
 logger = logging.getLogger(__name__)
@@ -120,6 +121,7 @@ async def search_news(
 
     네이버 API rate limit을 피하기 위해 _BATCH_SIZE개씩 나눠 요청하고,
     배치 사이에 _BATCH_DELAY초 대기한다. 429 발생 시 자동 재시도한다.
+    실행 마감(deadline)에 도달하면 그때까지 모인 결과만 반환한다.
 
     Args:
         keywords: 검색 키워드 리스트. 각 키워드별로 개별 검색한다.
@@ -135,14 +137,19 @@ async def search_news(
     }
 
     all_results: list[list[dict]] = []
-    async with httpx.AsyncClient() as client:
+    async with httpx.AsyncClient(
+        event_hooks={"response": [metrics.http_response_hook("naver")]},
+    ) as client:
         for i in range(0, len(keywords), _BATCH_SIZE):
+            if deadline.expired():
+                logger.warning("마감 도달: 키워드 %d개 중 %d개 검색 생략", len(keywords), len(keywords) - i)
+                break
             batch = keywords[i:i + _BATCH_SIZE]
             tasks = [
                 _search_keyword(client, kw, since, headers)
                 for kw in batch
             ]
-            batch_results = await asyncio.gather(*tasks)
+            batch_results = await deadline.gather_partial(tasks, [[] for _ in batch])
             all_results.extend(batch_results)
 
             # 마지막 배치가 아니면 대기
@@ -0,0 +1,149 @@
+"""파이프라인 워커 프로세스 진입점.
+
+    python -m src.worker --name w0
+
+pipeline_jobs 큐에서 작업을 가져와 check/report 파이프라인을 실행하고 결과를 기록한다.
+봇(main.py)이 PIPELINE_WORKERS개를 띄우지만, 같은 DB를 보는 별도 서버에서 직접 실행해도 된다.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from src.config import (
+    DB_PATH, PIPELINE_WORKER_CONCURRENCY, SCHEDULE_MIN_RUN_SECONDS,
+    JOB_POLL_SECONDS, JOB_HEARTBEAT_SECONDS, JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS,
+)
+from src import deadline
+from src.storage import repository as repo
+from src.storage.models import init_db
+from src.agents.llm_client import close_clients
+from src.bot.handlers import _run_check_pipeline, _run_report_pipeline, format_error_message
+from src.bot.jobs import encode_check_result
+
+logger = logging.getLogger(__name__)
+
+
+async def execute_job(db, job: dict):
+    """작업 하나를 실행해 JSON으로 저장할 결과를 반환한다."""
+    journalist = await repo.get_journalist(db, job["telegram_id"])
+    if journalist is None:
+        raise RuntimeError("프로필이 없습니다. /start로 등록해주세요.")
+
+    payload = job["payload"]
+    # 예약 실행의 SLA 마감은 워커가 작업을 가져간 시점부터 건다
+    with deadline.scope_until(payload.get("sla_due"), SCHEDULE_MIN_RUN_SECONDS):
+        if job["command"] == "check":
+            return encode_check_result(await _run_check_pipeline(db, journalist))
+
+        existing_items = None
+        if not payload["scenario_a"]:
+            existing_items = await repo.get_report_items_by_cache(db, payload["cache_id"])
+        return await _run_report_pipeline(
+            db, journalist, existing_items=existing_items, cache_id=payload["cache_id"],
+        )
+
+
+class Worker:
+    """작업 큐 소비자. 최대 concurrency개 작업을 동시에 실행한다."""
+
+    def __init__(self, db, name: str, concurrency: int = PIPELINE_WORKER_CONCURRENCY):
+        self.db = db
+        self.name = name
+        self.concurrency = concurrency
+        self._running: dict[int, asyncio.Task] = {}
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def _run_job(self, job: dict) -> None:
+        result, error = None, None
+        try:
+            result = await execute_job(self.db, job)
+        except asyncio.CancelledError:
+            logger.info("작업 취소: #%d", job["id"])
+            return
+        except Exception as e:
+            logger.error("작업 실패: #%d %s: %s", job["id"], job["command"], e, exc_info=True)
+            error = format_error_message(e)
+        await repo.finish_pipeline_job(self.db, job["id"], self.name, result=result, error=error)
+        logger.info("작업 완료: #%d %s", job["id"], job["command"])
+
+    async def _heartbeat(self) -> None:
+        """실행 중인 작업의 생존 신호를 보내고, 취소·회수된 작업은 중단한다."""
+        while not self._stopping.is_set():
+            gone = await repo.heartbeat_pipeline_jobs(self.db, self.name, list(self._running))
+            for job_id in gone:
+                task = self._running.get(job_id)
+                if task is not None:
+                    task.cancel()
+            await repo.requeue_stale_pipeline_jobs(self.db, JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS)
+            try:
+                await asyncio.wait_for(self._stopping.wait(), JOB_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self) -> None:
+        heartbeat = asyncio.create_task(self._heartbeat())
+        try:
+            while not self._stopping.is_set():
+                job = None
+                if len(self._running) < self.concurrency:
+                    job = await repo.claim_pipeline_job(self.db, self.name)
+                if job is None:
+                    try:
+                        await asyncio.wait_for(self._stopping.wait(), JOB_POLL_SECONDS)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                logger.info("작업 시작: #%d %s (시도 %d)", job["id"], job["command"], job["attempts"])
+                task = asyncio.create_task(self._run_job(job))
+                self._running[job["id"]] = task
+                task.add_done_callback(lambda _t, job_id=job["id"]: self._running.pop(job_id, None))
+        finally:
+            # 종료 시 실행 중인 작업은 끝까지 처리하지 않고 큐로 돌려 다른 워커가 이어받게 한다
+            heartbeat.cancel()
+            tasks = list(self._running.values())
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, heartbeat, return_exceptions=True)
+            await repo.release_pipeline_jobs(self.db, self.name)
+
+
+async def _main(name: str, db_path: str) -> None:
+    db = await init_db(db_path)
+    worker = Worker(db, name)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+    logger.info("워커 시작: %s (pid=%d)", name, os.getpid())
+    try:
+        await worker.run()
+    finally:
+        await close_clients()
+        await db.close()
+        logger.info("워커 종료: %s", name)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="tasa-check 파이프라인 워커")
+    parser.add_argument("--name", default=f"w{os.getpid()}")
+    parser.add_argument("--db", default=DB_PATH)
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        format=f"%(asctime)s [{args.name}] [%(name)s] %(levelname)s: %(message)s",
+        level=logging.INFO,
+    )
+    asyncio.run(_main(args.name, args.db))
+
+
+if __name__ == "__main__":
+    main()
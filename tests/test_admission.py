@@ -0,0 +1,178 @@
+"""admission 단위 테스트.
+
+우선순위 클래스, 사용자 공정성, 에이징, 대기 순번 안내, 취소 처리를 검증한다.
+"""
+
+import asyncio
+
+import pytest
+
+from src.bot.admission import (
+    PipelineScheduler, _Waiter, PRIORITY_INTERACTIVE, PRIORITY_SCHEDULED, PRIORITY_BACKGROUND,
+)
+
+
+async def _run(scheduler, order, name, priority, user, on_queued=None):
+    async with scheduler.slot(priority, user, on_queued):
+        order.append(name)
+        await asyncio.sleep(0)
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_interactive_jumps_scheduled_backlog():
+    """예약 실행이 쌓여 있어도 대화형 요청이 먼저 입장한다."""
+    scheduler = PipelineScheduler(1)
+    order = []
+    gate = asyncio.Event()
+
+    async def _hold():
+        async with scheduler.slot(PRIORITY_SCHEDULED, "u0"):
+            await gate.wait()
+
+    holder = asyncio.create_task(_hold())
+    await _settle()
+    tasks = [
+        asyncio.create_task(_run(scheduler, order, f"s{i}", PRIORITY_SCHEDULED, f"u{i}"))
+        for i in range(1, 4)
+    ]
+    tasks.append(asyncio.create_task(_run(scheduler, order, "bg", PRIORITY_BACKGROUND, "u9")))
+    tasks.append(asyncio.create_task(_run(scheduler, order, "i", PRIORITY_INTERACTIVE, "u5")))
+    await _settle()
+    assert scheduler.waiting == 5
+
+    gate.set()
+    await asyncio.gather(holder, *tasks)
+    assert order == ["i", "s1", "s2", "s3", "bg"]
+    assert scheduler.in_use == 0
+
+
+@pytest.mark.asyncio
+async def test_fairness_prefers_user_with_fewer_running():
+    """같은 클래스에서는 이미 실행 중인 파이프라인이 적은 사용자를 먼저 입장시킨다."""
+    scheduler = PipelineScheduler(2)
+    order = []
+    gate = asyncio.Event()
+
+    async def _hold(user):
+        async with scheduler.slot(PRIORITY_SCHEDULED, user):
+            await gate.wait()
+
+    holders = [asyncio.create_task(_hold("heavy")), asyncio.create_task(_hold("other"))]
+    await _settle()
+    heavy = asyncio.create_task(_run(scheduler, order, "heavy", PRIORITY_SCHEDULED, "heavy"))
+    light = asyncio.create_task(_run(scheduler, order, "light", PRIORITY_SCHEDULED, "light"))
+    await _settle()
+
+    # 'other'의 슬롯 하나만 먼저 풀리면 그 자리는 light가 받는다
+    holders[1].cancel()
+    await _settle()
+    assert order[0] == "light"
+
+    gate.set()
+    await asyncio.gather(holders[0], heavy, light)
+    assert order == ["light", "heavy"]
+
+
+def test_aging_promotes_long_waiters():
+    scheduler = PipelineScheduler(1, aging_seconds=60)
+    loop = asyncio.new_event_loop()
+    try:
+        old_bg = _Waiter(PRIORITY_BACKGROUND, "a", 0.0, 0, loop.create_future())
+        new_int = _Waiter(PRIORITY_INTERACTIVE, "b", 125.0, 1, loop.create_future())
+        # 130초 대기한 백그라운드는 대화형과 같은 클래스로 승격되고, 먼저 왔으므로 앞선다
+        assert scheduler._rank(old_bg, 130.0) < scheduler._rank(new_int, 130.0)
+    finally:
+        loop.close()
+
+
+@pytest.mark.asyncio
+async def test_queue_position_feedback_and_cancel():
+    scheduler = PipelineScheduler(1)
+    gate = asyncio.Event()
+    positions = []
+
+    async def _notice(position):
+        positions.append(position)
+
+    async def _hold():
+        async with scheduler.slot(PRIORITY_SCHEDULED, "u0"):
+            await gate.wait()
+
+    holder = asyncio.create_task(_hold())
+    await _settle()
+    first = asyncio.create_task(_run(scheduler, [], "a", PRIORITY_SCHEDULED, "u1", _notice))
+    await _settle()
+    second = asyncio.create_task(_run(scheduler, [], "b", PRIORITY_INTERACTIVE, "u2", _notice))
+    await _settle()
+    assert positions == [1, 1]
+
+    # 대기 중 취소되면 대기열에서 빠진다
+    first.cancel()
+    await _settle()
+    assert scheduler.waiting == 1
+
+    gate.set()
+    await asyncio.gather(holder, second)
+    assert scheduler.in_use == 0 and scheduler.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_set_capacity_admits_waiters():
+    scheduler = PipelineScheduler(0)
+    order = []
+    task = asyncio.create_task(_run(scheduler, order, "a", PRIORITY_SCHEDULED, "u1"))
+    await _settle()
+    assert order == []
+    scheduler.set_capacity(1)
+    await task
+    assert order == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_memory_headroom_sets_capacity():
+    """RSS 여유가 줄면 한도를 줄이고, 추정치만큼 여유가 없으면 입장시키지 않는다."""
+    mb = 1024 * 1024
+    scheduler = PipelineScheduler(5, memory_limit=500 * mb, min_capacity=1, max_capacity=8)
+    scheduler.per_pipeline = 100 * mb
+
+    scheduler.observe_memory(100 * mb)  # 유휴: 기준선 100MB, 여유 400MB
+    assert scheduler.capacity == 4
+
+    gate = asyncio.Event()
+
+    async def _hold(user):
+        async with scheduler.slot(PRIORITY_SCHEDULED, user):
+            await gate.wait()
+
+    holders = [asyncio.create_task(_hold(f"u{i}")) for i in range(2)]
+    await _settle()
+    assert scheduler.in_use == 2
+
+    # 실행 2개로 RSS 420MB → 파이프라인당 관측 160MB, 추정치 상승, 여유 부족
+    scheduler.observe_memory(420 * mb)
+    assert scheduler.per_pipeline > 100 * mb
+    assert scheduler.capacity == 2
+
+    order = []
+    waiter = asyncio.create_task(_run(scheduler, order, "w", PRIORITY_INTERACTIVE, "u9"))
+    await _settle()
+    assert order == [] and scheduler.waiting == 1
+
+    gate.set()
+    await asyncio.gather(*holders, waiter)
+    assert order == ["w"]
+
+
+def test_capacity_clamped_to_bounds():
+    mb = 1024 * 1024
+    scheduler = PipelineScheduler(5, memory_limit=500 * mb, min_capacity=1, max_capacity=8)
+    scheduler.per_pipeline = 10 * mb
+    scheduler.observe_memory(100 * mb)
+    assert scheduler.capacity == 8
+    scheduler.observe_memory(600 * mb)
+    assert scheduler.capacity == 1
@@ -0,0 +1,176 @@
+"""batch 단위 테스트.
+
+로컬 대체 구현으로 배치 제출 → 폴링 → 결과 전달 흐름을 검증한다.
+"""
+
+import asyncio
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.agents import batch
+
+
+def _tool_response(results, skipped):
+    block = MagicMock()
+    block.type = "tool_use"
+    block.name = "submit_analysis"
+    block.input = {"results": results, "skipped": skipped}
+    response = MagicMock()
+    response.stop_reason = "tool_use"
+    response.content = [block]
+    response.usage = MagicMock(input_tokens=100, output_tokens=50)
+    return response
+
+
+@pytest.fixture
+def local_backend(monkeypatch):
+    monkeypatch.setattr(batch, "BATCH_BACKEND", "local")
+
+
+@pytest.mark.asyncio
+async def test_local_batch_submit_and_poll(local_backend):
+    """완료 전에는 None, 완료 후에는 custom_id별 메시지를 반환한다."""
+    gate = asyncio.Event()
+    response = _tool_response([], [])
+
+    async def _create(**kwargs):
+        await gate.wait()
+        return response
+
+    mock_client = MagicMock()
+    mock_client.messages.create = AsyncMock(side_effect=_create)
+
+    with patch("src.agents.batch.get_client", return_value=mock_client):
+        batch_id = await batch.submit_batch("sk-test", [("check", {"model": "m"})])
+        assert batch_id.startswith("local_")
+        assert await batch.get_batch_results("sk-test", batch_id) is None
+
+        gate.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        results = await batch.get_batch_results("sk-test", batch_id)
+
+    assert results == {"check": response}
+    mock_client.messages.create.assert_awaited_once_with(model="m")
+
+
+@pytest.mark.asyncio
+async def test_local_batch_failed_request(local_backend):
+    """개별 요청 실패는 None 결과로 전달된다."""
+    mock_client = MagicMock()
+    mock_client.messages.create = AsyncMock(side_effect=RuntimeError("boom"))
+
+    with patch("src.agents.batch.get_client", return_value=mock_client):
+        batch_id = await batch.submit_batch("sk-test", [("report", {})])
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        results = await batch.get_batch_results("sk-test", batch_id)
+
+    assert results == {"report": None}
+
+
+@pytest.mark.asyncio
+async def test_poll_batch_job_delivers_check_results(local_backend):
+    """폴링 job이 완료된 배치 결과를 파싱·매핑해 전송하고 job을 제거한다."""
+    from src.bot import scheduler
+
+    response = _tool_response(
+        [{"category": "important", "title": "기사A", "topic_cluster": "A",
+          "source_indices": [1], "merged_indices": [], "summary": "s", "reason": "r"}],
+        [],
+    )
+    mock_client = MagicMock()
+    mock_client.messages.create = AsyncMock(return_value=response)
+
+    now = datetime.now(UTC)
+    collected = {
+        "since": now, "now": now, "haiku_filtered": 0, "local_skipped": [],
+        "articles": [{"title": "기사A", "publisher": "조선일보", "body": "b",
+                      "url": "https://n.news.naver.com/1", "pubDate": "2026-01-01 09:00"}],
+        "history": [],
+    }
+
+    with patch("src.agents.batch.get_client", return_value=mock_client):
+        batch_id = await batch.submit_batch("sk-test", [("check", {})])
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        job = MagicMock()
+        job.chat_id = 1
+        job.data = {
+            "command": "check", "journalist_id": 7, "batch_id": batch_id,
+            "submitted_at": datetime.now(scheduler._KST), "collected": collected,
+        }
+        context = MagicMock()
+        context.job = job
+        context.bot.send_message = AsyncMock()
+        context.bot_data = {"db": MagicMock()}
+
+        journalist = {"id": 7, "api_key": "sk-test", "department": "사회부", "keywords": []}
+        with patch.object(scheduler.repo, "get_journalist", AsyncMock(return_value=journalist)), \
+                patch.object(scheduler.repo, "delete_pending_batch", AsyncMock()) as delete, \
+                patch.object(scheduler, "_deliver_check_results", AsyncMock()) as deliver:
+            await scheduler.poll_batch_job(context)
+
+    job.schedule_removal.assert_called_once()
+    results = deliver.await_args.args[3]
+    assert results[0]["url"] == "https://n.news.naver.com/1"
+    assert results[0]["publisher"] == "조선일보"
+    # 전송을 마친 배치는 복원 대상에서 지운다
+    delete.assert_awaited_once_with(context.bot_data["db"], batch_id)
+
+
+@pytest.mark.asyncio
+async def test_truncated_batch_response_continues_synchronously():
+    """max_tokens로 잘린 배치 응답은 바로 전송하지 않고 동기 분석의 이어쓰기로 넘긴다."""
+    from src.bot import scheduler
+
+    message = _tool_response([], [])
+    message.stop_reason = "max_tokens"
+    collected = {"articles": [], "history": [], "local_skipped": [],
+                 "since": datetime.now(UTC), "now": datetime.now(UTC), "haiku_filtered": 0}
+    journalist = {"id": 7, "telegram_id": "1", "api_key": "sk-test", "department": "사회부", "keywords": []}
+
+    with patch.object(scheduler, "analyze_articles", AsyncMock(return_value=[])) as analyze, \
+            patch.object(scheduler, "_deliver_check_results", AsyncMock()):
+        await scheduler._complete_check_batch(
+            MagicMock(), journalist, AsyncMock(), {"collected": collected}, message,
+        )
+
+    assert analyze.await_args.kwargs["first_message"] is message
+
+
+@pytest.mark.asyncio
+async def test_pending_batch_restored_after_restart(tmp_path):
+    """제출한 배치는 DB에 남아 재시작 후 같은 상태로 폴링이 다시 등록된다."""
+    from src.bot import scheduler
+    from src.storage import repository as repo
+    from src.storage.models import init_db
+
+    db = await init_db(str(tmp_path / "test.db"))
+    try:
+        jid = await repo.upsert_journalist(db, "1", "사회부", [], "sk-test")
+        now = datetime.now(UTC)
+        state = {"collected": {
+            "since": now, "now": now, "haiku_filtered": 0, "local_skipped": [],
+            "articles": [{"title": "기사A"}], "history": [],
+        }}
+        submitted_at = datetime.now(scheduler._KST)
+        await repo.save_pending_batch(
+            db, "batch_1", jid, 1, "check", scheduler._encode_batch_state("check", state), submitted_at,
+        )
+
+        app = MagicMock()
+        await scheduler.restore_batch_polls(app, db)
+        data = app.job_queue.run_repeating.call_args.kwargs["data"]
+        assert data["batch_id"] == "batch_1"
+        assert data["submitted_at"] == submitted_at
+        assert data["collected"]["since"] == now
+        assert data["collected"]["articles"] == [{"title": "기사A"}]
+
+        await repo.delete_pending_batch(db, "batch_1")
+        assert await repo.get_pending_batches(db) == []
+    finally:
+        await db.close()
@@ -10,6 +10,7 @@ from src.agents.check_agent import (
     _build_system_prompt, _build_user_prompt,
     _parse_analysis_response, analyze_articles,
 )
+from src.agents.recovery import new_recovery_stats
 
 
 # --- 프롬프트 조립 ---
@@ -183,7 +184,7 @@ async def test_analyze_articles_normal():
     mock_client = AsyncMock()
     mock_client.messages.create = AsyncMock(return_value=response)
 
-    with patch("src.agents.check_agent.anthropic.AsyncAnthropic", return_value=mock_client):
+    with patch("src.agents.check_agent.get_client", return_value=mock_client):
         results = await analyze_articles(
             api_key="sk-test",
             articles=[
@@ -232,7 +233,7 @@ async def test_analyze_articles_retry_on_parse_failure():
     mock_client = AsyncMock()
     mock_client.messages.create = AsyncMock(side_effect=[bad_response, good_response])
 
-    with patch("src.agents.check_agent.anthropic.AsyncAnthropic", return_value=mock_client):
+    with patch("src.agents.check_agent.get_client", return_value=mock_client):
         results = await analyze_articles(
             api_key="sk-test",
             articles=[{"title": "t", "publisher": "p", "body": "b", "url": "u", "pubDate": "d"}],
@@ -260,7 +261,7 @@ async def test_analyze_articles_raises_on_persistent_failure():
     mock_client = AsyncMock()
     mock_client.messages.create = AsyncMock(return_value=bad_response)
 
-    with patch("src.agents.check_agent.anthropic.AsyncAnthropic", return_value=mock_client):
+    with patch("src.agents.check_agent.get_client", return_value=mock_client):
         with pytest.raises(RuntimeError, match="파싱 실패"):
             await analyze_articles(
                 api_key="sk-test",
@@ -288,7 +289,7 @@ async def test_analyze_articles_raises_on_empty_results():
     mock_client = AsyncMock()
     mock_client.messages.create = AsyncMock(return_value=empty_response)
 
-    with patch("src.agents.check_agent.anthropic.AsyncAnthropic", return_value=mock_client):
+    with patch("src.agents.check_agent.get_client", return_value=mock_client):
         with pytest.raises(RuntimeError, match="빈 배열"):
             await analyze_articles(
                 api_key="sk-test",
@@ -298,3 +299,103 @@ async def test_analyze_articles_raises_on_empty_results():
             )
 
     assert mock_client.messages.create.call_count == 3
+
+
+def test_plain_json_string_not_counted_as_repair():
+    """json.loads로 바로 읽히는 문자열 필드는 복구 통계에 넣지 않는다."""
+    item = '{"category": "important", "title": "A", "topic_cluster": "a"}'
+    cases = [(f"[{item}]", 0), (f"```json\n[{item}]\n```", 1), (f"[{item}, {{\"cat", 1)]
+    for raw, expected in cases:
+        message = _make_tool_use_message(raw, [])
+        message.stop_reason = "tool_use"
+        stats = new_recovery_stats()
+        assert _parse_analysis_response(message, stats)
+        assert stats["repaired"] == expected, raw
+
+
+@pytest.mark.asyncio
+async def test_analyze_articles_stringified_truncated_results_repaired():
+    """문자열로 잘린 results는 재호출 없이 완결 요소만 회수한다."""
+    block = MagicMock()
+    block.type = "tool_use"
+    block.name = "submit_analysis"
+    block.input = {
+        "results": '[{"category": "important", "title": "A", "source_indices": [1]}, {"categ',
+        "skipped": [],
+    }
+
+    response = MagicMock()
+    response.stop_reason = "tool_use"
+    response.content = [block]
+    response.usage = MagicMock(input_tokens=1000, output_tokens=500)
+
+    mock_client = AsyncMock()
+    mock_client.messages.create = AsyncMock(return_value=response)
+
+    with patch("src.agents.check_agent.get_client", return_value=mock_client):
+        results = await analyze_articles(
+            api_key="sk-test",
+            articles=[{"title": "A", "publisher": "p", "body": "b", "url": "u", "pubDate": "d"}],
+            history=[],
+            department="사회",
+        )
+
+    assert len(results) == 1
+    assert results[0]["title"] == "A"
+    mock_client.messages.create.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_analyze_articles_max_tokens_requests_continuation():
+    """max_tokens 절단 시 회수분을 유지하고 미분류 기사만 이어쓰기 요청한다."""
+    full_result = {
+        "category": "important", "topic_cluster": "t1", "source_indices": [1],
+        "merged_indices": [], "title": "A", "summary": "s", "reason": "r",
+    }
+    cut_block = MagicMock()
+    cut_block.type = "tool_use"
+    cut_block.name = "submit_analysis"
+    cut_block.id = "toolu_1"
+    cut_block.input = {
+        "thinking": "기사1: pass",
+        "results": [full_result, {"category": "important", "topic_cluster": "t2"}],
+        "skipped": [],
+    }
+    cut_response = MagicMock()
+    cut_response.stop_reason = "max_tokens"
+    cut_response.content = [cut_block]
+    cut_response.usage = MagicMock(input_tokens=1000, output_tokens=16384)
+
+    cont_block = MagicMock()
+    cont_block.type = "tool_use"
+    cont_block.name = "submit_analysis"
+    cont_block.input = {
+        "results": [],
+        "skipped": [{"topic_cluster": "t2", "source_indices": [2], "title": "B", "reason": "무관"}],
+    }
+    cont_response = MagicMock()
+    cont_response.stop_reason = "tool_use"
+    cont_response.content = [cont_block]
+    cont_response.usage = MagicMock(input_tokens=1200, output_tokens=100)
+
+    mock_client = AsyncMock()
+    mock_client.messages.create = AsyncMock(side_effect=[cut_response, cont_response])
+
+    with patch("src.agents.check_agent.get_client", return_value=mock_client):
+        results = await analyze_articles(
+            api_key="sk-test",
+            articles=[
+                {"title": "A", "publisher": "p", "body": "b", "url": "u1", "pubDate": "d"},
+                {"title": "B", "publisher": "p", "body": "b", "url": "u2", "pubDate": "d"},
+            ],
+            history=[],
+            department="사회",
+        )
+
+    assert [r["title"] for r in results] == ["A", "B"]
+    assert results[1]["category"] == "skip"
+    assert mock_client.messages.create.call_count == 2
+    cont_messages = mock_client.messages.create.call_args_list[1].kwargs["messages"]
+    assert len(cont_messages) == 3
+    assert cont_messages[1]["content"][0]["input"]["results"] == [full_result]
+    assert "2" in cont_messages[2]["content"][0]["content"]
@@ -0,0 +1,69 @@
+"""deadline 단위 테스트.
+
+마감 중첩, 부분 결과 수집, 마감 없는 기본 동작을 검증한다.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src import deadline
+
+
+def test_scope_nesting_cannot_extend_outer():
+    assert deadline.remaining() is None
+    assert deadline.request_options() == {}
+    with deadline.scope(10):
+        with deadline.scope(100):
+            assert deadline.remaining() <= 10
+        with deadline.scope(1):
+            assert deadline.remaining() <= 1
+        assert 1 < deadline.remaining() <= 10
+    assert deadline.remaining() is None
+
+
+def test_scope_until_measures_from_entry_with_floor():
+    with deadline.scope_until(None, 60):
+        assert deadline.remaining() is None
+    with deadline.scope_until(time.time() + 300, 60):
+        assert 290 < deadline.remaining() <= 300
+    # 이미 지난 시각이어도 최소 실행 시간은 남긴다
+    with deadline.scope_until(time.time() - 30, 60):
+        assert 50 < deadline.remaining() <= 60
+
+
+def test_expired_and_request_timeout_floor():
+    with deadline.scope(0):
+        assert deadline.expired()
+        assert deadline.request_options() == {"timeout": 1.0}
+
+
+@pytest.mark.asyncio
+async def test_gather_partial_without_deadline_is_gather():
+    async def _val(x):
+        return x
+
+    assert await deadline.gather_partial([_val(1), _val(2)], [None, None]) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_gather_partial_uses_fallback_after_deadline():
+    cancelled = []
+
+    async def _fast():
+        return "fast"
+
+    async def _slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+        return "slow"
+
+    with deadline.scope(0.05):
+        result = await deadline.gather_partial([_fast(), _slow()], ["fb1", "fb2"])
+    assert result == ["fast", "fb2"]
+    # 미완료 작업은 취소가 끝날 때까지 기다린 뒤 반환한다
+    assert cancelled == [1]
@@ -0,0 +1,98 @@
+"""delivery 단위 테스트.
+
+메시지 묶음, RetryAfter 재시도, 채팅별 전송 순서, 토큰 버킷 속도 제한을 검증한다.
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from telegram.error import RetryAfter
+
+from src.bot import delivery
+from src.bot.delivery import _TokenBucket, chat_sender, pack_messages, send_batch, split_message
+
+
+def test_pack_messages_respects_limit_and_order():
+    messages = ["a" * 10, "b" * 10, "c" * 30, "d" * 5]
+    assert pack_messages(messages, limit=30) == ["a" * 10 + "\n\n" + "b" * 10, "c" * 30, "d" * 5]
+    # 한도보다 긴 메시지는 그대로 둔다
+    assert pack_messages(["x" * 50, "y"], limit=30) == ["x" * 50, "y"]
+
+
+def test_split_message_on_paragraph_and_line_boundaries():
+    text = "\n".join(["head", ""] + [f"user {n:03d}" for n in range(10)] + ["", "tail"])
+    parts = split_message(text, limit=30)
+    assert all(len(p) <= 30 for p in parts)
+    # 줄을 자르지 않고 순서를 유지한다
+    assert "\n".join(parts).replace("\n\n", "\n").split("\n") == [l for l in text.split("\n") if l]
+    assert split_message("x" * 70, limit=30) == ["x" * 30, "x" * 30, "x" * 10]
+    assert split_message("short") == ["short"]
+
+
+@pytest.mark.asyncio
+async def test_retry_after_backoff_then_success():
+    calls = []
+
+    async def _send(text, **kwargs):
+        calls.append(text)
+        if len(calls) == 1:
+            raise RetryAfter(0)
+        return "ok"
+
+    send = chat_sender(_send, 1001)
+    assert await send("hello") == "ok"
+    assert calls == ["hello", "hello"]
+
+
+@pytest.mark.asyncio
+async def test_retry_after_gives_up():
+    async def _send(text, **kwargs):
+        raise RetryAfter(0)
+
+    send = chat_sender(_send, 1002)
+    with pytest.raises(RetryAfter):
+        await send("hello")
+
+
+@pytest.mark.asyncio
+async def test_send_batch_keeps_chat_order():
+    """같은 채팅의 두 묶음은 섞이지 않고 먼저 시작한 묶음부터 전송된다."""
+    sent = []
+
+    async def _send(text, **kwargs):
+        sent.append(text)
+        await asyncio.sleep(0)
+
+    send = chat_sender(_send, 1003)
+    await asyncio.gather(
+        send_batch(send, "H1", ["a1", "a2"]),
+        send_batch(send, "H2", ["b1", "b2"]),
+    )
+    assert sent == ["H1", "a1", "a2", "H2", "b1", "b2"]
+
+
+@pytest.mark.asyncio
+async def test_send_batch_packs_when_enabled():
+    sent = []
+
+    async def _send(text, **kwargs):
+        sent.append((text, kwargs))
+
+    with patch.object(delivery, "DELIVERY_PACK_MESSAGES", True):
+        await send_batch(_send, "H", ["a", "b"])
+    assert sent == [
+        ("H", {"parse_mode": "HTML"}),
+        ("a\n\nb", {"parse_mode": "HTML", "disable_web_page_preview": True}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate():
+    bucket = _TokenBucket(rate=50, capacity=2)
+    started = time.monotonic()
+    for _ in range(5):
+        await bucket.acquire()
+    # 2개는 즉시, 나머지 3개는 초당 50개 속도로
+    assert time.monotonic() - started >= 3 / 50 * 0.9
@@ -0,0 +1,184 @@
+"""handlers 단위 테스트.
+
+제목 색인 매칭, 사용자별 잠금 테이블 정리, 같은 사용자·명령 요청 합류를 검증한다.
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from src.bot import handlers
+from src.bot.handlers import _LockTable, _TitleIndex, _match_article, _run_coalesced
+
+
+def _titles(rng, n):
+    words = ["서부지검", "대표", "소환", "구속영장", "청구", "경찰", "압수수색", "회계", "의혹", "수사", "확대", "법원"]
+    tags = ["", "", "[단독] ", "[속보] "]
+    return [
+        rng.choice(tags) + " ".join(rng.choice(words) for _ in range(rng.randint(1, 6)))
+        for _ in range(n)
+    ]
+
+
+def test_title_index_matches_linear_search():
+    """색인 매칭은 선형 탐색(_match_article)과 항상 같은 기사를 고른다."""
+    rng = random.Random(7)
+    articles = [{"title": t, "link": f"https://n.news.naver.com/{i}"} for i, t in enumerate(_titles(rng, 300))]
+    index = _TitleIndex(articles)
+
+    queries = [a["title"] for a in rng.sample(articles, 20)]
+    queries += [t.split("] ")[-1] for t in queries]
+    queries += [t[2:-2] for t in queries]
+    queries += _titles(rng, 60) + ["", "무관한 제목으로 매칭되지 않는 긴 문장입니다"]
+
+    for q in queries:
+        assert index.match(q) is _match_article(q, articles), q
+
+
+def test_collection_budget_keeps_analysis_reserve():
+    reserve = handlers.CHECK_ANALYSIS_RESERVE_SECONDS
+    total = handlers.SCHEDULE_MIN_RUN_SECONDS
+    assert handlers._collection_budget(600) == 600 - reserve
+    # 최소 실행 시간에서도 분석 몫이 온전히 남는다
+    assert total - handlers._collection_budget(total) >= reserve
+    # 그보다 짧으면 비율로 나눠 분석 몫이 0이 되지 않는다
+    assert 0 < handlers._collection_budget(60) < 60
+
+
+@pytest.mark.asyncio
+async def test_lock_table_evicts_when_last_user_leaves():
+    table = _LockTable()
+    entered = asyncio.Event()
+    release = asyncio.Event()
+    order = []
+
+    async def _holder():
+        async with table.hold("a"):
+            entered.set()
+            await release.wait()
+            order.append("holder")
+
+    async def _waiter():
+        async with table.hold("a"):
+            order.append("waiter")
+
+    holder = asyncio.create_task(_holder())
+    await entered.wait()
+    waiter = asyncio.create_task(_waiter())
+    await asyncio.sleep(0)
+
+    # 대기자가 있는 동안은 같은 잠금이 유지된다
+    assert table.locked("a") and not table.locked("b")
+    assert len(table) == 1
+    release.set()
+    await asyncio.gather(holder, waiter)
+    assert order == ["holder", "waiter"]
+    assert len(table) == 0
+
+    # 대기 중 취소돼도 참조 수가 줄어 항목이 남지 않는다
+    async with table.hold("a"):
+        cancelled = asyncio.create_task(_waiter())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+    assert len(table) == 0
+
+
+@pytest.mark.asyncio
+async def test_coalesced_second_request_attaches():
+    """실행 중인 같은 사용자·명령 요청은 새로 실행하지 않고 기존 실행을 기다린다."""
+    gate = asyncio.Event()
+    runs = []
+
+    async def _run():
+        runs.append(1)
+        await gate.wait()
+
+    first = asyncio.create_task(_run_coalesced("1", "check", _run))
+    await asyncio.sleep(0)
+    assert handlers._is_running("1", "check")
+    second = asyncio.create_task(_run_coalesced("1", "check", _run))
+    other = asyncio.create_task(_run_coalesced("1", "report", _run))
+    await asyncio.sleep(0)
+
+    gate.set()
+    assert await first is True
+    assert await second is False
+    assert await other is True
+    assert len(runs) == 2
+    assert not handlers._is_running("1", "check")
+
+
+@pytest.mark.asyncio
+async def test_coalesced_attach_ignores_owner_error():
+    gate = asyncio.Event()
+
+    async def _fail():
+        await gate.wait()
+        raise RuntimeError("boom")
+
+    owner = asyncio.create_task(_run_coalesced("2", "check", _fail))
+    await asyncio.sleep(0)
+    attached = asyncio.create_task(_run_coalesced("2", "check", _fail))
+    await asyncio.sleep(0)
+    gate.set()
+
+    with pytest.raises(RuntimeError):
+        await owner
+    assert await attached is False
+
+
+@pytest.mark.asyncio
+async def test_cancel_running_stops_owner_and_waiters():
+    """/cancel_check 취소는 실행 중인 작업과 합류한 요청 모두 정상 종료시키고 잠금을 반납한다."""
+    lock = asyncio.Lock()
+
+    async def _run():
+        async with lock:
+            await asyncio.sleep(10)
+
+    assert not handlers._cancel_running("3", "check")
+    owner = asyncio.create_task(_run_coalesced("3", "check", _run))
+    await asyncio.sleep(0)
+    attached = asyncio.create_task(_run_coalesced("3", "check", _run))
+    await asyncio.sleep(0)
+
+    assert handlers._cancel_running("3", "check")
+    assert await owner is True
+    assert await attached is False
+    assert not lock.locked()
+    assert not handlers._is_running("3", "check")
+
+
+@pytest.mark.asyncio
+async def test_deliver_check_results_does_not_resave_history_duplicates(tmp_path):
+    """이력 중복으로 뺀 기사는 전송 목록에만 보이고 reported_articles에 다시 쌓이지 않는다."""
+    from datetime import UTC, datetime
+
+    from src.storage import repository as repo
+    from src.storage.models import init_db
+
+    db = await init_db(str(tmp_path / "test.db"))
+    try:
+        await repo.upsert_journalist(db, "91", "사회부", ["a"], "k")
+        journalist = await repo.get_journalist(db, "91")
+        article = {"title": "경찰, 대표 구속", "link": "https://n.news.naver.com/1", "originallink": ""}
+        results = [
+            handlers._local_skip_entry(article, "이전 체크와 중복 (제목 유사)", "대표 구속", history_duplicate=True),
+            handlers._local_skip_entry({**article, "link": "https://n.news.naver.com/2"}, "포토"),
+        ]
+        sent = []
+
+        async def _send(text, **kwargs):
+            sent.append(text)
+
+        now = datetime.now(UTC)
+        await handlers._deliver_check_results(_send, db, journalist["id"], results, now, now, 0)
+
+        saved = await repo.get_recent_reported_articles(db, journalist["id"], hours=1)
+        assert [h["reason"] for h in saved] == ["포토"]
+        assert any("중복" in m for m in sent)
+    finally:
+        await db.close()
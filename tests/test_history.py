@@ -0,0 +1,87 @@
+"""history 필터 단위 테스트.
+
+URL/제목/핵심 팩트 기반 로컬 중복 제거와 관련 이력 선별을 검증한다.
+"""
+
+from src.filters.history import dedup_against_history, select_relevant_history
+
+
+def _article(title, link="https://n.news.naver.com/1", description=""):
+    return {
+        "title": title,
+        "link": link,
+        "originallink": link.replace("n.news.naver.com", "www.chosun.com"),
+        "description": description,
+    }
+
+
+def _history(topic, title="", urls=None, key_facts=None, summary=""):
+    return {
+        "topic_cluster": topic,
+        "title": title,
+        "article_urls": urls or [],
+        "key_facts": key_facts or [],
+        "summary": summary,
+        "category": "important",
+    }
+
+
+# --- dedup_against_history ---
+
+def test_dedup_url_match():
+    """이력의 article_urls와 URL이 같으면 제외한다."""
+    articles = [_article("서부지검 대표 소환", "https://n.news.naver.com/1")]
+    history = [_history("서부지검 수사", urls=["https://n.news.naver.com/1"])]
+    remaining, dropped = dedup_against_history(articles, history)
+    assert remaining == []
+    assert dropped[0][2] == "URL 일치"
+
+
+def test_dedup_title_similarity():
+    """태그만 다른 같은 제목은 제외한다."""
+    articles = [_article("[단독] 서부지검, 가상자산 거래소 대표 소환 조사", "https://n.news.naver.com/2")]
+    history = [_history("거래소 수사", title="서부지검, 가상자산 거래소 대표 소환 조사")]
+    remaining, dropped = dedup_against_history(articles, history)
+    assert remaining == []
+    assert dropped[0][2] == "제목 유사"
+
+
+def test_dedup_key_facts():
+    """이력의 핵심 팩트가 모두 포함되면 제외한다."""
+    articles = [_article("거래소 대표 소환", description="서부지검이 회계장부 압수 후 대표를 불렀다")]
+    history = [_history("거래소 수사", key_facts=["대표 소환", "회계장부 압수"])]
+    remaining, dropped = dedup_against_history(articles, history)
+    assert remaining == []
+    assert dropped[0][2] == "핵심 팩트 일치"
+
+
+def test_dedup_keeps_unrelated():
+    """관련 없는 기사는 남긴다."""
+    articles = [_article("마포경찰서, 보이스피싱 조직 검거")]
+    history = [_history("거래소 수사", title="서부지검, 가상자산 거래소 대표 소환 조사",
+                        urls=["https://n.news.naver.com/9"], key_facts=["대표 소환", "회계장부 압수"])]
+    remaining, dropped = dedup_against_history(articles, history)
+    assert remaining == articles
+    assert dropped == []
+
+
+def test_dedup_no_history():
+    articles = [_article("기사")]
+    assert dedup_against_history(articles, []) == (articles, [])
+
+
+# --- select_relevant_history ---
+
+def test_select_relevant_history():
+    """남은 기사와 주제가 겹치는 이력만 남긴다."""
+    articles = [{"title": "서부지검 가상자산 거래소 압수수색", "body": "서부지검이 19일 거래소를 압수수색했다."}]
+    history = [
+        _history("서부지검 거래소 수사"),
+        _history("부산 해운대 화재"),
+    ]
+    relevant = select_relevant_history(articles, history)
+    assert [h["topic_cluster"] for h in relevant] == ["서부지검 거래소 수사"]
+
+
+def test_select_relevant_history_empty_articles():
+    assert select_relevant_history([], [_history("주제")]) == []
@@ -0,0 +1,146 @@
+"""파이프라인 작업 큐 / 워커 단위 테스트.
+
+작업 가져가기 순서, 중복 없는 claim, 결과 대기·실패 전파, 취소, 끊긴 작업 회수,
+워커 실행 루프를 검증한다.
+"""
+
+import asyncio
+from datetime import UTC, datetime
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+from src import worker as worker_mod
+from src.bot import jobs
+from src.bot.jobs import PipelineJobError, decode_check_result, encode_check_result, run_job, wait_job
+from src.storage import repository as repo
+from src.storage.models import init_db
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path):
+    conn = await init_db(str(tmp_path / "test.db"))
+    yield conn
+    await conn.close()
+
+
+_JOURNALIST = {"id": 1, "telegram_id": "100"}
+
+
+@pytest.mark.asyncio
+async def test_claim_order_and_no_double_claim(db):
+    low = await repo.enqueue_pipeline_job(db, 1, "100", "report", 2, {})
+    high = await repo.enqueue_pipeline_job(db, 1, "100", "check", 0, {})
+
+    first = await repo.claim_pipeline_job(db, "w0")
+    second = await repo.claim_pipeline_job(db, "w1")
+    assert (first["id"], second["id"]) == (high, low)
+    assert first["status"] == "running" and first["attempts"] == 1
+    assert await repo.claim_pipeline_job(db, "w0") is None
+
+
+@pytest.mark.asyncio
+async def test_wait_job_returns_result_and_marks_delivered(db, monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_POLL_SECONDS", 0.01)
+    job_id = await repo.enqueue_pipeline_job(db, 1, "100", "check", 0, {})
+    waiter = asyncio.create_task(wait_job(db, job_id))
+    await asyncio.sleep(0.02)
+
+    await repo.claim_pipeline_job(db, "w0")
+    await repo.finish_pipeline_job(db, job_id, "w0", result={"ok": 1})
+    assert await waiter == {"ok": 1}
+    assert (await repo.get_pipeline_job(db, job_id))["delivered"]
+
+
+@pytest.mark.asyncio
+async def test_delivery_scope_marks_delivered_only_after_block(db):
+    job_id = await repo.enqueue_pipeline_job(db, 1, "100", "check", 0, {})
+    await repo.claim_pipeline_job(db, "w0")
+    await repo.finish_pipeline_job(db, job_id, "w0", result={"ok": 1})
+
+    # 전송 도중 실패하면 표시하지 않아 재시작 시 다시 전송된다
+    with pytest.raises(RuntimeError):
+        async with jobs.delivery_scope(db):
+            assert await wait_job(db, job_id) == {"ok": 1}
+            raise RuntimeError("send failed")
+    assert not (await repo.get_pipeline_job(db, job_id))["delivered"]
+
+    async with jobs.delivery_scope(db):
+        await wait_job(db, job_id)
+        assert not (await repo.get_pipeline_job(db, job_id))["delivered"]
+    assert (await repo.get_pipeline_job(db, job_id))["delivered"]
+
+
+@pytest.mark.asyncio
+async def test_wait_job_raises_worker_error(db, monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_POLL_SECONDS", 0.01)
+    job_id = await repo.enqueue_pipeline_job(db, 1, "100", "check", 0, {})
+    await repo.claim_pipeline_job(db, "w0")
+    await repo.finish_pipeline_job(db, job_id, "w0", error="API 키가 유효하지 않습니다.")
+    with pytest.raises(PipelineJobError, match="API 키"):
+        await wait_job(db, job_id)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_cancels_job(db, monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_POLL_SECONDS", 0.01)
+    job_id = await repo.enqueue_pipeline_job(db, 1, "100", "check", 0, {})
+    await repo.claim_pipeline_job(db, "w0")
+    waiter = asyncio.create_task(wait_job(db, job_id))
+    await asyncio.sleep(0.02)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert (await repo.get_pipeline_job(db, job_id))["status"] == "cancelled"
+    # 워커는 다음 생존 신호에서 취소를 알게 되고, 결과 기록은 무시된다
+    assert await repo.heartbeat_pipeline_jobs(db, "w0", [job_id]) == {job_id}
+    await repo.finish_pipeline_job(db, job_id, "w0", result=[])
+    assert (await repo.get_pipeline_job(db, job_id))["status"] == "cancelled"
+
+
+@pytest.mark.asyncio
+async def test_requeue_stale_jobs(db):
+    a = await repo.enqueue_pipeline_job(db, 1, "100", "check", 0, {})
+    await repo.claim_pipeline_job(db, "w0")
+    assert await repo.requeue_stale_pipeline_jobs(db, lease_seconds=60, max_attempts=2) == 0
+
+    # 생존 신호가 끊긴 작업은 다시 대기, 시도 한도를 넘기면 실패
+    await db.execute("UPDATE pipeline_jobs SET heartbeat_at = '2000-01-01'")
+    assert await repo.requeue_stale_pipeline_jobs(db, lease_seconds=60, max_attempts=2) == 1
+    assert (await repo.get_pipeline_job(db, a))["status"] == "queued"
+
+    await repo.claim_pipeline_job(db, "w1")
+    await db.execute("UPDATE pipeline_jobs SET heartbeat_at = '2000-01-01'")
+    await repo.requeue_stale_pipeline_jobs(db, lease_seconds=60, max_attempts=2)
+    job = await repo.get_pipeline_job(db, a)
+    assert job["status"] == "failed" and job["error"]
+
+
+def test_check_result_roundtrip():
+    now = datetime(2026, 1, 2, 3, 4, tzinfo=UTC)
+    outcome = ([{"title": "t"}], now, now, 3)
+    assert decode_check_result(encode_check_result(outcome)) == outcome
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_job_end_to_end(db, tmp_path, monkeypatch):
+    """봇과 워커가 각자의 DB 연결로 같은 큐를 공유한다."""
+    monkeypatch.setattr(jobs, "JOB_POLL_SECONDS", 0.01)
+    monkeypatch.setattr(worker_mod, "JOB_POLL_SECONDS", 0.01)
+
+    async def _execute(db, job):
+        return {"command": job["command"], "payload": job["payload"]}
+
+    worker_db = await init_db(str(tmp_path / "test.db"))
+    worker = worker_mod.Worker(worker_db, "w0", concurrency=2)
+    with patch.object(worker_mod, "execute_job", _execute):
+        runner = asyncio.create_task(worker.run())
+        result = await asyncio.wait_for(
+            run_job(db, _JOURNALIST, "report", 1, {"cache_id": 7}), timeout=5,
+        )
+        worker.stop()
+        await runner
+    await worker_db.close()
+    assert result == {"command": "report", "payload": {"cache_id": 7}}
@@ -0,0 +1,110 @@
+"""llm_client 단위 테스트.
+
+API 키별 클라이언트 재사용, LRU 축출, 공유 HTTP 클라이언트 종료를 검증한다.
+"""
+
+import pytest
+
+from src.agents import llm_client
+
+
+@pytest.fixture(autouse=True)
+async def _reset_pool():
+    yield
+    await llm_client.close_clients()
+
+
+@pytest.mark.asyncio
+async def test_same_key_reuses_client():
+    """같은 API 키는 같은 클라이언트를 반환한다."""
+    a = llm_client.get_client("sk-test-a")
+    b = llm_client.get_client("sk-test-a")
+    assert a is b
+
+
+@pytest.mark.asyncio
+async def test_clients_share_http_client():
+    """키가 달라도 HTTP 연결 풀은 공유한다."""
+    a = llm_client.get_client("sk-test-a")
+    b = llm_client.get_client("sk-test-b")
+    assert a is not b
+    assert a._client is b._client
+
+
+@pytest.mark.asyncio
+async def test_pool_keys_are_hashed():
+    """풀의 키에는 평문 API 키가 남지 않는다."""
+    llm_client.get_client("sk-test-secret")
+    assert all("sk-test-secret" not in k for k in llm_client._clients)
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction(monkeypatch):
+    """상한을 넘으면 가장 오래 쓰지 않은 클라이언트가 축출된다."""
+    monkeypatch.setattr(llm_client, "_MAX_CLIENTS", 2)
+    a = llm_client.get_client("sk-a")
+    llm_client.get_client("sk-b")
+    llm_client.get_client("sk-a")  # a를 최근 사용으로 갱신
+    llm_client.get_client("sk-c")  # b 축출
+    assert len(llm_client._clients) == 2
+    assert llm_client.get_client("sk-a") is a
+    assert llm_client._key_hash("sk-b") not in llm_client._clients
+
+
+@pytest.mark.asyncio
+async def test_close_clients_closes_http_client():
+    """종료 시 공유 HTTP 클라이언트가 닫히고 풀이 비워진다."""
+    client = llm_client.get_client("sk-test-a")
+    http_client = client._client
+    await llm_client.close_clients()
+    assert http_client.is_closed
+    assert not llm_client._clients
+    # 재사용 시 새 HTTP 클라이언트로 다시 만든다
+    assert llm_client.get_client("sk-test-a")._client is not http_client
+
+
+def _status_error(code: int):
+    import anthropic
+    import httpx
+
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    return anthropic.APIStatusError("error", response=httpx.Response(code, request=request), body=None)
+
+
+@pytest.mark.asyncio
+async def test_create_message_without_deadline_uses_sdk_retries():
+    """마감이 없으면 SDK 재시도를 그대로 쓴다."""
+    from unittest.mock import AsyncMock, MagicMock
+
+    client = MagicMock()
+    client.messages.create = AsyncMock(return_value="ok")
+    assert await llm_client.create_message(client, model="m") == "ok"
+    client.with_options.assert_not_called()
+    assert client.messages.create.await_args.kwargs == {"model": "m"}
+
+
+@pytest.mark.asyncio
+async def test_create_message_with_deadline_caps_retries(monkeypatch):
+    """마감이 있으면 SDK 재시도를 끄고, 남은 시간이 대기보다 짧으면 재시도하지 않는다."""
+    from unittest.mock import AsyncMock, MagicMock
+
+    from src import deadline
+
+    monkeypatch.setattr(llm_client, "_RETRY_BACKOFF", 0.01)
+    no_retry = MagicMock()
+    no_retry.messages.create = AsyncMock(side_effect=[_status_error(529), "ok"])
+    client = MagicMock()
+    client.with_options = MagicMock(return_value=no_retry)
+
+    with deadline.scope(30):
+        assert await llm_client.create_message(client, model="m") == "ok"
+    client.with_options.assert_called_once_with(max_retries=0)
+    assert no_retry.messages.create.await_count == 2
+    assert no_retry.messages.create.await_args.kwargs["timeout"] <= 30
+
+    no_retry.messages.create = AsyncMock(side_effect=_status_error(529))
+    monkeypatch.setattr(llm_client, "_RETRY_BACKOFF", 60)
+    with deadline.scope(30):
+        with pytest.raises(Exception):
+            await llm_client.create_message(client, model="m")
+    assert no_retry.messages.create.await_count == 1
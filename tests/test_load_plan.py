@@ -0,0 +1,80 @@
+"""load_plan 예약 분산 / 시뮬레이션 단위 테스트."""
+
+from src.bot.load_plan import Due, plan_minute, simulate, spread_window
+
+_WINDOWS = {"check": 120.0, "report": 120.0}
+
+
+def test_plan_spreads_checks_and_batches_departments():
+    entries = [Due("check", j, "09:00", str(j)) for j in range(4)]
+    entries += [
+        Due("report", 10, "09:00", "10", department="사회부"),
+        Due("report", 11, "09:00", "11", department="경제부"),
+        Due("report", 12, "09:00", "12", department="사회부"),
+        Due("prewarm", 13, "09:10", "13", second=37),
+    ]
+    planned = plan_minute(entries, _WINDOWS)
+    offsets = {(e.kind, e.journalist_id): off for off, e in planned}
+
+    assert [offsets[("check", j)] for j in range(4)] == [0, 30, 60, 90]
+    # 같은 부서 report는 같은 시각, 큰 부서 먼저
+    assert offsets[("report", 10)] == offsets[("report", 12)] == 0
+    assert offsets[("report", 11)] == 60
+    assert offsets[("prewarm", 13)] == 37
+    assert [off for off, _ in planned] == sorted(off for off, _ in planned)
+
+
+def test_spread_window_respects_sla():
+    assert spread_window("check", spread=300, sla=600) <= 600 - 1
+    assert spread_window("report", spread=300, sla=10) == 0
+
+
+def test_simulate_spreading_reduces_peak_and_latency():
+    schedules = [
+        {"journalist_id": j, "command": "check", "time_kst": "09:00", "department": "사회부"}
+        for j in range(40)
+    ]
+    run = {"check": 30.0, "report": 60.0}
+    burst = simulate(schedules, capacity=5, spread=False, run_seconds=run)
+    spread = simulate(schedules, capacity=5, spread=True, run_seconds=run)
+
+    assert burst["peak_demand"] == 40
+    assert spread["peak_demand"] == 1
+    assert spread["peak_waiting"] < burst["peak_waiting"]
+    assert burst["peak_running"] == spread["peak_running"] == 5
+    # 40건 × 30초 / 5슬롯 = 240초가 마지막 완료
+    assert burst["max_latency"] == 240
+    assert burst["runs"] == spread["runs"] == 40
+
+
+def test_projected_calls_share_department_reports(monkeypatch):
+    from src.bot import load_plan
+
+    monkeypatch.setattr(load_plan, "shared_analysis_enabled", lambda: False)
+    monkeypatch.setattr(load_plan, "REPORT_SHARED_API_KEY", "shared-key")
+    monkeypatch.setattr(load_plan, "DEPARTMENT_PROFILES", {"사회부": {"report_keywords": ["a", "b", "c"]}})
+    schedules = [
+        {"journalist_id": 1, "command": "check", "time_kst": "09:00", "keywords": ["x", "y"]},
+        {"journalist_id": 2, "command": "report", "time_kst": "09:00", "department": "사회"},
+        {"journalist_id": 3, "command": "report", "time_kst": "09:01", "department": "사회부"},
+    ]
+    # 네이버: check 키워드 2 + 같은 공유 구간의 부서 키워드 3 (한 번만)
+    # Anthropic: check 2 + 부서 필터 1 + 사용자별 분석 2
+    assert load_plan.projected_calls(schedules) == {"naver": 5, "anthropic": 5}
+
+    # 지정 키가 없어도 검색은 부서 공유, LLM 필터만 사용자(키)별로 실행한다
+    monkeypatch.setattr(load_plan, "REPORT_SHARED_API_KEY", "")
+    assert load_plan.projected_calls(schedules) == {"naver": 5, "anthropic": 6}
+
+
+def test_capacity_forecast_reports_peak_minutes():
+    from src.bot.load_plan import capacity_forecast
+
+    schedules = [
+        {"journalist_id": j, "command": "check", "time_kst": t, "keywords": ["k"]}
+        for j, t in enumerate(["09:00"] * 3 + ["12:00"] * 2 + ["18:30"])
+    ]
+    fc = capacity_forecast(schedules, capacity=2, top=2)
+    assert sum(fc["starts_by_minute"].values()) == 6
+    assert fc["peak_minutes"][0][0] // 60 == 9
+    assert fc["calls"]["naver"] == 6
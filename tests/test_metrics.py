@@ -0,0 +1,142 @@
+"""metrics 단위 테스트.
+
+단계 계측 기록, 롤링 윈도우, 요약 통계, Prometheus 내보내기를 검증한다.
+"""
+
+import asyncio
+
+import pytest
+
+from src import metrics
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_stage_records_duration_and_counts():
+    with metrics.stage("check", "search") as st:
+        st["out"] = 42
+    with metrics.stage("check", "scrape", 10) as st:
+        st["out"] = 9
+        st["bytes"] = 2048
+
+    summary = metrics.summary()
+    assert summary[("check", "search")]["count"] == 1
+    assert summary[("check", "search")]["avg_out"] == 42
+    assert summary[("check", "search")]["avg_in"] is None
+    assert summary[("check", "scrape")]["avg_in"] == 10
+    assert summary[("check", "scrape")]["avg_bytes"] == 2048
+
+
+def test_stage_recorded_with_status_on_error():
+    with pytest.raises(ValueError):
+        with metrics.stage("report", "analysis"):
+            raise ValueError("boom")
+    with pytest.raises(TimeoutError):
+        with metrics.stage("report", "analysis"):
+            raise TimeoutError()
+    with metrics.stage("report", "analysis"):
+        pass
+
+    st = metrics.summary()[("report", "analysis")]
+    assert st["count"] == 3
+    assert st["errors"] == 2
+    text = metrics.render_prometheus()
+    assert 'tasa_stage_duration_seconds_count{pipeline="report",stage="analysis",status="error"} 1' in text
+    assert 'tasa_stage_duration_seconds_count{pipeline="report",stage="analysis",status="timeout"} 1' in text
+
+
+@pytest.mark.asyncio
+async def test_stage_recorded_on_cancel():
+    async def _run():
+        with metrics.stage("check", "scrape"):
+            await asyncio.sleep(10)
+
+    task = asyncio.create_task(_run())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert 'status="cancelled"' in metrics.render_prometheus()
+
+
+def test_rolling_window_and_percentiles(monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_WINDOW", 10)
+    for i in range(1, 21):
+        metrics.record("report", "llm_filter", float(i))
+
+    st = metrics.summary()[("report", "llm_filter")]
+    # 최근 10건(11~20)만 유지
+    assert st["count"] == 10
+    assert st["max"] == 20.0
+    assert st["p50"] == 16.0
+    assert st["p90"] == 20.0
+
+
+def test_render_prometheus_histogram_and_counters():
+    metrics.record("check", "search", 0.3)
+    metrics.record("check", "search", 3.0)
+    metrics.cache_lookup("llm_client", True)
+    metrics.cache_lookup("llm_client", False)
+    metrics.cache_lookup("llm_client", True)
+    sem = metrics.TrackedSemaphore(5)
+    metrics.register_semaphore("test_pipeline", sem)
+
+    text = metrics.render_prometheus()
+
+    assert 'tasa_stage_duration_seconds_bucket{pipeline="check",stage="search",status="ok",le="0.25"} 0' in text
+    assert 'tasa_stage_duration_seconds_bucket{pipeline="check",stage="search",status="ok",le="0.5"} 1' in text
+    assert 'tasa_stage_duration_seconds_bucket{pipeline="check",stage="search",status="ok",le="+Inf"} 2' in text
+    assert 'tasa_stage_duration_seconds_count{pipeline="check",stage="search",status="ok"} 2' in text
+    assert 'tasa_cache_requests_total{cache="llm_client",result="hit"} 2' in text
+    assert "tasa_test_pipeline_in_use 0" in text
+    assert "tasa_process_rss_bytes " in text
+
+
+@pytest.mark.asyncio
+async def test_tracked_semaphore_counts_in_use_and_waiting():
+    """점유·대기 수는 내부 속성이 아니라 래퍼가 직접 센다. 취소된 대기도 빠진다."""
+    sem = metrics.TrackedSemaphore(1)
+    async with sem:
+        waiter = asyncio.create_task(sem.__aenter__())
+        await asyncio.sleep(0)
+        assert (sem.in_use, sem.waiting) == (1, 1)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert (sem.in_use, sem.waiting) == (1, 0)
+    assert (sem.in_use, sem.waiting) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_http_response_hook_counts_status():
+    hook = metrics.http_response_hook("naver")
+    await hook(type("R", (), {"status_code": 429})())
+    await hook(type("R", (), {"status_code": 200})())
+    assert 'tasa_http_responses_total{service="naver",status="429"} 1' in metrics.render_prometheus()
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint():
+    await metrics.start_server("127.0.0.1", 0)
+    try:
+        port = metrics._server.sockets[0].getsockname()[1]
+
+        async def _get(path):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+            await writer.drain()
+            data = await reader.read()
+            writer.close()
+            return data.decode()
+
+        ok = await _get("/metrics")
+        assert ok.startswith("HTTP/1.1 200")
+        assert "tasa_stage_duration_seconds" in ok
+        assert (await _get("/")).startswith("HTTP/1.1 404")
+    finally:
+        await metrics.stop_server()
@@ -0,0 +1,95 @@
+"""recovery 단위 테스트.
+
+문자열/절단 JSON 복구와 이어쓰기 메시지 구성을 검증한다.
+"""
+
+from unittest.mock import MagicMock
+
+from src.agents.recovery import (
+    build_continuation_messages, complete_items, covered_indices, repair_json_array,
+)
+
+
+# --- repair_json_array ---
+
+def test_repair_valid_array():
+    """정상 JSON 배열은 그대로 파싱된다."""
+    items, partial = repair_json_array('[{"a": 1}, {"a": 2}]')
+    assert items == [{"a": 1}, {"a": 2}]
+    assert partial is False
+
+
+def test_repair_code_fence():
+    """코드 펜스로 감싼 배열도 파싱된다."""
+    items, partial = repair_json_array('```json\n[{"a": 1}]\n```')
+    assert items == [{"a": 1}]
+    assert partial is False
+
+
+def test_repair_double_encoded():
+    """이중 인코딩된 배열 문자열도 파싱된다."""
+    items, _ = repair_json_array('"[{\\"a\\": 1}]"')
+    assert items == [{"a": 1}]
+
+
+def test_repair_truncated_salvages_complete_elements():
+    """잘린 배열에서 완결된 요소만 회수한다."""
+    raw = '[{"title": "A", "idx": [1, 2]}, {"title": "B]}", "idx": [3]}, {"title": "C", "id'
+    items, partial = repair_json_array(raw)
+    assert partial is True
+    assert items == [{"title": "A", "idx": [1, 2]}, {"title": "B]}", "idx": [3]}]
+
+
+def test_repair_truncated_literals():
+    """숫자 요소 배열도 완결된 요소만 회수한다."""
+    items, partial = repair_json_array("[1, 2, 3")
+    assert partial is True
+    assert items == [1, 2]
+
+    items, _ = repair_json_array("[1, 2, 3]")
+    assert items == [1, 2, 3]
+
+
+def test_repair_no_array():
+    """배열 형태가 없으면 None."""
+    items, partial = repair_json_array("분석 불가")
+    assert items is None
+    assert partial is False
+
+
+# --- complete_items / covered_indices ---
+
+def test_complete_items_drops_partial():
+    """필수 필드가 빠진 요소는 제거된다."""
+    items = [{"a": 1, "b": 2}, {"a": 1}, "str"]
+    assert complete_items(items, ["a", "b"]) == [{"a": 1, "b": 2}]
+
+
+def test_covered_indices():
+    items = [
+        {"source_indices": [1], "merged_indices": [3, 4]},
+        {"source_indices": [2]},
+        {"source_indices": ["x"], "merged_indices": None},
+    ]
+    assert covered_indices(items) == {1, 2, 3, 4}
+
+
+# --- build_continuation_messages ---
+
+def test_build_continuation_messages():
+    """이어쓰기 메시지: user → assistant(tool_use) → user(tool_result)."""
+    block = MagicMock()
+    block.type = "tool_use"
+    block.name = "submit_analysis"
+    block.id = "toolu_1"
+    message = MagicMock()
+    message.content = [block]
+
+    msgs = build_continuation_messages(
+        "프롬프트", message, "submit_analysis", {"results": []}, "이어서 제출하라",
+    )
+    assert [m["role"] for m in msgs] == ["user", "assistant", "user"]
+    assert msgs[1]["content"][0]["id"] == "toolu_1"
+    assert msgs[1]["content"][0]["input"] == {"results": []}
+    assert msgs[2]["content"][0]["tool_use_id"] == "toolu_1"
+    assert msgs[2]["content"][0]["content"] == "이어서 제출하라"
@@ -3,14 +3,20 @@
 Claude API 호출은 mock, 프롬프트 조립과 tool_use 응답 처리만 검증한다.
 """
 
+import asyncio
+
+import anthropic
+import httpx
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 
+from src import metrics
 from src.agents.report_agent import (
     _build_system_prompt,
     _build_user_prompt,
     _dept_label,
     analyze_report_articles,
+    filter_articles,
 )
 
 
@@ -161,7 +167,7 @@ async def test_analyze_report_articles_scenario_a():
     mock_client = AsyncMock()
     mock_client.messages.create = AsyncMock(return_value=mock_response)
 
-    with patch("src.agents.report_agent.anthropic.AsyncAnthropic", return_value=mock_client):
+    with patch("src.agents.report_agent.get_client", return_value=mock_client):
         result = await analyze_report_articles(
             api_key="sk-test",
             articles=[{"title": "t", "publisher": "p", "body": "b", "originallink": "u", "pubDate": "d"}],
@@ -201,7 +207,7 @@ async def test_analyze_report_articles_scenario_b():
     mock_client.messages.create = AsyncMock(return_value=mock_response)
 
     existing = [{"id": 1, "title": "기존", "summary": "요약", "key_facts": ["대표 소환"]}]
-    with patch("src.agents.report_agent.anthropic.AsyncAnthropic", return_value=mock_client):
+    with patch("src.agents.report_agent.get_client", return_value=mock_client):
         result = await analyze_report_articles(
             api_key="sk-test",
             articles=[{"title": "t", "publisher": "p", "body": "b", "originallink": "u", "pubDate": "d"}],
@@ -224,7 +230,7 @@ async def test_analyze_report_articles_empty():
     mock_client.messages.create = AsyncMock(return_value=mock_response)
 
     existing = [{"id": 1, "title": "기존", "summary": "요약", "key_facts": ["팩트"]}]
-    with patch("src.agents.report_agent.anthropic.AsyncAnthropic", return_value=mock_client):
+    with patch("src.agents.report_agent.get_client", return_value=mock_client):
         result = await analyze_report_articles(
             api_key="sk-test",
             articles=[],
@@ -251,7 +257,7 @@ async def test_analyze_report_articles_no_tool_use():
     mock_client = AsyncMock()
     mock_client.messages.create = AsyncMock(return_value=response)
 
-    with patch("src.agents.report_agent.anthropic.AsyncAnthropic", return_value=mock_client):
+    with patch("src.agents.report_agent.get_client", return_value=mock_client):
         with pytest.raises(RuntimeError, match="파싱 실패"):
             await analyze_report_articles(
                 api_key="sk-test",
@@ -263,3 +269,117 @@ async def test_analyze_report_articles_no_tool_use():
 
     # 3회 호출 (초회 + 재시도 2회)
     assert mock_client.messages.create.call_count == 3
+
+
+# --- filter_articles (청크 병렬) ---
+
+def _make_filter_response(indices: list[int]):
+    tool_block = MagicMock()
+    tool_block.type = "tool_use"
+    tool_block.name = "filter_news"
+    tool_block.input = {"selected_indices": indices}
+
+    response = MagicMock()
+    response.stop_reason = "tool_use"
+    response.content = [tool_block]
+    response.usage = MagicMock(input_tokens=300, output_tokens=20)
+    return response
+
+
+@pytest.mark.asyncio
+async def test_filter_articles_chunks_merge_in_order_and_retry_failed_only():
+    """청크별로 호출해 원래 순서로 병합하고, 실패한 청크만 재시도한다."""
+    metrics.reset()
+    articles = [
+        {"title": f"기사{i}", "description": "", "originallink": ""}
+        for i in range(1, 121)
+    ]
+    calls: dict[str, int] = {}
+
+    async def _create(**kwargs):
+        first_line = kwargs["messages"][0]["content"].split("\n")[0]
+        calls[first_line] = calls.get(first_line, 0) + 1
+        # 두 번째 청크(기사51~)는 첫 시도에 tool_use 없이 실패
+        if "기사51" in first_line and calls[first_line] == 1:
+            response = MagicMock()
+            response.stop_reason = "end_turn"
+            response.content = []
+            response.usage = MagicMock(input_tokens=300, output_tokens=0)
+            return response
+        return _make_filter_response([2, 1])
+
+    mock_client = AsyncMock()
+    mock_client.with_options = MagicMock(return_value=mock_client)
+    mock_client.messages.create = AsyncMock(side_effect=_create)
+
+    with patch("src.agents.report_agent.get_client", return_value=mock_client):
+        result = await filter_articles("sk-test", articles, "사회")
+
+    assert [a["title"] for a in result] == ["기사1", "기사2", "기사51", "기사52", "기사101", "기사102"]
+    assert sorted(calls.values()) == [1, 1, 2]
+    # 재시도는 청크 단위로만 한다
+    mock_client.with_options.assert_called_once_with(max_retries=0)
+    # 청크 시도마다 지연을 기록한다 (tool_use 없는 응답은 error)
+    samples = metrics.summary()[("report", "llm_filter_chunk")]
+    assert (samples["count"], samples["errors"]) == (4, 1)
+
+
+@pytest.mark.asyncio
+async def test_filter_articles_failure_cancels_sibling_chunks():
+    """한 청크가 복구 불가능한 오류로 실패하면 다른 청크 호출을 취소하고 오류를 올린다."""
+    articles = [{"title": f"기사{i}", "description": "", "originallink": ""} for i in range(1, 101)]
+    cancelled = []
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    error = anthropic.AuthenticationError(
+        "invalid key", response=httpx.Response(401, request=request), body=None,
+    )
+
+    async def _create(**kwargs):
+        if "기사1 " in kwargs["messages"][0]["content"].split("\n")[0]:
+            raise error
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    mock_client = AsyncMock()
+    mock_client.with_options = MagicMock(return_value=mock_client)
+    mock_client.messages.create = AsyncMock(side_effect=_create)
+
+    with patch("src.agents.report_agent.get_client", return_value=mock_client):
+        with pytest.raises(anthropic.AuthenticationError):
+            await filter_articles("sk-test", articles, "사회")
+
+    # 인증 오류는 재시도하지 않고, 남은 청크는 취소된다
+    assert mock_client.messages.create.call_count == 2
+    assert cancelled == [1]
+
+
+@pytest.mark.asyncio
+async def test_filter_articles_passes_deadline_timeout_and_stops_at_deadline():
+    """마감이 있으면 호출 timeout을 남은 시간으로 두고, 마감 시간 초과면 청크 전체를 통과시킨다."""
+    from src import deadline
+
+    articles = [{"title": f"기사{i}", "description": "", "originallink": ""} for i in range(1, 4)]
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+
+    async def _create(**kwargs):
+        await asyncio.sleep(0.05)
+        raise anthropic.APITimeoutError(request=request)
+
+    mock_client = AsyncMock()
+    mock_client.with_options = MagicMock(return_value=mock_client)
+    mock_client.messages.create = AsyncMock(side_effect=_create)
+
+    with patch("src.agents.report_agent.get_client", return_value=mock_client):
+        with deadline.scope(0.01):
+            result = await filter_articles("sk-test", articles, "사회")
+        assert mock_client.messages.create.await_args.kwargs["timeout"] == 1.0
+        assert result == articles
+        assert mock_client.messages.create.await_count == 1
+
+        # 이미 마감이 지났으면 호출하지 않는다
+        with deadline.scope(0):
+            assert await filter_articles("sk-test", articles, "사회") == articles
+        assert mock_client.messages.create.await_count == 1
@@ -0,0 +1,304 @@
+"""report_engine 단위 테스트.
+
+부서 단위 single-flight 수집(검색·스크래핑 공유, LLM 필터 키별), 사용자 윈도우 필터, 후보 이력 diff를 검증한다.
+"""
+
+import asyncio
+from datetime import UTC, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import anthropic
+import httpx
+import pytest
+
+from src.bot import report_engine
+from src.bot.report_engine import articles_since, diff_candidates
+
+_KST = timezone(timedelta(hours=9))
+
+
+@pytest.fixture(autouse=True)
+def _clear_engine():
+    caches = (
+        report_engine._collections, report_engine._snapshots, report_engine._candidates,
+        report_engine._latest, report_engine._latest_filtered, report_engine._bodies,
+    )
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
+
+def _raw(title, link, pub):
+    return {
+        "title": title,
+        "link": link,
+        "originallink": link.replace("n.news.naver.com", "www.chosun.com"),
+        "description": "",
+        "pubDate": pub,
+    }
+
+
+def _article(title, link, pub_str):
+    return {"title": title, "link": link, "publisher": "조선일보", "body": "", "pubDate": pub_str}
+
+
+@pytest.mark.asyncio
+async def test_department_articles_single_flight():
+    """같은 부서·구간의 동시 요청은 검색·필터·스크래핑을 한 번만 실행한다."""
+    pub = datetime.now(_KST)
+    raw = [_raw("경찰, 대표 구속", "https://n.news.naver.com/1", pub)]
+
+    async def _search(*args, **kwargs):
+        await asyncio.sleep(0)
+        return raw
+
+    search = AsyncMock(side_effect=_search)
+    llm_filter = AsyncMock(side_effect=lambda key, articles, dept: articles)
+    scrape = AsyncMock(return_value={})
+
+    with patch.object(report_engine, "REPORT_SHARED_API_KEY", "shared-key"), \
+            patch.object(report_engine, "search_news", search), \
+            patch.object(report_engine, "filter_by_publisher", side_effect=lambda a: a), \
+            patch.object(report_engine, "filter_articles", llm_filter), \
+            patch.object(report_engine, "fetch_articles_batch", scrape):
+        first, second = await asyncio.gather(
+            report_engine.get_department_articles("사회부", "key-a"),
+            report_engine.get_department_articles("사회", "key-b"),
+        )
+
+    assert first is second
+    assert search.await_count == 1
+    assert llm_filter.await_count == 1
+    assert llm_filter.await_args.args[0] == "shared-key"
+    assert [a["link"] for a in first["articles"]] == ["https://n.news.naver.com/1"]
+
+
+def _status_error(code: int) -> anthropic.APIStatusError:
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    return anthropic.APIStatusError("error", response=httpx.Response(code, request=request), body=None)
+
+
+@pytest.mark.asyncio
+async def test_without_shared_key_each_key_computes_separately():
+    """지정 키가 없으면 LLM 필터를 요청자 키별로 실행하고, 한 키의 오류는 다른 요청자에게 가지 않는다."""
+    raw = [_raw("경찰, 대표 구속", "https://n.news.naver.com/1", datetime.now(_KST))]
+    search = AsyncMock(return_value=raw)
+
+    async def _filter(key, articles, dept):
+        await asyncio.sleep(0)
+        if key == "bad-key":
+            raise _status_error(401)
+        return articles
+
+    with patch.object(report_engine, "REPORT_SHARED_API_KEY", ""), \
+            patch.object(report_engine, "search_news", search), \
+            patch.object(report_engine, "filter_by_publisher", side_effect=lambda a: a), \
+            patch.object(report_engine, "filter_articles", AsyncMock(side_effect=_filter)), \
+            patch.object(report_engine, "fetch_articles_batch", AsyncMock(return_value={})):
+        bad, good = await asyncio.gather(
+            report_engine.get_department_articles("사회부", "bad-key"),
+            report_engine.get_department_articles("사회부", "good-key"),
+            return_exceptions=True,
+        )
+
+    assert isinstance(bad, anthropic.APIStatusError)
+    assert [a["link"] for a in good["articles"]] == ["https://n.news.naver.com/1"]
+    # 검색은 키와 무관하게 한 번만 실행한다
+    assert search.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_keys_share_search_and_scrape_but_filter_separately():
+    """지정 키가 없어도 검색·스크래핑은 부서 공유, LLM 필터만 키별로 실행한다."""
+    raw = [_raw("경찰, 대표 구속", "https://n.news.naver.com/1", datetime.now(_KST))]
+
+    async def _search(*args, **kwargs):
+        await asyncio.sleep(0)
+        return raw
+
+    search = AsyncMock(side_effect=_search)
+    llm_filter = AsyncMock(side_effect=lambda key, articles, dept: articles)
+    scrape = AsyncMock(return_value={"https://n.news.naver.com/1": "본문"})
+
+    with patch.object(report_engine, "REPORT_SHARED_API_KEY", ""), \
+            patch.object(report_engine, "search_news", search), \
+            patch.object(report_engine, "filter_by_publisher", side_effect=lambda a: a), \
+            patch.object(report_engine, "filter_articles", llm_filter), \
+            patch.object(report_engine, "fetch_articles_batch", scrape), \
+            patch.object(report_engine, "split_by_body_rules", side_effect=lambda a, b: (a, [])):
+        first, second = await asyncio.gather(
+            report_engine.get_department_articles("사회부", "key-a"),
+            report_engine.get_department_articles("사회부", "key-b"),
+        )
+
+    assert first is not second
+    assert search.await_count == 1
+    assert scrape.await_count == 1
+    assert sorted(c.args[0] for c in llm_filter.await_args_list) == ["key-a", "key-b"]
+    assert first["articles"][0]["body"] == second["articles"][0]["body"] == "본문"
+
+
+@pytest.mark.asyncio
+async def test_shared_key_error_falls_back_to_own_key():
+    """지정 키가 한도 오류를 내면 각 요청자는 자기 키로 다시 계산한다."""
+    raw = [_raw("경찰, 대표 구속", "https://n.news.naver.com/1", datetime.now(_KST))]
+
+    async def _filter(key, articles, dept):
+        if key == "shared-key":
+            raise _status_error(429)
+        return articles
+
+    llm_filter = AsyncMock(side_effect=_filter)
+    with patch.object(report_engine, "REPORT_SHARED_API_KEY", "shared-key"), \
+            patch.object(report_engine, "search_news", AsyncMock(return_value=raw)), \
+            patch.object(report_engine, "filter_by_publisher", side_effect=lambda a: a), \
+            patch.object(report_engine, "filter_articles", llm_filter), \
+            patch.object(report_engine, "fetch_articles_batch", AsyncMock(return_value={})):
+        snapshot = await report_engine.get_department_articles("사회부", "own-key")
+
+    assert [c.args[0] for c in llm_filter.await_args_list] == ["shared-key", "own-key"]
+    assert [a["link"] for a in snapshot["articles"]] == ["https://n.news.naver.com/1"]
+
+
+@pytest.mark.asyncio
+async def test_prewarm_then_delta_collection():
+    """사전 계산 후 요청은 이후 구간만 검색하고 새 link만 필터·스크래핑한다."""
+    pub = datetime.now(_KST)
+    first = [_raw("경찰, 대표 구속", "https://n.news.naver.com/1", pub)]
+    second = [_raw("검찰, 대표 기소", "https://n.news.naver.com/2", pub)] + first
+
+    search = AsyncMock(side_effect=[first, second])
+    llm_filter = AsyncMock(side_effect=lambda key, articles, dept: articles)
+    scrape = AsyncMock(return_value={})
+
+    with patch.object(report_engine, "search_news", search), \
+            patch.object(report_engine, "filter_by_publisher", side_effect=lambda a: a), \
+            patch.object(report_engine, "filter_articles", llm_filter), \
+            patch.object(report_engine, "fetch_articles_batch", scrape):
+        warm = await report_engine.prewarm_department_articles("사회부", "key")
+        snapshot = await report_engine.get_department_articles("사회부", "key")
+
+    # 사전 계산 결과는 구간 캐시가 아니라 델타 기준으로만 쓰인다
+    assert snapshot is not warm
+    delta_since = search.await_args_list[1].args[1]
+    assert delta_since >= warm["now"] - timedelta(seconds=report_engine._DELTA_OVERLAP_SECONDS)
+    assert scrape.await_args_list[1].args[0] == ["https://n.news.naver.com/2"]
+    assert [a["link"] for a in snapshot["articles"]] == [
+        "https://n.news.naver.com/2", "https://n.news.naver.com/1",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_delta_prunes_seen_links_before_search_window():
+    """델타 검색 시작보다 오래된 link는 seen_links에서 빠진다."""
+    now = datetime.now(_KST)
+    old = [_raw("경찰, 대표 구속", "https://n.news.naver.com/old", now - timedelta(hours=2))]
+    recent = [_raw("검찰, 대표 기소", "https://n.news.naver.com/new", now)]
+
+    with patch.object(report_engine, "search_news", AsyncMock(side_effect=[old + recent, recent])), \
+            patch.object(report_engine, "filter_by_publisher", side_effect=lambda a: a), \
+            patch.object(report_engine, "filter_articles", AsyncMock(side_effect=lambda k, a, d: a)), \
+            patch.object(report_engine, "fetch_articles_batch", AsyncMock(return_value={})):
+        await report_engine.prewarm_department_articles("사회부", "key")
+        warm_seen = set(report_engine._latest["사회부"]["seen_links"])
+        await report_engine.get_department_articles("사회부", "key")
+
+    assert warm_seen == {"https://n.news.naver.com/old", "https://n.news.naver.com/new"}
+    assert set(report_engine._latest["사회부"]["seen_links"]) == {"https://n.news.naver.com/new"}
+
+
+def test_prewarm_time_spread_within_lead_window():
+    """사전 계산 시각은 예약 시각 전 lead 구간 안에서 사용자별로 분산된다."""
+    from datetime import time
+
+    from src.bot import scheduler
+
+    job_time = time(0, 5, tzinfo=_KST)
+    lead = timedelta(minutes=scheduler.REPORT_PREWARM_LEAD_MINUTES)
+    times = set()
+    for jid in range(1, 20):
+        t = scheduler._prewarm_time(job_time, jid)
+        before = (timedelta(minutes=5) - timedelta(hours=t.hour, minutes=t.minute, seconds=t.second)) % timedelta(days=1)
+        assert timedelta(seconds=scheduler._PREWARM_MIN_GAP_SECONDS) < before <= lead
+        times.add(t)
+    assert len(times) > 1
+
+
+def test_articles_since_filters_window_and_copies():
+    snapshot = {"articles": [
+        _article("A", "https://n.news.naver.com/1", "2026-03-05 09:10"),
+        _article("B", "https://n.news.naver.com/2", "2026-03-05 07:00"),
+    ]}
+    since = datetime(2026, 3, 5, 9, 10, 30, tzinfo=_KST).astimezone(UTC)
+    result = articles_since(snapshot, since)
+    assert [a["title"] for a in result] == ["A"]
+    result[0]["title"] = "changed"
+    assert snapshot["articles"][0]["title"] == "A"
+
+
+def test_diff_candidates_scenario_a_drops_history():
+    articles = [_article("경찰, 대표 구속영장 신청", "https://n.news.naver.com/1", "2026-03-05 09:00")]
+    candidates = [{"title": "경찰, 대표 구속영장 신청", "url": "https://n.news.naver.com/1", "summary": "s"}]
+    since = datetime(2026, 3, 5, 8, 0, tzinfo=_KST)
+
+    assert diff_candidates(candidates, articles, since, [], None) == candidates
+    history = [{"title": "경찰, 대표 구속영장 신청"}]
+    assert diff_candidates(candidates, articles, since, history, None) == []
+
+
+def test_diff_candidates_scenario_b_actions():
+    articles = [
+        _article("경찰, 대표 구속영장 신청", "https://n.news.naver.com/1", "2026-03-05 09:00"),
+        _article("경찰, 대표 구속영장 신청 방침", "https://n.news.naver.com/2", "2026-03-05 10:00"),
+        _article("교육부, 새 입시안 발표", "https://n.news.naver.com/3", "2026-03-05 10:30"),
+    ]
+    existing = [{"id": 11, "title": "경찰, 대표 구속영장 신청", "url": "https://n.news.naver.com/1"}]
+    candidates = [
+        {"title": a["title"], "url": a["link"], "summary": "s"} for a in articles
+    ]
+    since = datetime(2026, 3, 5, 8, 0, tzinfo=_KST)
+
+    result = diff_candidates(candidates, articles, since, [], existing)
+
+    assert [(r["url"][-1], r["action"], r["item_id"]) for r in result] == [
+        ("2", "modified", 11),
+        ("3", "added", 0),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_report_pipeline_scenario_b_sends_only_new_links(tmp_path):
+    """시나리오 B는 이미 분석한 link를 빼고 보내며, 새 기사가 없으면 LLM을 호출하지 않는다."""
+    from src.bot import handlers
+    from src.storage import repository as repo
+    from src.storage.models import init_db
+
+    db = await init_db(str(tmp_path / "test.db"))
+    try:
+        await repo.upsert_journalist(db, "90", "사회부", ["a"], "k")
+        journalist = await repo.get_journalist(db, "90")
+        cache_id, _ = await repo.get_or_create_report_cache(db, journalist["id"], "2026-03-05")
+        await repo.add_processed_links(db, cache_id, ["https://n.news.naver.com/1"])
+
+        pub = datetime.now(_KST).strftime("%Y-%m-%d %H:%M")
+        snapshot = {"now": datetime.now(UTC), "articles": [
+            _article("A", "https://n.news.naver.com/1", pub),
+            _article("B", "https://n.news.naver.com/2", pub),
+        ]}
+        existing = [{"id": 1, "title": "A", "url": "https://n.news.naver.com/1"}]
+        analyze = AsyncMock(return_value=[])
+
+        with patch.object(handlers, "get_department_articles", AsyncMock(return_value=snapshot)), \
+                patch.object(handlers, "analyze_report_articles", analyze):
+            await handlers._run_report_pipeline(db, journalist, existing, cache_id=cache_id)
+            sent = analyze.await_args.kwargs["articles"]
+            assert [a["title"] for a in sent] == ["B"]
+
+            analyze.reset_mock()
+            results = await handlers._run_report_pipeline(db, journalist, existing, cache_id=cache_id)
+            assert results == []
+            analyze.assert_not_awaited()
+    finally:
+        await db.close()
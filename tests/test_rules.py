@@ -0,0 +1,88 @@
+"""rules 사전 분류 단위 테스트.
+
+제목 태그, 키워드 미포함, 오늘자 날짜 표기 규칙과 Aho-Corasick 탐색을 검증한다.
+"""
+
+from datetime import datetime
+
+from src.filters.rules import (
+    _KST, _Automaton, body_skip_reason, is_exclusive,
+    split_by_body_rules, split_by_title_rules,
+)
+
+_NOW = datetime(2026, 3, 5, 14, 0, tzinfo=_KST)
+_FILLER = " 관계자는 자세한 경위를 조사하고 있다고 밝혔다." * 5
+
+
+def _article(title, link="https://n.news.naver.com/1", description=""):
+    return {
+        "title": title,
+        "link": link,
+        "originallink": link.replace("n.news.naver.com", "www.chosun.com"),
+        "description": description,
+        "pubDate": _NOW,
+    }
+
+
+def test_automaton_overlapping_patterns():
+    """접두·접미가 겹치는 패턴도 모두 찾는다."""
+    automaton = _Automaton(["서부지검", "지검", "서울서부", "검찰"])
+    assert automaton.find("서울서부지검이 수사") == {"서부지검", "지검", "서울서부"}
+
+
+def test_title_tag_skip():
+    """[포토] 등 태그 기사는 사유와 함께 skip, 나머지는 남긴다."""
+    articles = [_article("[포토] 서부지검 앞 시위"), _article("서부지검, 대표 소환")]
+    remaining, skipped = split_by_title_rules(articles)
+    assert [a["title"] for a in remaining] == ["서부지검, 대표 소환"]
+    assert "[포토]" in skipped[0][1]
+
+
+def test_is_exclusive():
+    assert is_exclusive("[단독] 서부지검, 대표 소환")
+    assert not is_exclusive("서부지검, 대표 소환")
+
+
+def test_keyword_absent_skip():
+    """제목·설명·본문 어디에도 키워드가 없으면 skip."""
+    body = "서울중앙지검은 5일 대표를 소환했다." + _FILLER
+    reason = body_skip_reason(_article("중앙지검, 대표 소환"), body, ["서부 지검"], _NOW)
+    assert reason == "키워드 미포함"
+
+
+def test_keyword_match_ignores_spacing():
+    body = "서울서부지검은 5일 대표를 소환했다." + _FILLER
+    assert body_skip_reason(_article("대표 소환"), body, ["서부 지검"], _NOW) == ""
+
+
+def test_no_today_date_marker_skip():
+    """본문에 '지난 N일' 팩트만 있으면 skip."""
+    body = "서부지검은 지난 2일 대표를 소환했다." + _FILLER
+    reason = body_skip_reason(_article("서부지검 수사"), body, ["서부지검"], _NOW)
+    assert reason == "본문에 오늘자 날짜 표기 없음"
+
+
+def test_yesterday_marker_is_ambiguous():
+    """외신 인용 예외를 위해 전날 날짜 표기는 LLM 판단에 맡긴다."""
+    body = "로이터는 4일 서부지검 수사를 보도했다." + _FILLER
+    assert body_skip_reason(_article("서부지검 수사"), body, ["서부지검"], _NOW) == ""
+
+
+def test_short_body_not_judged():
+    """본문 수집 실패(짧은 본문)는 판정하지 않는다."""
+    assert body_skip_reason(_article("무관한 기사"), "", ["서부지검"], _NOW) == ""
+
+
+def test_split_by_body_rules_without_keywords():
+    """keywords=None(report)이면 날짜 규칙만 적용한다."""
+    articles = [
+        _article("A", "https://n.news.naver.com/1"),
+        _article("B", "https://n.news.naver.com/2"),
+    ]
+    bodies = {
+        "https://n.news.naver.com/1": "정부는 5일 대책을 발표했다." + _FILLER,
+        "https://n.news.naver.com/2": "올해 누적 수치가 집계됐다." + _FILLER,
+    }
+    remaining, skipped = split_by_body_rules(articles, bodies, now=_NOW)
+    assert [a["title"] for a in remaining] == ["A"]
+    assert skipped[0][0]["title"] == "B"
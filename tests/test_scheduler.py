@@ -0,0 +1,165 @@
+"""scheduler 예약 색인 / 분 단위 디스패처 / 놓친 예약 따라잡기 단위 테스트."""
+
+from datetime import datetime, time, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+import pytest_asyncio
+
+from src.bot import scheduler
+from src.bot.admission import PRIORITY_BACKGROUND
+from src.bot.scheduler import (
+    _ScheduleIndex, _missed_runs, catch_up_missed_runs, dispatch_schedules,
+    register_job, unregister_jobs,
+)
+from src.storage import repository as repo
+from src.storage.models import init_db
+
+_KST = timezone(timedelta(hours=9))
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path):
+    conn = await init_db(str(tmp_path / "test.db"))
+    yield conn
+    await conn.close()
+
+
+@pytest.fixture(autouse=True)
+def fresh_index(monkeypatch):
+    monkeypatch.setattr(scheduler, "_schedule_index", _ScheduleIndex())
+    monkeypatch.setattr(scheduler, "_last_minute", None)
+
+
+def test_index_add_remove_due():
+    index = _ScheduleIndex()
+    index.add("check", "check", 1, "100", "09:00", time(9, 0))
+    index.add("report", "report", 1, "100", "09:00", time(9, 0))
+    index.add("check", "check", 2, "200", "09:00", time(9, 0))
+
+    assert {(k, j) for k, j, *_ in index.due(9 * 60)} == {("check", 1), ("report", 1), ("check", 2)}
+    index.remove(1, "check")
+    assert {(k, j) for k, j, *_ in index.due(9 * 60)} == {("report", 1), ("check", 2)}
+    assert index.due(10 * 60) == []
+    assert len(index) == 2
+
+
+def test_report_registers_prewarm_and_unregisters_together():
+    register_job(None, "report", 7, "700", "09:00")
+    register_job(None, "check", 7, "700", "09:00")
+    assert len(scheduler._schedule_index) == 3
+
+    unregister_jobs(None, 7, command="report")
+    assert len(scheduler._schedule_index) == 1
+    unregister_jobs(None, 7)
+    assert len(scheduler._schedule_index) == 0
+
+
+async def _tick(at: datetime, db):
+    context = MagicMock()
+    context.bot_data = {"db": db}
+    with patch.object(scheduler, "datetime") as dt:
+        dt.now.return_value = at
+        dt.fromtimestamp = datetime.fromtimestamp
+        await dispatch_schedules(context)
+    return context.job_queue.run_once.call_args_list
+
+
+@pytest.mark.asyncio
+async def test_dispatch_fires_due_and_catches_up_missed_minute(db):
+    register_job(None, "check", 1, "100", "09:00")
+    register_job(None, "check", 2, "200", "09:01")
+
+    calls = await _tick(datetime(2026, 1, 5, 9, 0, 1, tzinfo=_KST), db)
+    assert [c.kwargs["name"] for c in calls] == ["check_1_09:00"]
+    assert calls[0].args[0] is scheduler.scheduled_check
+    assert calls[0].kwargs["chat_id"] == 100
+
+    # 09:01 틱이 빠지고 09:02에 돌면 09:01 예약을 따라잡아 즉시 실행
+    calls = await _tick(datetime(2026, 1, 5, 9, 2, 0, tzinfo=_KST), db)
+    assert [(c.kwargs["name"], c.kwargs["when"]) for c in calls] == [("check_2_09:01", 0)]
+
+    # 같은 분에 다시 돌아도 중복 실행하지 않는다
+    assert await _tick(datetime(2026, 1, 5, 9, 2, 30, tzinfo=_KST), db) == []
+
+    # 마지막 틱 시각이 남는다
+    assert await repo.get_dispatcher_tick(db, scheduler._DISPATCHER_NAME) == datetime(
+        2026, 1, 5, 9, 2, 30, tzinfo=_KST,
+    )
+
+    # 실행 기록(schedule_runs)이 남는다
+    runs = await repo.get_schedule_runs_since(db, "2026-01-05")
+    assert runs == {
+        (1, "check", "2026-01-05", "09:00"): "dispatched",
+        (2, "check", "2026-01-05", "09:01"): "dispatched",
+    }
+
+
+def _schedule(jid, command, t):
+    return {"journalist_id": jid, "command": command, "time_kst": t, "telegram_id": str(jid), "department": "사회부"}
+
+
+def test_missed_runs_within_grace_and_unfinished():
+    now = datetime(2026, 1, 5, 0, 20, 30, tzinfo=_KST)
+    schedules = [
+        _schedule(1, "check", "00:20"),   # 시작한 분: 포함
+        _schedule(2, "check", "23:50"),   # 전날, 30분 전: 포함
+        _schedule(3, "check", "22:00"),   # 유예 시간 밖
+        _schedule(4, "report", "00:10"),  # 이미 완료
+        _schedule(5, "report", "00:05"),  # 실행 도중 중단
+        _schedule(6, "check", "00:21"),   # 아직 안 됨 (어제 실행은 유예 밖)
+    ]
+    ledger = {
+        (4, "report", "2026-01-05", "00:10"): "done",
+        (5, "report", "2026-01-05", "00:05"): "running",
+    }
+    last_tick = datetime(2026, 1, 4, 23, 40, 1, tzinfo=_KST)
+    missed = _missed_runs(schedules, ledger, now, grace_minutes=60, last_tick=last_tick)
+    assert [(s["journalist_id"], due.strftime("%m-%d %H:%M")) for s, due in missed] == [
+        (1, "01-05 00:20"), (2, "01-04 23:50"), (5, "01-05 00:05"),
+    ]
+
+
+def test_missed_runs_without_dispatcher_tick_only_resumes_unfinished():
+    """디스패처 틱 기록이 없으면(첫 배포) 기록 없는 예약은 따라잡지 않는다."""
+    now = datetime(2026, 1, 5, 0, 20, 30, tzinfo=_KST)
+    schedules = [
+        _schedule(1, "check", "00:10"),   # 기록 없음
+        _schedule(2, "report", "00:05"),  # 내보냈지만 끝나지 않음
+    ]
+    ledger = {(2, "report", "2026-01-05", "00:05"): "dispatched"}
+    missed = _missed_runs(schedules, ledger, now, grace_minutes=60, last_tick=None)
+    assert [s["journalist_id"] for s, _ in missed] == [2]
+
+
+def test_missed_runs_skips_schedule_created_after_its_time():
+    """디스패처가 이미 지나간 시각으로 새로 만든 예약은 놓친 실행이 아니다."""
+    now = datetime(2026, 1, 5, 9, 30, 30, tzinfo=_KST)
+    # 09:25에 09:10 예약을 만들었고 디스패처는 09:29까지 돌았다
+    schedules = [_schedule(1, "check", "09:10"), _schedule(2, "check", "09:30")]
+    last_tick = datetime(2026, 1, 5, 9, 29, 0, tzinfo=_KST)
+    missed = _missed_runs(schedules, {}, now, grace_minutes=60, last_tick=last_tick)
+    # 09:30은 마지막 틱 이후라 디스패처가 처리하지 못했다
+    assert [s["journalist_id"] for s, _ in missed] == [2]
+
+
+@pytest.mark.asyncio
+async def test_catch_up_runs_at_background_priority(db):
+    now = datetime.now(_KST)
+    t = now.strftime("%H:%M")
+    # 디스패처가 예약 시각 전까지 돌다가 멈췄다
+    await repo.record_dispatcher_tick(db, scheduler._DISPATCHER_NAME, now - timedelta(minutes=2))
+    app = MagicMock()
+    await catch_up_missed_runs(app, db, [_schedule(1, "check", t), _schedule(2, "report", t)])
+
+    calls = app.job_queue.run_once.call_args_list
+    assert {c.args[0] for c in calls} == {scheduler.scheduled_check, scheduler.scheduled_report}
+    assert all(c.kwargs["data"]["priority"] == PRIORITY_BACKGROUND for c in calls)
+    assert all(c.kwargs["data"]["catch_up"] for c in calls)
+
+    # 완료 기록이 생기면 다음 재시작 때는 따라잡지 않는다
+    for c in calls:
+        await repo.update_schedule_run(db, c.kwargs["data"]["run_id"], "done")
+    app2 = MagicMock()
+    await catch_up_missed_runs(app2, db, [_schedule(1, "check", t), _schedule(2, "report", t)])
+    assert app2.job_queue.run_once.call_count == 0
@@ -31,6 +31,70 @@ async def test_tables_created(db):
     assert "reported_articles" in tables
 
 
+@pytest.mark.asyncio
+async def test_migrates_legacy_db_once(tmp_path):
+    """초기 스키마 DB는 컬럼이 채워지고, 이후 시작에서는 마이그레이션을 건너뛴다."""
+    import aiosqlite
+    from src.storage import models
+
+    db_path = str(tmp_path / "legacy.db")
+    async with aiosqlite.connect(db_path) as legacy:
+        await legacy.executescript("""
+            CREATE TABLE journalists (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, telegram_id TEXT UNIQUE NOT NULL,
+                department TEXT NOT NULL, keywords TEXT NOT NULL, api_key TEXT NOT NULL,
+                last_check_at DATETIME, created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE report_cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, journalist_id INTEGER NOT NULL,
+                date DATE NOT NULL, created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME, UNIQUE(journalist_id, date)
+            );
+            CREATE TABLE report_items (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, report_cache_id INTEGER NOT NULL,
+                title TEXT NOT NULL, url TEXT NOT NULL, summary TEXT NOT NULL, tags TEXT,
+                category TEXT NOT NULL, prev_reference TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP, updated_at DATETIME
+            );
+            INSERT INTO journalists (telegram_id, department, keywords, api_key)
+                VALUES ('1', '사회부', '[]', 'x');
+            INSERT INTO report_cache (journalist_id, date) VALUES (1, '2026-01-01');
+            INSERT INTO report_items (report_cache_id, title, url, summary, category)
+                VALUES (1, '제목', 'https://a', '요약', 'new');
+        """)
+
+    conn = await init_db(db_path)
+    try:
+        assert await models.get_schema_version(conn) == models.SCHEMA_VERSION
+        items = await repo.get_report_items_by_cache(conn, 1)
+        assert items[0]["reason"] == "" and items[0]["key_facts"] == [] and items[0]["source_count"] == 1
+        assert await models.migrate(conn) == []
+    finally:
+        await conn.close()
+
+
+@pytest.mark.asyncio
+async def test_wal_and_query_indexes(db):
+    """WAL 모드로 열리고, 이력 조회가 전체 스캔 대신 인덱스를 쓴다."""
+    cursor = await db.execute("PRAGMA journal_mode")
+    assert (await cursor.fetchone())[0] == "wal"
+
+    cursor = await db.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM reported_articles "
+        "WHERE journalist_id = ? AND checked_at >= ? ORDER BY checked_at DESC",
+        (1, "2026-01-01"),
+    )
+    plan = " ".join(r["detail"] for r in await cursor.fetchall())
+    assert "idx_reported_articles_journalist" in plan
+
+    cursor = await db.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM report_items WHERE report_cache_id = ? ORDER BY created_at",
+        (1,),
+    )
+    plan = " ".join(r["detail"] for r in await cursor.fetchall())
+    assert "idx_report_items_cache" in plan and "TEMP B-TREE" not in plan
+
+
 # --- journalists CRUD ---
 
 @pytest.mark.asyncio
@@ -104,6 +168,16 @@ async def test_update_last_check_at(db):
     assert j["last_check_at"] is not None
 
 
+@pytest.mark.asyncio
+async def test_update_batch_mode(db):
+    """배치 모드는 기본 꺼짐이고, 갱신하면 bool로 조회된다."""
+    jid = await repo.upsert_journalist(db, "78", "사회부", ["a"], "k")
+    assert (await repo.get_journalist(db, "78"))["batch_mode"] is False
+
+    await repo.update_batch_mode(db, jid, True)
+    assert (await repo.get_journalist(db, "78"))["batch_mode"] is True
+
+
 # --- reported_articles ---
 
 @pytest.mark.asyncio
@@ -135,6 +209,22 @@ async def test_save_and_get_reported_articles(db):
     assert topics == {"서부지검 수사", "영등포서 사건"}
 
 
+@pytest.mark.asyncio
+async def test_reported_articles_title_and_url(db):
+    """원본 제목과 URL이 저장되어 로컬 중복 제거에 쓰인다."""
+    jid = await repo.upsert_journalist(db, "56", "사회부", ["a"], "k")
+    await repo.save_reported_articles(db, jid, [{
+        "topic_cluster": "서부지검 수사",
+        "title": "[단독] 서부지검, 대표 소환",
+        "summary": "",
+        "url": "https://n.news.naver.com/1",
+        "category": "skip",
+    }])
+    result = await repo.get_recent_reported_articles(db, jid, hours=1)
+    assert result[0]["title"] == "[단독] 서부지검, 대표 소환"
+    assert result[0]["article_urls"] == ["https://n.news.naver.com/1"]
+
+
 # --- report_cache / report_items ---
 
 @pytest.mark.asyncio
@@ -157,6 +247,20 @@ async def test_get_or_create_report_cache_existing(db):
     assert is_new_2 is False
 
 
+@pytest.mark.asyncio
+async def test_processed_links_accumulate(db):
+    """분석에 보낸 link는 report_cache에 누적 기록된다."""
+    jid = await repo.upsert_journalist(db, "34", "사회부", ["a"], "k")
+    cache_id, _ = await repo.get_or_create_report_cache(db, jid, "2026-02-11")
+    assert await repo.get_processed_links(db, cache_id) == set()
+
+    await repo.add_processed_links(db, cache_id, ["https://n.news.naver.com/1"])
+    await repo.add_processed_links(db, cache_id, ["https://n.news.naver.com/1", "https://n.news.naver.com/2"])
+    assert await repo.get_processed_links(db, cache_id) == {
+        "https://n.news.naver.com/1", "https://n.news.naver.com/2",
+    }
+
+
 @pytest.mark.asyncio
 async def test_save_and_get_report_items(db):
     """report_items 저장 후 조회된다."""
@@ -212,6 +316,78 @@ async def test_update_report_item(db):
     assert items[0]["summary"] == "갱신된 요약"
 
 
+@pytest.mark.asyncio
+async def test_update_report_items_keeps_unset_fields(db):
+    """일괄 갱신: reason/exclusive는 값이 있을 때만 바뀐다."""
+    jid = await repo.upsert_journalist(db, "33", "사회부", ["a"], "k")
+    cache_id, _ = await repo.get_or_create_report_cache(db, jid, "2026-02-11")
+    await repo.save_report_items(db, cache_id, [
+        {"title": f"기사{i}", "url": f"https://example.com/{i}", "summary": "기존",
+         "category": "new", "reason": "기존 사유", "exclusive": True}
+        for i in range(2)
+    ])
+    first, second = await repo.get_report_items_by_cache(db, cache_id)
+
+    await repo.update_report_items(db, [
+        {"id": first["id"], "summary": "수정1", "reason": "새 사유", "exclusive": False},
+        {"id": second["id"], "summary": "수정2"},
+    ])
+
+    first, second = await repo.get_report_items_by_cache(db, cache_id)
+    assert (first["summary"], first["reason"], first["exclusive"]) == ("수정1", "새 사유", False)
+    assert (second["summary"], second["reason"], second["exclusive"]) == ("수정2", "기존 사유", True)
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_commits_once_or_rolls_back(db):
+    """unit_of_work 안의 쓰기는 함께 커밋되고, 예외가 나면 함께 되돌려진다."""
+    jid = await repo.upsert_journalist(db, "33", "사회부", ["a"], "k")
+    cache_id, _ = await repo.get_or_create_report_cache(db, jid, "2026-02-11")
+    item = {"title": "t", "url": "https://example.com/1", "summary": "s", "category": "new"}
+
+    with pytest.raises(RuntimeError):
+        async with repo.unit_of_work(db):
+            await repo.save_report_items(db, cache_id, [item])
+            await repo.save_reported_articles(db, jid, [{"url": "https://a", "category": "report"}])
+            raise RuntimeError("중단")
+    assert await repo.get_report_items_by_cache(db, cache_id) == []
+    assert await repo.get_recent_reported_articles(db, jid) == []
+
+    async with repo.unit_of_work(db):
+        await repo.save_report_items(db, cache_id, [item])
+        assert db.in_transaction
+    assert not db.in_transaction
+    assert len(await repo.get_report_items_by_cache(db, cache_id)) == 1
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_isolated_from_concurrent_writer(db):
+    """같은 연결의 다른 코루틴 쓰기는 블록이 끝난 뒤 실행되어 롤백에 휩쓸리지 않는다."""
+    import asyncio
+
+    jid = await repo.upsert_journalist(db, "33", "사회부", ["a"], "k")
+    cache_id, _ = await repo.get_or_create_report_cache(db, jid, "2026-02-11")
+    item = {"title": "t", "url": "https://example.com/1", "summary": "s", "category": "new"}
+    writer_done = asyncio.Event()
+
+    async def _concurrent_writer():
+        await repo.update_last_check_at(db, jid)
+        writer_done.set()
+
+    with pytest.raises(RuntimeError):
+        async with repo.unit_of_work(db):
+            await repo.save_report_items(db, cache_id, [item])
+            writer = asyncio.create_task(_concurrent_writer())
+            await asyncio.sleep(0.05)
+            # 다른 코루틴의 커밋이 블록의 미완료 쓰기를 커밋하지 않았다
+            assert not writer_done.is_set()
+            raise RuntimeError("중단")
+    await writer
+
+    assert await repo.get_report_items_by_cache(db, cache_id) == []
+    assert (await repo.get_journalist(db, "33"))["last_check_at"] is not None
+
+
 @pytest.mark.asyncio
 async def test_get_today_report_items(db):
     """당일 report_items 조회 (/check 맥락 로드용)."""